@@ -0,0 +1,63 @@
+"""
+Compares the fixed-width log line parser with the pydantic LogEntry validation and plain strptime decoding.
+
+Usage:
+    python benchmarks/bench_log_parser.py [--lines N] [--repeat R]
+"""
+
+import argparse
+import random
+import timeit
+from datetime import datetime, timedelta
+
+from formula1_race_analysis import LogEntry
+from formula1_race_analysis.log_parser import classify_log_line
+from formula1_race_analysis.timestamps import TIMESTAMP_FORMAT
+
+
+def generate_log_lines(count: int, seed: int = 0) -> list[str]:
+    generator = random.Random(seed)
+    session_start = datetime(2018, 5, 24, 12)
+    lines = []
+    for _ in range(count):
+        identifier = "".join(generator.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for _ in range(3))
+        timestamp = session_start + timedelta(milliseconds=generator.randrange(3_600_000))
+        lines.append(f"{identifier}{timestamp:%Y-%m-%d_%H:%M:%S}.{timestamp.microsecond // 1000:03}\n")
+    return lines
+
+
+def parse_with_pydantic(lines: list[str]) -> None:
+    for line in lines:
+        LogEntry.model_validate(line)
+
+
+def parse_with_strptime(lines: list[str]) -> None:
+    for line in lines:
+        datetime.strptime(line[3:].strip("\n"), TIMESTAMP_FORMAT)
+
+
+def parse_with_fast_path(lines: list[str]) -> None:
+    for line in lines:
+        classify_log_line(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    lines = generate_log_lines(arguments.lines)
+    pydantic_time = min(timeit.repeat(lambda: parse_with_pydantic(lines), number=1, repeat=arguments.repeat))
+    strptime_time = min(timeit.repeat(lambda: parse_with_strptime(lines), number=1, repeat=arguments.repeat))
+    fast_path_time = min(timeit.repeat(lambda: parse_with_fast_path(lines), number=1, repeat=arguments.repeat))
+
+    print(f"lines:      {arguments.lines}")
+    print(f"pydantic:   {pydantic_time:.3f}s ({arguments.lines / pydantic_time:,.0f} lines/s)")
+    print(f"strptime:   {strptime_time:.3f}s ({arguments.lines / strptime_time:,.0f} lines/s)")
+    print(f"fast path:  {fast_path_time:.3f}s ({arguments.lines / fast_path_time:,.0f} lines/s)")
+    print(f"speedup:    {pydantic_time / fast_path_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Compares the memory held by a report of slotted, interned results with the previous plain dataclasses.
+
+Usage:
+    python benchmarks/bench_models_memory.py [--results N] [--drivers N]
+"""
+
+import argparse
+import tracemalloc
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import timedelta
+
+from formula1_race_analysis.models import Driver, RaceResult
+from formula1_race_analysis.synthetic import CAR_MODELS, FIRST_NAMES, LAST_NAMES
+
+
+@dataclass(order=True)
+class PlainDriver:
+    identifier: str
+    name: str
+    car_model: str
+
+
+@dataclass
+class PlainRaceResult:
+    driver: PlainDriver
+    lap_time: timedelta
+    lap_count: int = 1
+    mean_lap_time: timedelta | None = None
+
+
+def driver_fields(index: int) -> tuple[str, str, str]:
+    # Decoding creates new string objects for equal values, as reading them from a file does.
+    identifier = f"{index % 26 + 65:c}{index // 26 % 26 + 65:c}{index // 676 % 26 + 65:c}"
+    name = f"{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[index % len(LAST_NAMES)]}"
+    car_model = CAR_MODELS[index % len(CAR_MODELS)].encode().decode()
+    return identifier, name, car_model
+
+
+def build_plain_results(count: int, drivers: int) -> list[PlainRaceResult]:
+    return [
+        PlainRaceResult(PlainDriver(*driver_fields(index % drivers)), timedelta(milliseconds=60_000 + index))
+        for index in range(count)
+    ]
+
+
+def build_compact_results(count: int, drivers: int) -> list[RaceResult]:
+    return [
+        RaceResult(Driver(*driver_fields(index % drivers)), timedelta(milliseconds=60_000 + index))
+        for index in range(count)
+    ]
+
+
+def measure(build: Callable[[int, int], Sequence[object]], count: int, drivers: int) -> int:
+    tracemalloc.start()
+    try:
+        results = build(count, drivers)
+        size = tracemalloc.get_traced_memory()[0]
+        del results
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--results", type=int, default=200_000, help="Results kept in memory, e.g. many sessions.")
+    parser.add_argument("--drivers", type=int, default=20, help="Distinct drivers shared by the results.")
+    arguments = parser.parse_args()
+
+    plain_size = measure(build_plain_results, arguments.results, arguments.drivers)
+    compact_size = measure(build_compact_results, arguments.results, arguments.drivers)
+
+    print(f"results:   {arguments.results}")
+    print(f"dataclass: {plain_size:>14,} B ({plain_size / arguments.results:.0f} B per result)")
+    print(f"compact:   {compact_size:>14,} B ({compact_size / arguments.results:.0f} B per result)")
+    print(f"saved:     {1 - compact_size / plain_size:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Times the byte-range parallel parser on a generated single-lap session with growing worker counts.
+The start and end logs hold --size-mb megabytes together and are written once into --data-dir,
+or into a temporary directory that is removed afterwards.
+
+Usage:
+    python benchmarks/bench_parallel_parser.py [--size-mb 4096] [--max-workers N] [--chunk-size-mb 64]
+                                               [--repeat 1] [--data-dir DIR]
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+from datetime import datetime, timedelta
+from functools import partial
+from pathlib import Path
+
+from formula1_race_analysis.config import FilePaths
+from formula1_race_analysis.parallel_parser import calculate_parallel_lap_statistics
+
+DRIVERS = 1000
+BLOCK_LAPS = 100
+LAP_TIME = timedelta(seconds=72, milliseconds=657)
+BYTES_PER_MEGABYTE = 1024 * 1024
+
+
+def log_blocks(*, lap_offset: timedelta) -> tuple[bytes, bytes]:
+    """
+    Returns blocks of start and end lines of BLOCK_LAPS consecutive laps of every driver.
+    """
+    session_start = datetime(2018, 5, 24, 12)
+    start_lines: list[str] = []
+    end_lines: list[str] = []
+    for lap in range(BLOCK_LAPS):
+        for driver in range(DRIVERS):
+            identifier = f"{chr(65 + driver // 676)}{chr(65 + driver // 26 % 26)}{chr(65 + driver % 26)}"
+            start = session_start + lap_offset + lap * LAP_TIME + timedelta(milliseconds=driver)
+            for lines, timestamp in ((start_lines, start), (end_lines, start + LAP_TIME)):
+                lines.append(f"{identifier}{timestamp:%Y-%m-%d_%H:%M:%S}.{timestamp.microsecond // 1000:03}\n")
+    return "".join(start_lines).encode(), "".join(end_lines).encode()
+
+
+def generate_logs(data_dir: Path, size_mb: int) -> None:
+    """
+    Writes blocks of laps to the start and end logs until they hold size_mb megabytes together.
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with (
+        Path.open(data_dir / FilePaths.START_LOG, "wb") as start_log,
+        Path.open(data_dir / FilePaths.END_LOG, "wb") as end_log,
+    ):
+        blocks = 0
+        while start_log.tell() + end_log.tell() < size_mb * BYTES_PER_MEGABYTE:
+            start_block, end_block = log_blocks(lap_offset=blocks * BLOCK_LAPS * LAP_TIME)
+            start_log.write(start_block)
+            end_log.write(end_block)
+            blocks += 1
+
+
+def worker_counts(max_workers: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def run(data_dir: Path, arguments: argparse.Namespace) -> None:
+    start_log, end_log = data_dir / FilePaths.START_LOG, data_dir / FilePaths.END_LOG
+    size_mb = (start_log.stat().st_size + end_log.stat().st_size) / BYTES_PER_MEGABYTE
+    chunk_size = arguments.chunk_size_mb * BYTES_PER_MEGABYTE
+    print(f"logs:       {size_mb:,.0f} MB, chunk size {arguments.chunk_size_mb} MB")
+    single_worker_time = None
+    for workers in worker_counts(arguments.max_workers):
+        elapsed = min(
+            timeit.repeat(
+                partial(
+                    calculate_parallel_lap_statistics,
+                    start_log,
+                    end_log,
+                    ignore_errors=False,
+                    workers=workers,
+                    chunk_size=chunk_size,
+                ),
+                number=1,
+                repeat=arguments.repeat,
+            )
+        )
+        single_worker_time = single_worker_time or elapsed
+        speedup = single_worker_time / elapsed
+        print(
+            f"workers {workers:3d}: {elapsed:8.2f}s ({size_mb / elapsed:7.1f} MB/s) "
+            f"speedup {speedup:5.2f}x, efficiency {speedup / workers:4.0%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=4096)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size-mb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--data-dir", type=Path, default=None, help="Keep the generated logs in this directory.")
+    arguments = parser.parse_args()
+
+    if arguments.data_dir is not None:
+        if not (arguments.data_dir / FilePaths.START_LOG).exists():
+            generate_logs(arguments.data_dir, arguments.size_mb)
+        run(arguments.data_dir, arguments)
+        return
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        generate_logs(Path(temporary_dir), arguments.size_mb)
+        run(Path(temporary_dir), arguments)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Times and memory-profiles each stage of the report pipeline on synthetic sessions of growing size
+and stores the results as JSON, optionally comparing them with the results of a previous run.
+
+Usage:
+    python benchmarks/bench_scaling.py [--min-exponent 2] [--max-exponent 5] [--output results.json]
+                                       [--baseline previous.json] [--malformed-rate 0.0] [--seed 0]
+"""
+
+import argparse
+import io
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import redirect_stdout
+from datetime import UTC, datetime
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+from formula1_race_analysis.config import FilePaths
+from formula1_race_analysis.display import SortStrategy, display_race_report, sort_report
+from formula1_race_analysis.q1_session_analyzer import (
+    build_q1_report,
+    calculate_lap_time,
+    create_driver_list,
+    parse_log_file,
+)
+from formula1_race_analysis.synthetic import SessionSpec, generate_session
+
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_MAX_DRIVERS = 1000
+
+
+def session_spec(records: int, max_drivers: int, malformed_rate: float, seed: int) -> SessionSpec:
+    drivers = min(records, max_drivers)
+    return SessionSpec(drivers=drivers, laps=max(1, records // drivers), malformed_rate=malformed_rate, seed=seed)
+
+
+def pipeline_stages(base_dir: Path) -> dict[str, Callable[[], Any]]:
+    """
+    Returns the stages in pipeline order, each stage runs on the inputs prepared outside of it.
+    """
+    start_log, end_log = base_dir / FilePaths.START_LOG, base_dir / FilePaths.END_LOG
+    start_timestamps = parse_log_file(start_log, ignore_errors=True)
+    end_timestamps = parse_log_file(end_log, ignore_errors=True)
+    report = build_q1_report(base_dir, ignore_errors=True)
+    sorted_report = sort_report(report, SortStrategy.ASCENDING_ORDER)
+
+    def render() -> None:
+        with redirect_stdout(io.StringIO()):
+            display_race_report(sorted_report)
+
+    return {
+        "create_driver_list": lambda: create_driver_list(base_dir / FilePaths.ABBREVIATIONS, ignore_errors=True),
+        "parse_log_file": lambda: (
+            parse_log_file(start_log, ignore_errors=True),
+            parse_log_file(end_log, ignore_errors=True),
+        ),
+        "calculate_lap_time": lambda: calculate_lap_time(start_timestamps, end_timestamps, ignore_errors=True),
+        "build_q1_report": lambda: build_q1_report(base_dir, ignore_errors=True),
+        "sort_report": lambda: sort_report(report, SortStrategy.ASCENDING_ORDER),
+        "display_race_report": render,
+    }
+
+
+def measure_time(stage: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        stage()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def measure_peak_memory(stage: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        stage()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(arguments: argparse.Namespace) -> list[dict[str, Any]]:
+    results = []
+    for exponent in range(arguments.min_exponent, arguments.max_exponent + 1):
+        spec = session_spec(10**exponent, arguments.max_drivers, arguments.malformed_rate, arguments.seed)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            base_dir = generate_session(Path(tmp_dir), spec)
+            for stage_name, stage in pipeline_stages(base_dir).items():
+                result = {
+                    "stage": stage_name,
+                    "records": spec.records,
+                    "drivers": spec.drivers,
+                    "laps": spec.laps,
+                    "seconds": measure_time(stage, arguments.repeat),
+                    "peak_memory_bytes": None if arguments.no_memory else measure_peak_memory(stage),
+                }
+                results.append(result)
+                print(
+                    f"{result['stage']:<20} records={spec.records:<10} "
+                    f"{result['seconds']:>10.4f}s  peak={result['peak_memory_bytes'] or 0:>12,} B"
+                )
+    return results
+
+
+def compare_with_baseline(results: list[dict[str, Any]], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {(result["stage"], result["records"]): result for result in baseline["results"]}
+    print(f"\nCompared with {baseline_path} ({baseline['metadata']['package_version']}):")
+    for result in results:
+        previous_result = previous.get((result["stage"], result["records"]))
+        if previous_result is None or not previous_result["seconds"]:
+            continue
+        ratio = result["seconds"] / previous_result["seconds"]
+        print(f"{result['stage']:<20} records={result['records']:<10} time x{ratio:.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-exponent", type=int, default=2, help="Smallest session has 10**N records.")
+    parser.add_argument("--max-exponent", type=int, default=5, help="Largest session has 10**N records, up to 7.")
+    parser.add_argument("--max-drivers", type=int, default=DEFAULT_MAX_DRIVERS, help="Extra records become laps.")
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc runs.")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"))
+    parser.add_argument("--baseline", type=Path, default=None, help="Results of a previous run to compare with.")
+    arguments = parser.parse_args()
+
+    results = run_benchmarks(arguments)
+    payload = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "metadata": {
+            "package_version": version("formula1-race-analysis"),
+            "python_version": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "seed": arguments.seed,
+            "malformed_rate": arguments.malformed_rate,
+            "repeat": arguments.repeat,
+        },
+        "results": results,
+    }
+    arguments.output.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    print(f"\nResults written to {arguments.output}")
+    if arguments.baseline is not None:
+        compare_with_baseline(results, arguments.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Writes a deterministic synthetic session (abbreviations.txt, start.log, end.log) of the requested scale.
+
+Usage:
+    python benchmarks/generate_session.py OUTPUT_DIR [--drivers N] [--laps N] [--malformed-rate R] [--seed S]
+"""
+
+import argparse
+from pathlib import Path
+
+from formula1_race_analysis.synthetic import SessionSpec, generate_session
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--drivers", type=int, default=20)
+    parser.add_argument("--laps", type=int, default=1)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    spec = SessionSpec(
+        drivers=arguments.drivers, laps=arguments.laps, malformed_rate=arguments.malformed_rate, seed=arguments.seed
+    )
+    generate_session(arguments.output_dir, spec)
+    print(f"Session with {spec.records} records written to {arguments.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import click
 
-from formula1_race_analysis.display import generate_report
+from formula1_race_analysis.display import batch_report, convert, generate_report, ingest, query, serve
 
 
 @click.group()
@@ -9,6 +9,11 @@ def f1_racing_results() -> None:
 
 
 f1_racing_results.add_command(generate_report)
+f1_racing_results.add_command(batch_report)
+f1_racing_results.add_command(serve)
+f1_racing_results.add_command(ingest)
+f1_racing_results.add_command(query)
+f1_racing_results.add_command(convert)
 
 
 if __name__ == "__main__":
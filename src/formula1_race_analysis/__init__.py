@@ -1,16 +1,64 @@
-from .custom_types import LapTimeDict, TimeStampDict
-from .exceptions import (
-    DisplayReportError,
-    InvalidFormatDataError,
-    InvalidIdentifierFormatError,
-    InvalidNameFormatError,
-    InvalidRaceTimeError,
-    MissedFileError,
-)
-from .models import Driver, RaceResult, TableSize
-from .q1_session_analyzer import (
-    build_q1_report,
-    create_driver_list,
-    read_file_content,
-)
-from .schemas import AbbreviationEntry, LogEntry
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .custom_types import LapTimeDict, TimeStampDict
+    from .exceptions import (
+        DisplayReportError,
+        InvalidFormatDataError,
+        InvalidIdentifierFormatError,
+        InvalidNameFormatError,
+        InvalidQueryError,
+        InvalidRaceTimeError,
+        MissedFileError,
+        NoDataFoundError,
+    )
+    from .file_reader import iter_file_lines, read_file_content
+    from .models import Driver, RaceResult, TableSize
+    from .q1_session_analyzer import (
+        build_q1_report,
+        create_driver_list,
+    )
+    from .report_cache import ReportCache
+    from .schemas import AbbreviationEntry, LogEntry
+
+# The public names are imported from their modules on first access, so that importing the package
+# (and the CLI built on it) does not load pydantic before a session is actually parsed.
+_LAZY_ATTRIBUTES = {
+    "LapTimeDict": ".custom_types",
+    "TimeStampDict": ".custom_types",
+    "DisplayReportError": ".exceptions",
+    "InvalidFormatDataError": ".exceptions",
+    "InvalidIdentifierFormatError": ".exceptions",
+    "InvalidNameFormatError": ".exceptions",
+    "InvalidQueryError": ".exceptions",
+    "InvalidRaceTimeError": ".exceptions",
+    "MissedFileError": ".exceptions",
+    "NoDataFoundError": ".exceptions",
+    "iter_file_lines": ".file_reader",
+    "read_file_content": ".file_reader",
+    "Driver": ".models",
+    "RaceResult": ".models",
+    "TableSize": ".models",
+    "build_q1_report": ".q1_session_analyzer",
+    "create_driver_list": ".q1_session_analyzer",
+    "ReportCache": ".report_cache",
+    "AbbreviationEntry": ".schemas",
+    "LogEntry": ".schemas",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        message = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(message)
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,122 @@
+import glob
+import json
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from multiprocessing import Pool
+from pathlib import Path
+from typing import IO, Any
+
+from formula1_race_analysis.config import DEFAULT_CHUNKSIZE, FilePaths, LapTimeBackend
+from formula1_race_analysis.file_reader import resolve_session_file
+from formula1_race_analysis.models import RaceResult
+from formula1_race_analysis.profiling import profile_worker
+from formula1_race_analysis.q1_session_analyzer import build_q1_report
+
+
+@dataclass(frozen=True)
+class BatchOptions:
+    ignore_errors: bool | None = None
+    multi_lap: bool = False
+    backend: LapTimeBackend = LapTimeBackend.PYTHON
+
+
+@dataclass
+class BatchSummary:
+    processed: int = 0
+    failed: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> int:
+        return self.processed - len(self.failed)
+
+
+def discover_sessions(source: str | Path) -> list[Path]:
+    """
+    Finds session directories to process.
+    A directory is searched recursively for sub-directories holding an abbreviations file, plain or compressed,
+    or a binary session, any other value is treated as a glob pattern of session directories.
+    """
+    source_path = Path(source)
+    if source_path.is_dir():
+        candidates = [
+            source_path,
+            *(path.parent for path in source_path.rglob(f"{FilePaths.ABBREVIATIONS}*")),
+            *(path.parent for path in source_path.rglob(FilePaths.BINARY_SESSION)),
+        ]
+    else:
+        candidates = [Path(path) for path in glob.glob(str(source), recursive=True)]  # noqa: PTH207
+    sessions = {
+        path
+        for path in candidates
+        if resolve_session_file(path, FilePaths.ABBREVIATIONS).is_file() or (path / FilePaths.BINARY_SESSION).is_file()
+    }
+    return sorted(sessions)
+
+
+def process_session(session_dir: Path, options: BatchOptions) -> dict[str, Any]:
+    """
+    Builds the report of one session and converts it into a JSON-serializable record.
+    Any failure is returned as an error record instead of being raised, so one broken session
+    does not abort the whole batch.
+    """
+    try:
+        report = build_q1_report(
+            session_dir, options.ignore_errors, multi_lap=options.multi_lap, backend=options.backend
+        )
+    except Exception as error:  # noqa: BLE001
+        return {"session": str(session_dir), "status": "error", "error": f"{type(error).__name__}: {error}"}
+    return {"session": str(session_dir), "status": "ok", "results": race_results_to_records(report)}
+
+
+def race_results_to_records(report: list[RaceResult]) -> list[dict[str, Any]]:
+    sorted_report = sorted(report, key=lambda data: data.lap_time_us)
+    return [data.as_record(position) for position, data in enumerate(sorted_report, start=1)]
+
+
+def _process_session_task(task: tuple[Path, BatchOptions]) -> dict[str, Any]:
+    with profile_worker():
+        return process_session(*task)
+
+
+def iter_batch_results(
+    sessions: list[Path],
+    options: BatchOptions,
+    *,
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[dict[str, Any]]:
+    """
+    Processes sessions over a pool of worker processes and yields records as soon as each session finishes.
+    With a single worker the sessions are processed in the current process.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    tasks = [(session_dir, options) for session_dir in sessions]
+    if workers <= 1:
+        yield from map(_process_session_task, tasks)
+        return
+    with Pool(processes=min(workers, max(len(tasks), 1))) as pool:
+        yield from pool.imap_unordered(_process_session_task, tasks, chunksize=chunksize)
+
+
+def run_batch_report(
+    sessions: list[Path],
+    output: IO[str],
+    options: BatchOptions,
+    *,
+    workers: int | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> BatchSummary:
+    """
+    Writes one JSON line per session to output as the sessions finish and returns a summary
+    with the number of processed sessions and the errors of the failed ones.
+    """
+    summary = BatchSummary()
+    for record in iter_batch_results(sessions, options, workers=workers, chunksize=chunksize):
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+        summary.processed += 1
+        if record["status"] == "error":
+            summary.failed[record["session"]] = record["error"]
+    return summary
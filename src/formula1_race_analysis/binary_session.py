@@ -0,0 +1,332 @@
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from formula1_race_analysis.config import TEXT_SESSION_FILES, FilePaths, logger
+from formula1_race_analysis.custom_types import TimeStampDict
+from formula1_race_analysis.exceptions import InvalidFormatDataError, MissedFileError
+from formula1_race_analysis.file_reader import resolve_session_file
+from formula1_race_analysis.instrumentation import DISABLED_METRICS, Metrics
+from formula1_race_analysis.models import Driver, LapStatistics
+from formula1_race_analysis.q1_session_analyzer import (
+    count_unmatched_identifiers,
+    create_driver_list,
+    iter_log_entries,
+    pair_lap_timestamps,
+)
+from formula1_race_analysis.rejections import DISABLED_REJECTIONS, RejectionReport
+from formula1_race_analysis.timestamps import NANOSECONDS_PER_MICROSECOND, datetime_to_epoch_ns
+
+BINARY_SESSION_MAGIC = b"F1Q1"
+BINARY_SESSION_VERSION = 3
+IDENTIFIER_WIDTH = 16
+DRIVER_NAME_WIDTH = 124
+# Layout, little-endian and fixed-width: the header with the validation mode of the conversion, the size
+# and mtime of the text files it was converted from, the start and the end records, the identifier table
+# and the driver table. Records refer to identifiers by their code, the index in the identifier table.
+HEADER = struct.Struct("<4sH?xIIQQQ")
+SOURCE_RECORD = struct.Struct("<Qq")
+RECORDS_OFFSET = HEADER.size + len(TEXT_SESSION_FILES) * SOURCE_RECORD.size
+TIMESTAMP_RECORD = struct.Struct("<qI4x")
+IDENTIFIER_RECORD = struct.Struct(f"<{IDENTIFIER_WIDTH}s")
+DRIVER_RECORD = struct.Struct(f"<I{DRIVER_NAME_WIDTH}s{DRIVER_NAME_WIDTH}s4x")
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class BinarySessionHeader:
+    identifier_count: int
+    driver_count: int
+    start_count: int
+    end_count: int
+    ignore_errors: bool = False
+    rejected_lines: int = 0
+
+    @staticmethod
+    def unpack_from(buffer: bytes | memoryview) -> "BinarySessionHeader | None":
+        """
+        Returns the header of a binary session, or None when the buffer does not start with a header
+        of the supported version.
+        """
+        if len(buffer) < HEADER.size:
+            return None
+        magic, version, ignore_errors, identifier_count, driver_count, start_count, end_count, rejected_lines = (
+            HEADER.unpack_from(buffer)
+        )
+        if magic != BINARY_SESSION_MAGIC or version != BINARY_SESSION_VERSION:
+            return None
+        return BinarySessionHeader(
+            identifier_count, driver_count, start_count, end_count, ignore_errors, rejected_lines
+        )
+
+    def pack(self) -> bytes:
+        return HEADER.pack(
+            BINARY_SESSION_MAGIC,
+            BINARY_SESSION_VERSION,
+            self.ignore_errors,
+            self.identifier_count,
+            self.driver_count,
+            self.start_count,
+            self.end_count,
+            self.rejected_lines,
+        )
+
+    def is_valid_for(self, ignore_errors: bool | None, *, record_rejections: bool) -> bool:
+        """
+        Checks whether the records hold what a build with these options would parse from the text files.
+        Lines dropped by a conversion with ignore_errors have to be raised by a strict build and listed
+        by a build recording rejections, so only a lenient build without a rejection report can skip them.
+        """
+        return not self.rejected_lines or (bool(ignore_errors) and not record_rejections)
+
+    @property
+    def file_size(self) -> int:
+        return (
+            RECORDS_OFFSET
+            + (self.start_count + self.end_count) * TIMESTAMP_RECORD.size
+            + self.identifier_count * IDENTIFIER_RECORD.size
+            + self.driver_count * DRIVER_RECORD.size
+        )
+
+
+class BinarySession:
+    """
+    Memory-mapped binary session. The records are unpacked straight from the mapping, so loading
+    a session copies nothing but the identifier and driver tables.
+    Raises MissedFileError if the file is missing and InvalidFormatDataError if it is not a binary
+    session of the supported version.
+    """
+
+    def __init__(self, filepath: Path) -> None:
+        self.filepath = filepath
+        try:
+            binary_file = Path.open(filepath, "rb")
+        except FileNotFoundError as error:
+            raise MissedFileError(f"Error! The file path: {filepath} is not found or cannot be opened.") from error
+        with binary_file:
+            file_size = os.fstat(binary_file.fileno()).st_size
+            if file_size < RECORDS_OFFSET:
+                raise InvalidFormatDataError(
+                    f"Error! The file: {filepath} is not a binary session of version {BINARY_SESSION_VERSION}."
+                )
+            self._mapped_file = mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mapped_file)
+        header = BinarySessionHeader.unpack_from(self._view)
+        if header is None or header.file_size != file_size:
+            self.close()
+            raise InvalidFormatDataError(
+                f"Error! The file: {filepath} is not a binary session of version {BINARY_SESSION_VERSION}."
+            )
+        self.header = header
+        self.sources: tuple[tuple[int, int], ...] = tuple(
+            SOURCE_RECORD.iter_unpack(self._view[HEADER.size : RECORDS_OFFSET])
+        )
+        self._end_offset = RECORDS_OFFSET + self.header.start_count * TIMESTAMP_RECORD.size
+        self._tables_offset = self._end_offset + self.header.end_count * TIMESTAMP_RECORD.size
+        drivers_offset = self._tables_offset + self.header.identifier_count * IDENTIFIER_RECORD.size
+        self.identifiers = [
+            _decode_field(raw_identifier)
+            for (raw_identifier,) in IDENTIFIER_RECORD.iter_unpack(self._view[self._tables_offset : drivers_offset])
+        ]
+        self.drivers = [
+            Driver(identifier=self.identifiers[code], name=_decode_field(name), car_model=_decode_field(car_model))
+            for code, name, car_model in DRIVER_RECORD.iter_unpack(self._view[drivers_offset:])
+        ]
+
+    def __enter__(self) -> "BinarySession":  # noqa: PYI034
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._view.release()
+        self._mapped_file.close()
+
+    def start_records(self) -> Iterator[tuple[int, int]]:
+        """
+        Yields the (epoch microseconds, identifier code) records of the start log in file order.
+        """
+        return TIMESTAMP_RECORD.iter_unpack(self._view[RECORDS_OFFSET : self._end_offset])
+
+    def end_records(self) -> Iterator[tuple[int, int]]:
+        """
+        Yields the (epoch microseconds, identifier code) records of the end log in file order.
+        """
+        return TIMESTAMP_RECORD.iter_unpack(self._view[self._end_offset : self._tables_offset])
+
+
+def find_binary_session(base_dir: Path) -> Path | None:
+    """
+    Returns the binary session of a directory, or None when there is none or when one of the text files
+    was changed since the conversion, so the report is built from the text files instead of outdated data.
+    Text files removed after the conversion do not make the binary session outdated.
+    """
+    filepath = base_dir / FilePaths.BINARY_SESSION
+    try:
+        with Path.open(filepath, "rb") as binary_file:
+            raw_header = binary_file.read(RECORDS_OFFSET)
+    except FileNotFoundError:
+        return None
+    if len(raw_header) < RECORDS_OFFSET or BinarySessionHeader.unpack_from(raw_header) is None:
+        # Invalid files are left to BinarySession, which reports them.
+        return filepath
+    sources = SOURCE_RECORD.iter_unpack(raw_header[HEADER.size :])
+    for source, current_source in zip(sources, source_fingerprints(base_dir), strict=True):
+        if current_source is not None and current_source != source:
+            logger.warning(f"Binary session '{filepath}' is older than the text files, run convert again.")
+            return None
+    return filepath
+
+
+def source_fingerprints(base_dir: Path) -> tuple[tuple[int, int] | None, ...]:
+    """
+    Returns the size and mtime of the text files of a session, None for a missing file.
+    """
+    fingerprints: list[tuple[int, int] | None] = []
+    for file_name in TEXT_SESSION_FILES:
+        try:
+            file_stat = resolve_session_file(base_dir, file_name).stat()
+        except FileNotFoundError:
+            fingerprints.append(None)
+            continue
+        fingerprints.append((file_stat.st_size, file_stat.st_mtime_ns))
+    return tuple(fingerprints)
+
+
+def calculate_binary_lap_statistics(
+    session: BinarySession,
+    ignore_errors: bool | None,
+    *,
+    multi_lap: bool = False,
+    metrics: Metrics = DISABLED_METRICS,
+) -> dict[str, LapStatistics]:
+    """
+    Pairs the laps of a binary session like build_q1_report pairs the laps of the text logs: the last
+    start and end of a driver win, or with multi_lap the n-th start is paired with the n-th end.
+    Raises InvalidRaceTimeError for the first driver of the end log whose start time exceeds the end time.
+    """
+    starts = _group_records(session.start_records(), keep_all=multi_lap)
+    ends = _group_records(session.end_records(), keep_all=multi_lap)
+    lap_statistics = {}
+    for code, end_timestamps in ends.items():
+        if code not in starts:
+            continue
+        identifier = session.identifiers[code]
+        lap = pair_lap_timestamps(identifier, starts[code], end_timestamps, ignore_errors)
+        if lap is not None:
+            lap_statistics[identifier] = lap
+    count_unmatched_identifiers(
+        metrics, without_start=len(ends.keys() - starts.keys()), without_end=len(starts.keys() - ends.keys())
+    )
+    return lap_statistics
+
+
+def _group_records(records: Iterable[tuple[int, int]], *, keep_all: bool) -> dict[int, list[int]]:
+    grouped: dict[int, list[int]] = {}
+    for timestamp, code in records:
+        if keep_all and code in grouped:
+            grouped[code].append(timestamp)
+        else:
+            grouped[code] = [timestamp]
+    return grouped
+
+
+def convert_session(
+    base_dir: Path,
+    output_file: Path | None = None,
+    ignore_errors: bool | None = None,
+    *,
+    rejections: RejectionReport = DISABLED_REJECTIONS,
+) -> BinarySessionHeader:
+    """
+    Converts the text files of a session into a binary session, by default next to them.
+    The files are validated once here, invalid lines are recorded in rejections and the first one is
+    raised unless ignore_errors is set. The records are streamed to a temporary file that replaces
+    the output file once it is complete, so memory only depends on the number of identifiers.
+    The size and mtime of the text files are stored with the records, so a later change of a text file
+    is detected by find_binary_session. The header also records ignore_errors and the number of dropped
+    lines, so a strict build does not accept records that skipped invalid lines.
+    Raises InvalidFormatDataError when a driver does not fit the fixed-width driver table.
+    """
+    if output_file is None:
+        output_file = base_dir / FilePaths.BINARY_SESSION
+    # Taken before the files are read, so a change made during the conversion also outdates the output.
+    sources = source_fingerprints(base_dir)
+    abbreviations_file, start_log_file, end_log_file = (
+        resolve_session_file(base_dir, file_name) for file_name in TEXT_SESSION_FILES
+    )
+    # Counts the dropped lines whether rejections records them or not.
+    metrics = Metrics()
+    drivers = create_driver_list(abbreviations_file, ignore_errors, metrics=metrics, rejections=rejections)
+    codes: dict[str, int] = {}
+    for driver in drivers:
+        codes.setdefault(driver.identifier, len(codes))
+    temporary_file = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    try:
+        with Path.open(temporary_file, "wb", buffering=WRITE_BUFFER_SIZE) as binary_file:
+            binary_file.write(bytes(RECORDS_OFFSET))
+            start_count, end_count = (
+                _write_records(
+                    binary_file,
+                    iter_log_entries(log_file, ignore_errors, metrics=metrics, rejections=rejections),
+                    codes,
+                )
+                for log_file in (start_log_file, end_log_file)
+            )
+            for identifier in codes:
+                binary_file.write(IDENTIFIER_RECORD.pack(_encode_field(identifier, IDENTIFIER_WIDTH)))
+            for driver in drivers:
+                binary_file.write(_pack_driver(driver, codes[driver.identifier]))
+            header = BinarySessionHeader(
+                len(codes),
+                len(drivers),
+                start_count,
+                end_count,
+                ignore_errors=bool(ignore_errors),
+                rejected_lines=metrics.counters.get("lines_rejected", 0),
+            )
+            binary_file.seek(0)
+            binary_file.write(header.pack())
+            for source in sources:
+                binary_file.write(SOURCE_RECORD.pack(*(source or (0, 0))))
+        temporary_file.replace(output_file)
+    finally:
+        temporary_file.unlink(missing_ok=True)
+    return header
+
+
+def _write_records(binary_file: BinaryIO, entries: Iterable[TimeStampDict], codes: dict[str, int]) -> int:
+    """
+    Writes the records of a log in file order, adding the identifiers missing from the driver table to codes.
+    """
+    count = 0
+    for entry in entries:
+        code = codes.setdefault(entry["identifier"], len(codes))
+        timestamp = datetime_to_epoch_ns(entry["timestamp"]) // NANOSECONDS_PER_MICROSECOND
+        binary_file.write(TIMESTAMP_RECORD.pack(timestamp, code))
+        count += 1
+    return count
+
+
+def _pack_driver(driver: Driver, code: int) -> bytes:
+    return DRIVER_RECORD.pack(
+        code,
+        _encode_field(driver.name, DRIVER_NAME_WIDTH),
+        _encode_field(driver.car_model, DRIVER_NAME_WIDTH),
+    )
+
+
+def _encode_field(value: str, width: int) -> bytes:
+    encoded_value = value.encode()
+    if len(encoded_value) > width:
+        raise InvalidFormatDataError(f"Error! The value: '{value}' is longer than {width} bytes.")
+    return encoded_value
+
+
+def _decode_field(raw_value: bytes) -> str:
+    return raw_value.rstrip(b"\0").decode()
@@ -0,0 +1,169 @@
+from array import array
+from importlib.util import find_spec
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from formula1_race_analysis.exceptions import InvalidRaceTimeError
+from formula1_race_analysis.file_reader import iter_file_lines
+from formula1_race_analysis.instrumentation import DISABLED_METRICS, Metrics
+from formula1_race_analysis.log_parser import classify_log_line
+from formula1_race_analysis.rejections import DISABLED_REJECTIONS, RejectionReason, RejectionReport, reject_line
+from formula1_race_analysis.schemas import ID_SLICER
+from formula1_race_analysis.timestamps import datetime_to_epoch_ns, decode_fixed_width_epoch_ns
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# NumPy is only imported once a session is joined with it, it costs more to import than most sessions to parse.
+HAS_NUMPY = find_spec("numpy") is not None
+MISSING_TIMESTAMP = -(2**63)
+
+
+class LogColumns:
+    """
+    Identifier codes and epoch nanosecond timestamps of one log file, stored as typed arrays.
+    """
+
+    def __init__(self) -> None:
+        self.codes = array("q")
+        self.timestamps = array("q")
+
+
+def load_log_columns(  # noqa: PLR0913
+    filepath: Path,
+    identifier_codes: dict[str, int],
+    ignore_errors: bool | None,
+    *,
+    use_mmap: bool = False,
+    metrics: Metrics = DISABLED_METRICS,
+    rejections: RejectionReport = DISABLED_REJECTIONS,
+) -> LogColumns:
+    """
+    Loads a log file into typed arrays without creating a datetime per line.
+    New identifiers are appended to identifier_codes, so several files share the same codes.
+    Invalid lines are skipped, recorded and reported just like in parse_log_file.
+    """
+    columns = LogColumns()
+    lines_read = lines_rejected = 0
+    for lines_read, line in enumerate(iter_file_lines(filepath, use_mmap=use_mmap), 1):
+        log_info = line.strip("\n")
+        timestamp = decode_fixed_width_epoch_ns(log_info)
+        if timestamp is None:
+            if line.isspace():
+                continue
+            entry = classify_log_line(line)
+            if isinstance(entry, RejectionReason):
+                lines_rejected += 1
+                reject_line(rejections, filepath, lines_read, entry, line, ignore_errors=ignore_errors)
+                continue
+            identifier, timestamp = entry["identifier"], datetime_to_epoch_ns(entry["timestamp"])
+        else:
+            identifier = log_info[:ID_SLICER].upper()
+        columns.codes.append(identifier_codes.setdefault(identifier, len(identifier_codes)))
+        columns.timestamps.append(timestamp)
+    metrics.increment("lines_read", lines_read)
+    metrics.increment("lines_parsed", len(columns.codes))
+    metrics.increment("lines_rejected", lines_rejected)
+    return columns
+
+
+def calculate_columnar_lap_times(  # noqa: PLR0913
+    start_log_file: Path,
+    end_log_file: Path,
+    ignore_errors: bool | None,
+    *,
+    use_mmap: bool = False,
+    use_numpy: bool | None = None,
+    metrics: Metrics = DISABLED_METRICS,
+    rejections: RejectionReport = DISABLED_REJECTIONS,
+) -> dict[str, int]:
+    """
+    Calculates lap times in nanoseconds for every driver present in both log files.
+    The last line of a driver wins in each file, as in parse_log_file, and the deltas are computed
+    over whole arrays, with NumPy when it is installed and the stdlib array module otherwise.
+    Raises InvalidRaceTimeError for the first driver of end.log whose start time exceeds the end time.
+    """
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+
+    identifier_codes: dict[str, int] = {}
+    with metrics.stage("parse_log_file"):
+        start_columns = load_log_columns(
+            start_log_file, identifier_codes, ignore_errors, use_mmap=use_mmap, metrics=metrics, rejections=rejections
+        )
+        end_columns = load_log_columns(
+            end_log_file, identifier_codes, ignore_errors, use_mmap=use_mmap, metrics=metrics, rejections=rejections
+        )
+
+    join = _join_with_numpy if use_numpy else _join_with_array
+    with metrics.stage("calculate_lap_time"):
+        lap_times, invalid_codes = join(start_columns, end_columns, len(identifier_codes))
+
+    identifiers = list(identifier_codes)
+    if invalid_codes and not ignore_errors:
+        raise InvalidRaceTimeError(
+            f"Race time error for driver: '{identifiers[invalid_codes[0]]}'. Start time is greater than end time.",
+        )
+    return {identifiers[code]: lap_time for code, lap_time in lap_times}
+
+
+def _join_with_array(
+    start_columns: LogColumns,
+    end_columns: LogColumns,
+    codes_count: int,
+) -> tuple[list[tuple[int, int]], list[int]]:
+    start_timestamps = _last_timestamps_with_array(start_columns, codes_count)
+    end_timestamps = _last_timestamps_with_array(end_columns, codes_count)
+
+    lap_times = []
+    invalid_codes = []
+    for code in dict.fromkeys(end_columns.codes):
+        if start_timestamps[code] == MISSING_TIMESTAMP:
+            continue
+        lap_time = end_timestamps[code] - start_timestamps[code]
+        if lap_time < 0:
+            invalid_codes.append(code)
+        else:
+            lap_times.append((code, lap_time))
+    return lap_times, invalid_codes
+
+
+def _last_timestamps_with_array(columns: LogColumns, codes_count: int) -> array[int]:
+    last_timestamps = array("q", [MISSING_TIMESTAMP]) * codes_count
+    for code, timestamp in zip(columns.codes, columns.timestamps, strict=True):
+        last_timestamps[code] = timestamp
+    return last_timestamps
+
+
+def _join_with_numpy(
+    start_columns: LogColumns,
+    end_columns: LogColumns,
+    codes_count: int,
+) -> tuple[list[tuple[int, int]], list[int]]:
+    import numpy as np  # noqa: PLC0415
+
+    start_timestamps = _last_timestamps_with_numpy(start_columns, codes_count)
+    end_timestamps = _last_timestamps_with_numpy(end_columns, codes_count)
+
+    end_codes = np.frombuffer(end_columns.codes, dtype=np.int64)
+    unique_codes, first_positions = np.unique(end_codes, return_index=True)
+    end_order = unique_codes[np.argsort(first_positions, kind="stable")]
+    end_order = end_order[start_timestamps[end_order] != MISSING_TIMESTAMP]
+
+    lap_times = end_timestamps[end_order] - start_timestamps[end_order]
+    invalid = lap_times < 0
+    return (
+        list(zip(end_order[~invalid].tolist(), lap_times[~invalid].tolist(), strict=True)),
+        end_order[invalid].tolist(),
+    )
+
+
+def _last_timestamps_with_numpy(columns: LogColumns, codes_count: int) -> "np.ndarray":
+    import numpy as np  # noqa: PLC0415
+
+    codes = np.frombuffer(columns.codes, dtype=np.int64)
+    timestamps = np.frombuffer(columns.timestamps, dtype=np.int64)
+    last_timestamps = np.full(codes_count, MISSING_TIMESTAMP, dtype=np.int64)
+    unique_codes, reversed_positions = np.unique(codes[::-1], return_index=True)
+    last_timestamps[unique_codes] = timestamps[len(timestamps) - 1 - reversed_positions]
+    return last_timestamps
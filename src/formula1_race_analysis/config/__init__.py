@@ -1,2 +1,13 @@
-from .file_paths import FilePaths
+from .data_format import ID_LENGTH, ID_SLICER
+from .file_paths import TEXT_SESSION_FILES, FilePaths
 from .logging_config import logger
+from .report_options import (
+    DEFAULT_CHUNKSIZE,
+    DEFAULT_EXTERNAL_RUN_SIZE,
+    DEFAULT_PARSE_CHUNK_SIZE,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_REPORT_CACHE_BYTES,
+    DEFAULT_SERVER_HOST,
+    DEFAULT_SERVER_PORT,
+    LapTimeBackend,
+)
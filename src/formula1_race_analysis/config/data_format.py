@@ -0,0 +1,2 @@
+ID_SLICER = 3
+ID_LENGTH = 3
@@ -5,3 +5,7 @@ class FilePaths(StrEnum):
     ABBREVIATIONS = "abbreviations.txt"
     START_LOG = "start.log"
     END_LOG = "end.log"
+    BINARY_SESSION = "session.f1bin"
+
+
+TEXT_SESSION_FILES = (FilePaths.ABBREVIATIONS, FilePaths.START_LOG, FilePaths.END_LOG)
@@ -1,11 +1,21 @@
 import logging
 import sys
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
-import structlog
+if TYPE_CHECKING:
+    import structlog
 
 
-def logger_factory() -> structlog.stdlib.BoundLogger:
-    logging.basicConfig(format="%(message)s", stream=sys.stdout, level=logging.INFO)
+@cache
+def logger_factory() -> "structlog.stdlib.BoundLogger":
+    """
+    Configures logging on the first call and returns the shared logger.
+    structlog is imported here so that importing the package does not pay for it.
+    """
+    import structlog  # noqa: PLC0415
+
+    logging.basicConfig(format="%(message)s", stream=sys.stderr, level=logging.INFO)
 
     structlog.configure(
         processors=[
@@ -16,11 +26,20 @@ def logger_factory() -> structlog.stdlib.BoundLogger:
             structlog.processors.format_exc_info,
             structlog.dev.ConsoleRenderer(),
         ],
-        logger_factory=structlog.stdlib.LoggerFactory(),
+        logger_factory=structlog.stdlib.LoggerFactory(ignore_frame_names=[__name__]),
         wrapper_class=structlog.stdlib.BoundLogger,
         cache_logger_on_first_use=True,
     )
     return structlog.get_logger()
 
 
-logger = logger_factory()
+class LazyLogger:
+    """
+    Stands in for the structlog logger until a log method is first used.
+    """
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        return getattr(logger_factory(), name)
+
+
+logger = LazyLogger()
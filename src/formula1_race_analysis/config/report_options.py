@@ -0,0 +1,14 @@
+from enum import StrEnum
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_CHUNKSIZE = 1
+DEFAULT_PARSE_CHUNK_SIZE = 64 * 1024 * 1024
+DEFAULT_EXTERNAL_RUN_SIZE = 1_000_000
+DEFAULT_REPORT_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_SERVER_HOST = "127.0.0.1"
+DEFAULT_SERVER_PORT = 8000
+
+
+class LapTimeBackend(StrEnum):
+    PYTHON = "python"
+    COLUMNAR = "columnar"
@@ -1,2 +1,12 @@
-from .display_race_report import SortStrategy, display_race_report, filter_report, sort_report
+from .batch_report_generator import batch_report
+from .convert_command import convert
+from .display_race_report import (
+    SortStrategy,
+    display_race_report,
+    filter_report,
+    first_report_position,
+    sort_report,
+)
 from .q1_report_generator import generate_report
+from .report_server_command import serve
+from .results_store_commands import ingest, query
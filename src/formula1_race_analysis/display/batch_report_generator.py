@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import click
+
+from formula1_race_analysis.config import DEFAULT_CHUNKSIZE, LapTimeBackend, logger
+from formula1_race_analysis.display.profiling_options import profiling_options
+
+
+@click.command()
+@profiling_options
+@click.option(
+    "--sessions",
+    required=True,
+    help="Root directory searched recursively for sessions, or a glob pattern of session directories.",
+)
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), required=True, help="JSON Lines output.")
+@click.option("--workers", type=click.IntRange(min=1), default=None, help="Worker processes. Defaults to CPU count.")
+@click.option("--chunksize", type=click.IntRange(min=1), default=DEFAULT_CHUNKSIZE, show_default=True)
+@click.option("--ignore_errors", is_flag=True, default=False)
+@click.option("--multi_lap", is_flag=True, default=False, help="Rank drivers by their best lap of a multi-lap session.")
+@click.option(
+    "--backend",
+    type=click.Choice([backend.value for backend in LapTimeBackend], case_sensitive=False),
+    default=LapTimeBackend.PYTHON.value,
+    show_default=True,
+)
+def batch_report(  # noqa: PLR0913, PLR0917
+    sessions: str,
+    output: Path,
+    workers: int | None,
+    chunksize: int,
+    ignore_errors: bool | None,
+    multi_lap: bool,
+    backend: str,
+) -> None:
+    from formula1_race_analysis.batch_report import BatchOptions, discover_sessions, run_batch_report  # noqa: PLC0415
+
+    session_dirs = discover_sessions(sessions)
+    if not session_dirs:
+        logger.error(f"No sessions found for: '{sessions}'.")
+        click.get_current_context().exit(1)
+
+    logger.info(f"Processing {len(session_dirs)} sessions.")
+    options = BatchOptions(ignore_errors=ignore_errors, multi_lap=multi_lap, backend=LapTimeBackend(backend.lower()))
+    with Path.open(output, "w", encoding="utf-8") as output_file:
+        summary = run_batch_report(session_dirs, output_file, options, workers=workers, chunksize=chunksize)
+
+    for session, error in summary.failed.items():
+        logger.error(f"Failed during report generation for session '{session}': {error}")
+    logger.info(f"Batch report finished: {summary.succeeded} succeeded, {len(summary.failed)} failed.")
+    if summary.failed:
+        click.get_current_context().exit(1)
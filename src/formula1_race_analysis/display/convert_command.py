@@ -0,0 +1,30 @@
+from pathlib import Path
+
+import click
+
+from formula1_race_analysis.config import FilePaths, logger
+from formula1_race_analysis.exceptions import Formula1RaceAnalysisError
+
+
+@click.command()
+@click.option("--data_dir", type=click.Path(exists=True, file_okay=False, path_type=Path), required=True)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help=f"Binary session file to write. Defaults to '{FilePaths.BINARY_SESSION}' inside the data directory.",
+)
+@click.option("--ignore_errors", is_flag=True, default=False)
+def convert(data_dir: Path, output: Path | None, ignore_errors: bool | None) -> None:
+    from formula1_race_analysis.binary_session import convert_session  # noqa: PLC0415
+
+    output_file = output or data_dir / FilePaths.BINARY_SESSION
+    try:
+        header = convert_session(data_dir, output_file, ignore_errors)
+    except Formula1RaceAnalysisError as error:
+        logger.error(f"Failed during converting session: {error}")
+        click.get_current_context().exit(1)
+    logger.info(
+        f"Converted '{data_dir}' into '{output_file}': {header.driver_count} drivers, "
+        f"{header.start_count} start and {header.end_count} end records, {header.rejected_lines} invalid lines dropped."
+    )
@@ -1,10 +1,12 @@
+import heapq
+import sys
 from enum import StrEnum
 
-from formula1_race_analysis import AbbreviationEntry, DisplayReportError
-from formula1_race_analysis.models import RaceResult, TableSize
+from formula1_race_analysis.display.report_writers import TableWriter
+from formula1_race_analysis.driver_index import DriverIndex
+from formula1_race_analysis.models import RaceResult
 
 THE_NUMBER_OF_FASTEST_DRIVERS_PASSED_Q1 = 15
-COLUMNS_WIDTHS = None
 
 
 class SortStrategy(StrEnum):
@@ -12,40 +14,70 @@ class SortStrategy(StrEnum):
     DESCENDING_ORDER = "desc"
 
 
-def display_race_report(report: list[RaceResult]) -> None:
+def display_race_report(
+    report: list[RaceResult],
+    knockout_position: int = THE_NUMBER_OF_FASTEST_DRIVERS_PASSED_Q1,
+    first_position: int = 1,
+) -> None:
     """
-    Displays a formatted race report.
+    Displays a formatted race report numbered from first_position.
+    A separator line is printed after the knockout position, 0 disables it.
     """
-    if not report:
-        raise DisplayReportError("Error! Failed during displaying rase results.")
+    TableWriter(sys.stdout).write(report, knockout_position, first_position)
 
-    table_size = TableSize.calculate_column_width(report)
 
-    for position, data in enumerate(report, start=1):
-        print(
-            f"{position:2d}. {data.driver.name:<{table_size.name_column_width}} | "
-            f"{data.driver.car_model:<{table_size.car_column_width}} | {data.format_lap_time()}"
-        )
-        if position == THE_NUMBER_OF_FASTEST_DRIVERS_PASSED_Q1:
-            print("_" * 60)
-            continue
-
-
-def sort_report(report: list[RaceResult], sort_strategy: SortStrategy) -> list[RaceResult]:
+def sort_report(
+    report: list[RaceResult],
+    sort_strategy: SortStrategy,
+    limit: int | None = None,
+    *,
+    slowest: bool = False,
+) -> list[RaceResult]:
     """
     Sorts the given report based on the specified sorting strategy.
+    With a limit only the fastest results (or the slowest ones) are kept, selected with a heap
+    instead of sorting the whole report. Tied lap times keep the order of the full sort.
     """
-    sorted_report = sorted(report, key=lambda data: data.lap_time)
+    if limit is None:
+        sorted_report = sorted(report, key=_lap_time_key)
+    elif slowest:
+        slowest_results = heapq.nlargest(limit, enumerate(report), key=_indexed_lap_time_key)
+        sorted_report = [data for _, data in reversed(slowest_results)]
+    else:
+        sorted_report = heapq.nsmallest(limit, report, key=_lap_time_key)
     if sort_strategy == SortStrategy.DESCENDING_ORDER:
-        return list(reversed(sorted_report))
+        sorted_report.reverse()
     return sorted_report
 
 
-def filter_report(report: list[RaceResult], raw_request: str) -> list[RaceResult] | None:
+def _lap_time_key(data: RaceResult) -> int:
+    return data.lap_time_us
+
+
+def _indexed_lap_time_key(indexed_data: tuple[int, RaceResult]) -> tuple[int, int]:
+    index, data = indexed_data
+    return data.lap_time_us, index
+
+
+def first_report_position(
+    report_size: int, selected_size: int, sort_strategy: SortStrategy, *, slowest: bool = False
+) -> int:
+    """
+    Returns the position of the first selected result in the whole report sorted the same way,
+    so a report limited by sort_report keeps the real positions of its drivers.
+    """
+    if slowest == (sort_strategy == SortStrategy.ASCENDING_ORDER):
+        return report_size - selected_size + 1
+    return 1
+
+
+def filter_report(
+    report: list[RaceResult], raw_request: str, index: DriverIndex | None = None
+) -> list[RaceResult] | None:
     """
-    Filters the report by the given driver name.
+    Filters the report by the given driver identifier, name or partial name.
+    Pass a prebuilt DriverIndex to answer many requests against the same report.
     """
-    formatted_id, formatted_name = AbbreviationEntry.validate_request(raw_request)
-    if not formatted_id and not formatted_name:
-        return None
-    return [data for data in report if (data.driver.identifier == formatted_id) or (data.driver.name == formatted_name)]
+    if index is None:
+        index = DriverIndex(report)
+    return index.lookup(raw_request) or None
@@ -0,0 +1,54 @@
+import functools
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+
+from formula1_race_analysis.profiling import DEFAULT_TOP_FUNCTIONS, PipelineProfiler
+
+
+def profiling_options(command: Callable[..., None]) -> Callable[..., None]:
+    """
+    Adds the profiling options to a command; with --profile the command runs under PipelineProfiler
+    and the hot-function summary is printed to stderr, so the report on stdout stays unchanged.
+    """
+
+    @click.option(
+        "--profile",
+        "profile_prefix",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        help="Profile the run and write PREFIX.prof (pstats) and PREFIX.collapsed (flamegraph stacks).",
+    )
+    @click.option(
+        "--profile-memory", "profile_memory", is_flag=True, default=False, help="With '--profile', also trace memory."
+    )
+    @click.option(
+        "--profile-top",
+        "profile_top",
+        type=click.IntRange(min=1),
+        default=DEFAULT_TOP_FUNCTIONS,
+        show_default=True,
+        help="Number of hot package functions printed with '--profile'.",
+    )
+    @functools.wraps(command)
+    def wrapper(
+        *args: Any,  # noqa: ANN401
+        profile_prefix: Path | None,
+        profile_memory: bool,
+        profile_top: int,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        if profile_prefix is None:
+            command(*args, **kwargs)
+            return
+        profiler = PipelineProfiler(profile_prefix, trace_memory=profile_memory, top=profile_top)
+        try:
+            with profiler:
+                command(*args, **kwargs)
+        finally:
+            for line in profiler.summary:
+                click.echo(line, err=True)
+
+    return wrapper
@@ -1,19 +1,36 @@
+import sys
+from collections.abc import Callable
 from pathlib import Path
 
 import click
 
-from formula1_race_analysis.config import logger
+from formula1_race_analysis.config import (
+    DEFAULT_EXTERNAL_RUN_SIZE,
+    DEFAULT_PARSE_CHUNK_SIZE,
+    DEFAULT_POLL_INTERVAL,
+    FilePaths,
+    LapTimeBackend,
+    logger,
+)
 from formula1_race_analysis.display.display_race_report import (
+    THE_NUMBER_OF_FASTEST_DRIVERS_PASSED_Q1,
     SortStrategy,
     display_race_report,
     filter_report,
+    first_report_position,
     sort_report,
 )
+from formula1_race_analysis.display.profiling_options import profiling_options
+from formula1_race_analysis.display.report_writers import WRITE_BUFFER_SIZE, OutputFormat, write_report
+from formula1_race_analysis.driver_index import DriverIndex
 from formula1_race_analysis.exceptions import Formula1RaceAnalysisError
-from formula1_race_analysis.q1_session_analyzer import build_q1_report
+from formula1_race_analysis.instrumentation import Metrics
+from formula1_race_analysis.models import RaceResult
+from formula1_race_analysis.rejections import DEFAULT_REJECTION_LIMIT, RejectionReport
 
 
 @click.command()
+@profiling_options
 @click.option("--data_dir", type=click.Path(exists=True, dir_okay=True, path_type=Path), required=True)
 @click.option(
     "--order",
@@ -22,34 +39,371 @@ from formula1_race_analysis.q1_session_analyzer import build_q1_report
     show_default=True,
     help="['asc'] = To sort results in ascending order, ['desc'] = To sort results in descending order",
 )
-@click.option("--driver", default=str)
+@click.option("--driver", multiple=True, help="Filter the report by driver identifier or name, can be repeated.")
 @click.option("--ignore_errors", is_flag=True, default=False)
-def generate_report(data_dir: Path, order: str, driver: str, ignore_errors: bool | None) -> None:
+@click.option("--multi_lap", is_flag=True, default=False, help="Rank drivers by their best lap of a multi-lap session.")
+@click.option(
+    "--backend",
+    type=click.Choice([backend.value for backend in LapTimeBackend], case_sensitive=False),
+    default=LapTimeBackend.PYTHON.value,
+    show_default=True,
+    help="['python'] = Per-record lap time calculation, ['columnar'] = Batch calculation over typed arrays",
+)
+@click.option("--no-cache", "no_cache", is_flag=True, default=False, help="Always parse the session files.")
+@click.option(
+    "--cache-dir",
+    "cache_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Directory of the parsed session cache. Defaults to a hidden directory inside the data directory.",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Keep the intermediate results next to the cache and only parse again the changed parts of the session.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes parsing the logs, each log is split into byte ranges when it is more than 1.",
+)
+@click.option(
+    "--chunk-size",
+    "chunk_size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_PARSE_CHUNK_SIZE,
+    show_default=True,
+    help="Size in bytes of the log ranges parsed by the workers.",
+)
+@click.option(
+    "--external-join",
+    "external_join",
+    is_flag=True,
+    default=False,
+    help="Join the logs through sorted runs spilled to temporary files, for logs larger than the memory.",
+)
+@click.option(
+    "--run-size",
+    "run_size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_EXTERNAL_RUN_SIZE,
+    show_default=True,
+    help="Log lines sorted in memory per run of the external join.",
+)
+@click.option("--top", type=click.IntRange(min=1), default=None, help="Display only the N fastest drivers.")
+@click.option("--bottom", type=click.IntRange(min=1), default=None, help="Display only the N slowest drivers.")
+@click.option(
+    "--knockout",
+    type=click.IntRange(min=0),
+    default=THE_NUMBER_OF_FASTEST_DRIVERS_PASSED_Q1,
+    show_default=True,
+    help="Position after which the knockout line is drawn, 0 = No knockout line",
+)
+@click.option("--follow", is_flag=True, default=False, help="Keep following the logs of a live session.")
+@click.option(
+    "--poll_interval",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_POLL_INTERVAL,
+    show_default=True,
+    help="Seconds between two reads of the followed logs.",
+)
+@click.option("--max_polls", type=click.IntRange(min=1), default=None, hidden=True)
+@click.option("--metrics", "log_metrics", is_flag=True, default=False, help="Log stage timings and line counters.")
+@click.option(
+    "--metrics-out",
+    "metrics_out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write stage timings and line counters to a JSON file, implies '--metrics'.",
+)
+@click.option(
+    "--rejects-out",
+    "rejects_out",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the file, line number and reason of every rejected input line to a JSON file.",
+)
+@click.option(
+    "--rejects-limit",
+    "rejects_limit",
+    type=click.IntRange(min=0),
+    default=DEFAULT_REJECTION_LIMIT,
+    show_default=True,
+    help="Rejected lines listed in the '--rejects-out' file, further ones are only counted.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice([output_format.value for output_format in OutputFormat], case_sensitive=False),
+    default=OutputFormat.TABLE.value,
+    show_default=True,
+    help="Report format, the knockout line is only drawn in the table.",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write the report to a file instead of stdout.",
+)
+def generate_report(  # noqa: PLR0913, PLR0917
+    data_dir: Path,
+    order: str,
+    driver: tuple[str, ...],
+    ignore_errors: bool | None,
+    multi_lap: bool,
+    backend: str,
+    no_cache: bool,
+    cache_dir: Path | None,
+    incremental: bool,
+    workers: int,
+    chunk_size: int,
+    external_join: bool,
+    run_size: int,
+    top: int | None,
+    bottom: int | None,
+    knockout: int,
+    follow: bool,
+    poll_interval: float,
+    max_polls: int | None,
+    log_metrics: bool,
+    metrics_out: Path | None,
+    rejects_out: Path | None,
+    rejects_limit: int,
+    output_format: str,
+    output: Path | None,
+) -> None:
+    _check_exclusive_options(
+        top=top,
+        bottom=bottom,
+        incremental=incremental,
+        no_cache=no_cache,
+        multi_lap=multi_lap,
+        workers=workers,
+        external_join=external_join,
+        backend=backend,
+    )
+    metrics = Metrics(enabled=log_metrics or metrics_out is not None)
+    rejections = RejectionReport(enabled=rejects_out is not None, limit=rejects_limit)
+    if follow and (
+        driver
+        or backend.lower() != LapTimeBackend.PYTHON
+        or workers > 1
+        or external_join
+        or no_cache
+        or cache_dir is not None
+        or incremental
+        or metrics.enabled
+        or rejections.enabled
+        or output_format.lower() != OutputFormat.TABLE
+        or output is not None
+    ):
+        raise click.UsageError(
+            "Option '--follow' cannot be used with '--driver', '--backend columnar', '--workers', '--external-join', "
+            "'--no-cache', '--cache-dir', '--incremental', '--metrics', '--metrics-out', '--rejects-out', "
+            "'--format' or '--output'."
+        )
+    order_strategy = SortStrategy.DESCENDING_ORDER if order.lower() == "desc" else SortStrategy.ASCENDING_ORDER
+
+    if follow:
+        _follow_race_report(
+            Path(data_dir),
+            ignore_errors,
+            multi_lap=multi_lap,
+            redraw=lambda report: _redraw_race_report(
+                report, order_strategy, top or bottom, knockout, slowest=bottom is not None
+            ),
+            poll_interval=poll_interval,
+            max_polls=max_polls,
+        )
+        return
     try:
         logger.debug(f"Starting report generation. Data directory: '{data_dir}'.")
-        database = build_q1_report(Path(data_dir), ignore_errors)
+        database = _build_race_report(
+            Path(data_dir),
+            ignore_errors,
+            multi_lap=multi_lap,
+            backend=LapTimeBackend(backend.lower()),
+            cache_dir=cache_dir,
+            use_cache=not no_cache,
+            incremental=incremental,
+            workers=workers,
+            chunk_size=chunk_size,
+            external_join=external_join,
+            run_size=run_size,
+            metrics=metrics,
+            rejections=rejections,
+        )
     except Formula1RaceAnalysisError as error:
         logger.error(f"Failed during report generation: {error}")
         click.get_current_context().exit(1)
+    finally:
+        if rejects_out is not None:
+            _write_rejections(rejections, rejects_out)
 
     logger.info("Processing F1 qualifying results.")
 
     if driver:
-        logger.debug(f"Filtering report for driver: '{driver}'.")
-        target_data = filter_report(database, driver)
-        logger.debug(f"Fetching statistics for driver: '{driver}'.")
-
-        if not target_data:
-            logger.error(f"No data found for driver: '{driver}'. Please check the driver name and try again.")
-            click.get_current_context().exit(1)
+        drivers = ", ".join(driver)
+        logger.debug(f"Filtering report for driver: '{drivers}'.")
+        with metrics.stage("filter_report"):
+            index = DriverIndex(database)
+            filtered_data = [filter_report(database, raw_request, index) or [] for raw_request in driver]
+        for raw_request, driver_data in zip(driver, filtered_data, strict=True):
+            if not driver_data:
+                logger.error(f"No data found for driver: '{raw_request}'. Please check the driver name and try again.")
+                click.get_current_context().exit(1)
+        target_data = list({id(data): data for driver_data in filtered_data for data in driver_data}.values())
+        first_position = 1
+        logger.debug(f"Fetching statistics for driver: '{drivers}'.")
 
-        logger.info(f"Displaying a race report for driver: {driver}")
+        logger.info(f"Displaying a race report for driver: {drivers}")
 
     else:
-        order_strategy = SortStrategy.DESCENDING_ORDER if order.lower() == "desc" else SortStrategy.ASCENDING_ORDER
         logger.debug(f"Sorting report in {order_strategy}ending order.")
-        target_data = sort_report(database, order_strategy)
+        with metrics.stage("sort_report"):
+            target_data = sort_report(database, order_strategy, top or bottom, slowest=bottom is not None)
+            first_position = first_report_position(
+                len(database), len(target_data), order_strategy, slowest=bottom is not None
+            )
         logger.debug(f"Report successfully sorted in {order_strategy}ending order.")
 
         logger.info("Displaying a race report:")
-    display_race_report(target_data)
+    with metrics.stage("display_race_report"):
+        _write_race_report(target_data, OutputFormat(output_format.lower()), output, knockout, first_position)
+
+    metrics.emit()
+    if metrics_out is not None:
+        metrics.write_json(metrics_out)
+
+
+def _check_exclusive_options(  # noqa: PLR0913
+    *,
+    top: int | None,
+    bottom: int | None,
+    incremental: bool,
+    no_cache: bool,
+    multi_lap: bool,
+    workers: int,
+    external_join: bool,
+    backend: str,
+) -> None:
+    if top is not None and bottom is not None:
+        raise click.UsageError("Options '--top' and '--bottom' cannot be used together.")
+    if multi_lap and backend.lower() == LapTimeBackend.COLUMNAR:
+        raise click.UsageError("Option '--multi_lap' cannot be used with '--backend columnar'.")
+    if incremental and (no_cache or workers > 1 or backend.lower() == LapTimeBackend.COLUMNAR):
+        raise click.UsageError(
+            "Option '--incremental' cannot be used with '--no-cache', '--workers' or '--backend columnar'."
+        )
+    if workers > 1 and backend.lower() == LapTimeBackend.COLUMNAR:
+        raise click.UsageError("Option '--workers' cannot be used with '--backend columnar'.")
+    if external_join and (incremental or workers > 1 or backend.lower() == LapTimeBackend.COLUMNAR):
+        raise click.UsageError(
+            "Option '--external-join' cannot be used with '--incremental', '--workers' or '--backend columnar'."
+        )
+
+
+def _build_race_report(  # noqa: PLR0913
+    data_dir: Path,
+    ignore_errors: bool | None,
+    *,
+    multi_lap: bool,
+    backend: LapTimeBackend,
+    cache_dir: Path | None,
+    use_cache: bool,
+    incremental: bool,
+    workers: int,
+    chunk_size: int,
+    external_join: bool,
+    run_size: int,
+    metrics: Metrics,
+    rejections: RejectionReport,
+) -> list[RaceResult]:
+    # The parsing modules are imported here, so that the CLI starts without loading pydantic.
+    from formula1_race_analysis.file_reader import is_compressed, resolve_session_file  # noqa: PLC0415
+    from formula1_race_analysis.q1_session_analyzer import build_q1_report  # noqa: PLC0415
+    from formula1_race_analysis.session_cache import build_cached_q1_report  # noqa: PLC0415
+
+    log_files = [resolve_session_file(data_dir, file_name) for file_name in (FilePaths.START_LOG, FilePaths.END_LOG)]
+    if workers > 1 and any(is_compressed(log_file) for log_file in log_files):
+        raise click.UsageError("Option '--workers' cannot be used with compressed logs.")
+
+    # A cached report holds no rejections, so the session is parsed whenever they are written out.
+    if not use_cache or rejections.enabled:
+        return build_q1_report(
+            data_dir,
+            ignore_errors,
+            multi_lap=multi_lap,
+            backend=backend,
+            workers=workers,
+            chunk_size=chunk_size,
+            external_join=external_join,
+            run_size=run_size,
+            metrics=metrics,
+            rejections=rejections,
+        )
+    return build_cached_q1_report(
+        data_dir,
+        ignore_errors,
+        cache_dir=cache_dir,
+        multi_lap=multi_lap,
+        backend=backend,
+        workers=workers,
+        chunk_size=chunk_size,
+        external_join=external_join,
+        run_size=run_size,
+        metrics=metrics,
+        incremental=incremental,
+    )
+
+
+def _write_rejections(rejections: RejectionReport, rejects_out: Path) -> None:
+    rejections.write_json(rejects_out)
+    if rejections.total:
+        logger.warning(f"Rejected {rejections.total} input lines, written to '{rejects_out}'.")
+
+
+def _follow_race_report(  # noqa: PLR0913
+    data_dir: Path,
+    ignore_errors: bool | None,
+    *,
+    multi_lap: bool,
+    redraw: Callable[[list[RaceResult]], None],
+    poll_interval: float,
+    max_polls: int | None,
+) -> None:
+    from formula1_race_analysis.live_session import LiveSession, follow_session  # noqa: PLC0415
+
+    try:
+        logger.debug(f"Starting live session. Data directory: '{data_dir}'.")
+        session = LiveSession(data_dir, ignore_errors, multi_lap=multi_lap)
+        logger.info("Following F1 qualifying session.")
+        follow_session(session, redraw, poll_interval=poll_interval, max_polls=max_polls)
+    except Formula1RaceAnalysisError as error:
+        logger.error(f"Failed during following session: {error}")
+        click.get_current_context().exit(1)
+    except KeyboardInterrupt:
+        logger.info("Stopped following F1 qualifying session.")
+
+
+def _write_race_report(
+    report: list[RaceResult], output_format: OutputFormat, output: Path | None, knockout: int, first_position: int = 1
+) -> None:
+    if output is None:
+        write_report(report, output_format, sys.stdout, knockout, first_position)
+        return
+    with Path.open(output, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as output_file:
+        write_report(report, output_format, output_file, knockout, first_position)
+
+
+def _redraw_race_report(
+    report: list[RaceResult], order_strategy: SortStrategy, limit: int | None, knockout: int, *, slowest: bool
+) -> None:
+    target_data = sort_report(report, order_strategy, limit, slowest=slowest)
+    click.clear()
+    display_race_report(
+        target_data, knockout, first_report_position(len(report), len(target_data), order_strategy, slowest=slowest)
+    )
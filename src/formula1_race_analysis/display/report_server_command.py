@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import click
+
+from formula1_race_analysis.config import DEFAULT_SERVER_HOST, DEFAULT_SERVER_PORT, LapTimeBackend, logger
+from formula1_race_analysis.exceptions import Formula1RaceAnalysisError
+
+
+@click.command()
+@click.option(
+    "--data_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    multiple=True,
+    required=True,
+    help="Session directory to serve, can be repeated. Sessions are queried by the directory name.",
+)
+@click.option("--host", default=DEFAULT_SERVER_HOST, show_default=True, help="Address the server listens on.")
+@click.option(
+    "--port",
+    type=click.IntRange(min=0, max=65535),
+    default=DEFAULT_SERVER_PORT,
+    show_default=True,
+    help="Port the server listens on, 0 = Any free port",
+)
+@click.option("--ignore_errors", is_flag=True, default=False)
+@click.option("--multi_lap", is_flag=True, default=False, help="Rank drivers by their best lap of a multi-lap session.")
+@click.option(
+    "--backend",
+    type=click.Choice([backend.value for backend in LapTimeBackend], case_sensitive=False),
+    default=LapTimeBackend.PYTHON.value,
+    show_default=True,
+)
+@click.option("--max_requests", type=click.IntRange(min=1), default=None, hidden=True)
+def serve(  # noqa: PLR0913, PLR0917
+    data_dir: tuple[Path, ...],
+    host: str,
+    port: int,
+    ignore_errors: bool | None,
+    multi_lap: bool,
+    backend: str,
+    max_requests: int | None,
+) -> None:
+    lap_time_backend = LapTimeBackend(backend.lower())
+    if multi_lap and lap_time_backend == LapTimeBackend.COLUMNAR:
+        raise click.UsageError("Option '--multi_lap' cannot be used with '--backend columnar'.")
+    if len({session_dir.name for session_dir in data_dir}) != len(data_dir):
+        raise click.UsageError("Session directories passed with '--data_dir' must have different names.")
+    from formula1_race_analysis.batch_report import BatchOptions  # noqa: PLC0415
+    from formula1_race_analysis.report_server import ReportServer, SessionStore  # noqa: PLC0415
+
+    store = SessionStore(
+        list(data_dir), BatchOptions(ignore_errors=ignore_errors, multi_lap=multi_lap, backend=lap_time_backend)
+    )
+    try:
+        store.load_all()
+    except Formula1RaceAnalysisError as error:
+        logger.error(f"Failed during loading sessions: {error}")
+        click.get_current_context().exit(1)
+
+    with ReportServer((host, port), store) as server:
+        logger.info(f"Serving {len(store.names)} sessions on http://{host}:{server.server_port}.")
+        try:
+            if max_requests is None:
+                server.serve_forever()
+            for _ in range(max_requests or 0):
+                server.handle_request()
+        except KeyboardInterrupt:
+            logger.info("Stopped serving sessions.")
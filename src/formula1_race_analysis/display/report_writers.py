@@ -0,0 +1,123 @@
+import csv
+import io
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from enum import StrEnum
+from itertools import batched
+from typing import TextIO
+
+from formula1_race_analysis.exceptions import DisplayReportError
+from formula1_race_analysis.models import RaceResult, TableSize
+
+ROWS_PER_CHUNK = 4096
+WRITE_BUFFER_SIZE = 1024 * 1024
+KNOCKOUT_LINE = "_" * 60
+CSV_COLUMNS = ("position", "identifier", "name", "car_model", "lap_time", "lap_count")
+
+
+class OutputFormat(StrEnum):
+    TABLE = "table"
+    CSV = "csv"
+    JSON = "json"
+    JSONL = "jsonl"
+
+
+class ReportWriter(ABC):
+    """
+    Streams a report to a text stream. Rows are rendered lazily and written in chunks of
+    ROWS_PER_CHUNK rows, so neither one write per row nor the whole rendered text is needed.
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def write(self, report: list[RaceResult], knockout_position: int = 0, first_position: int = 1) -> None:
+        for chunk in batched(self.render(report, knockout_position, first_position), ROWS_PER_CHUNK):
+            self.stream.write("".join(chunk))
+        self.stream.flush()
+
+    @abstractmethod
+    def render(self, report: list[RaceResult], knockout_position: int, first_position: int) -> Iterator[str]:
+        """
+        Yields the rendered rows of the report, numbered from first_position.
+        """
+
+
+class TableWriter(ReportWriter):
+    def render(self, report: list[RaceResult], knockout_position: int, first_position: int) -> Iterator[str]:
+        """
+        Renders the console table, a separator line follows the knockout position, 0 disables it.
+        """
+        if not report:
+            raise DisplayReportError("Error! Failed during displaying rase results.")
+        table_size = TableSize.calculate_column_width(report)
+        for position, data in enumerate(report, start=first_position):
+            yield (
+                f"{position:2d}. {data.driver.name:<{table_size.name_column_width}} | "
+                f"{data.driver.car_model:<{table_size.car_column_width}} | {data.format_lap_time()}\n"
+            )
+            if position == knockout_position:
+                yield f"{KNOCKOUT_LINE}\n"
+
+
+class CsvWriter(ReportWriter):
+    def render(
+        self,
+        report: list[RaceResult],
+        knockout_position: int,  # noqa: ARG002
+        first_position: int,
+    ) -> Iterator[str]:
+        buffer = io.StringIO()
+        csv_writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, lineterminator="\n")
+        csv_writer.writeheader()
+        for position, data in enumerate(report, start=first_position):
+            csv_writer.writerow(data.as_record(position))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+
+class JsonLinesWriter(ReportWriter):
+    def render(
+        self,
+        report: list[RaceResult],
+        knockout_position: int,  # noqa: ARG002
+        first_position: int,
+    ) -> Iterator[str]:
+        for position, data in enumerate(report, start=first_position):
+            yield f"{json.dumps(data.as_record(position))}\n"
+
+
+class JsonWriter(ReportWriter):
+    def render(
+        self,
+        report: list[RaceResult],
+        knockout_position: int,  # noqa: ARG002
+        first_position: int,
+    ) -> Iterator[str]:
+        """
+        Renders a JSON array element by element instead of serializing the whole report at once.
+        """
+        yield "["
+        for position, data in enumerate(report, start=first_position):
+            yield f"{',' if position > first_position else ''}\n  {json.dumps(data.as_record(position))}"
+        yield "\n]\n" if report else "]\n"
+
+
+REPORT_WRITERS: dict[OutputFormat, type[ReportWriter]] = {
+    OutputFormat.TABLE: TableWriter,
+    OutputFormat.CSV: CsvWriter,
+    OutputFormat.JSON: JsonWriter,
+    OutputFormat.JSONL: JsonLinesWriter,
+}
+
+
+def write_report(
+    report: list[RaceResult],
+    output_format: OutputFormat,
+    stream: TextIO,
+    knockout_position: int = 0,
+    first_position: int = 1,
+) -> None:
+    REPORT_WRITERS[output_format](stream).write(report, knockout_position, first_position)
@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import click
+
+from formula1_race_analysis.config import LapTimeBackend, logger
+from formula1_race_analysis.display.report_writers import OutputFormat
+from formula1_race_analysis.exceptions import Formula1RaceAnalysisError
+
+if TYPE_CHECKING:
+    from formula1_race_analysis.results_store import StoredResult
+
+QUERY_FORMATS = (OutputFormat.TABLE, OutputFormat.JSONL)
+
+
+@click.command()
+@click.option(
+    "--sessions",
+    required=True,
+    help="Root directory searched recursively for sessions, or a glob pattern of session directories.",
+)
+@click.option(
+    "--database", type=click.Path(dir_okay=False, path_type=Path), required=True, help="SQLite results store."
+)
+@click.option("--ignore_errors", is_flag=True, default=False)
+@click.option("--multi_lap", is_flag=True, default=False, help="Rank drivers by their best lap of a multi-lap session.")
+@click.option(
+    "--backend",
+    type=click.Choice([backend.value for backend in LapTimeBackend], case_sensitive=False),
+    default=LapTimeBackend.PYTHON.value,
+    show_default=True,
+)
+def ingest(sessions: str, database: Path, ignore_errors: bool | None, multi_lap: bool, backend: str) -> None:
+    lap_time_backend = LapTimeBackend(backend.lower())
+    if multi_lap and lap_time_backend == LapTimeBackend.COLUMNAR:
+        raise click.UsageError("Option '--multi_lap' cannot be used with '--backend columnar'.")
+    from formula1_race_analysis.batch_report import BatchOptions, discover_sessions  # noqa: PLC0415
+    from formula1_race_analysis.results_store import ResultsStore, ingest_sessions  # noqa: PLC0415
+
+    session_dirs = discover_sessions(sessions)
+    if not session_dirs:
+        logger.error(f"No sessions found for: '{sessions}'.")
+        click.get_current_context().exit(1)
+
+    logger.info(f"Ingesting {len(session_dirs)} sessions into '{database}'.")
+    options = BatchOptions(ignore_errors=ignore_errors, multi_lap=multi_lap, backend=lap_time_backend)
+    try:
+        with ResultsStore(database) as store:
+            summary = ingest_sessions(store, session_dirs, options)
+    except Formula1RaceAnalysisError as error:
+        logger.error(f"Failed during opening the results store: {error}")
+        click.get_current_context().exit(1)
+
+    for session, failure in summary.failed.items():
+        logger.error(f"Failed during ingesting session '{session}': {failure}")
+    logger.info(f"Ingest finished: {summary.succeeded} succeeded, {len(summary.failed)} failed.")
+    if summary.failed:
+        click.get_current_context().exit(1)
+
+
+@click.command()
+@click.option(
+    "--database",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    required=True,
+    help="SQLite results store filled by 'ingest'.",
+)
+@click.option("--driver", default=None, help="Show the result of the driver identifier in every stored session.")
+@click.option(
+    "--session",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Rank the drivers of one stored session instead of the whole store.",
+)
+@click.option("--top", type=click.IntRange(min=1), default=None, help="Show only the N fastest drivers.")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice([output_format.value for output_format in QUERY_FORMATS], case_sensitive=False),
+    default=OutputFormat.TABLE.value,
+    show_default=True,
+)
+def query(database: Path, driver: str | None, session: Path | None, top: int | None, output_format: str) -> None:
+    if driver is not None and (session is not None or top is not None):
+        raise click.UsageError("Option '--driver' cannot be used with '--session' or '--top'.")
+    from formula1_race_analysis.results_store import ResultsStore  # noqa: PLC0415
+
+    try:
+        with ResultsStore(database) as store:
+            results = store.leaderboard(top, session) if driver is None else store.driver_history(driver)
+    except Formula1RaceAnalysisError as error:
+        logger.error(f"Failed during opening the results store: {error}")
+        click.get_current_context().exit(1)
+
+    if not results:
+        logger.error("No stored results found. Please check the query and try again.")
+        click.get_current_context().exit(1)
+    for line in render_stored_results(results, OutputFormat(output_format.lower())):
+        click.echo(line)
+
+
+def render_stored_results(results: list["StoredResult"], output_format: OutputFormat) -> list[str]:
+    if output_format == OutputFormat.JSONL:
+        return [json.dumps(stored_result.as_record(), ensure_ascii=False) for stored_result in results]
+    name_width = max(len(stored_result.result.driver.name) for stored_result in results)
+    car_width = max(len(stored_result.result.driver.car_model) for stored_result in results)
+    return [
+        f"{stored_result.position:2d}. {stored_result.result.driver.name:<{name_width}} | "
+        f"{stored_result.result.driver.car_model:<{car_width}} | {stored_result.result.format_lap_time()} | "
+        f"{stored_result.session}"
+        for stored_result in results
+    ]
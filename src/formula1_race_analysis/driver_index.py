@@ -0,0 +1,58 @@
+from bisect import bisect_left
+from collections import defaultdict
+
+from formula1_race_analysis.config import ID_LENGTH
+from formula1_race_analysis.models import RaceResult
+
+
+def normalize_query(raw_request: str) -> str:
+    return " ".join(raw_request.split()).casefold()
+
+
+class DriverIndex:
+    """
+    Lookup tables over a report, built once and reused for any number of driver queries.
+    Drivers are indexed by identifier, by normalized full name and by every name suffix
+    ("pierre gasly", "gasly"), so a partial, case-insensitive name is resolved with a binary search.
+    """
+
+    def __init__(self, report: list[RaceResult]) -> None:
+        self._report = report
+        self._by_identifier: defaultdict[str, list[int]] = defaultdict(list)
+        self._by_name: defaultdict[str, list[int]] = defaultdict(list)
+        by_name_part: defaultdict[str, list[int]] = defaultdict(list)
+
+        for position, data in enumerate(report):
+            self._by_identifier[data.driver.identifier].append(position)
+            name_words = normalize_query(data.driver.name).split(" ")
+            self._by_name[" ".join(name_words)].append(position)
+            for start in range(len(name_words)):
+                by_name_part[" ".join(name_words[start:])].append(position)
+
+        self._name_parts = sorted(by_name_part)
+        self._by_name_part = dict(by_name_part)
+
+    def lookup(self, raw_request: str) -> list[RaceResult]:
+        """
+        Returns the results of the drivers matching the request in report order.
+        A 3-letter request is tried as an identifier first, then the request is matched against
+        the full names and finally used as a prefix of a name or a last name.
+        """
+        query = normalize_query(raw_request)
+        if not query:
+            return []
+        if len(query) == ID_LENGTH and query.isalpha() and query.upper() in self._by_identifier:
+            positions = self._by_identifier[query.upper()]
+        elif query in self._by_name:
+            positions = self._by_name[query]
+        else:
+            positions = sorted(self._lookup_prefix(query))
+        return [self._report[position] for position in positions]
+
+    def _lookup_prefix(self, query: str) -> set[int]:
+        positions: set[int] = set()
+        name_part_index = bisect_left(self._name_parts, query)
+        while name_part_index < len(self._name_parts) and self._name_parts[name_part_index].startswith(query):
+            positions.update(self._by_name_part[self._name_parts[name_part_index]])
+            name_part_index += 1
+        return positions
@@ -38,3 +38,15 @@ class DisplayReportError(Formula1RaceAnalysisError):
     """
     Raised when failed during displaying rase results.
     """
+
+
+class InvalidQueryError(Formula1RaceAnalysisError):
+    """
+    Raised when a query to the report server has invalid parameters.
+    """
+
+
+class NoDataFoundError(Formula1RaceAnalysisError):
+    """
+    Raised when a query to the report server matches no session or driver.
+    """
@@ -0,0 +1,228 @@
+import heapq
+import struct
+import tempfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import ExitStack
+from itertools import batched, chain, groupby
+from operator import itemgetter
+from pathlib import Path
+
+from formula1_race_analysis.config import DEFAULT_EXTERNAL_RUN_SIZE
+from formula1_race_analysis.exceptions import InvalidRaceTimeError
+from formula1_race_analysis.instrumentation import DISABLED_METRICS, Metrics
+from formula1_race_analysis.models import LapStatistics
+from formula1_race_analysis.q1_session_analyzer import (
+    count_unmatched_identifiers,
+    iter_log_entries,
+    pair_lap_timestamps,
+)
+from formula1_race_analysis.rejections import DISABLED_REJECTIONS, RejectionReport
+from formula1_race_analysis.timestamps import NANOSECONDS_PER_MICROSECOND, datetime_to_epoch_ns
+
+MERGE_FAN_IN = 64
+RUN_BUFFER_SIZE = 256 * 1024
+RUN_FILE_SUFFIX = ".run"
+# A run record is the epoch microsecond timestamp, the sequence number of the entry in its log and the byte
+# length of the identifier that follows it.
+RUN_RECORD = struct.Struct("<qQH")
+
+type TimestampRecord = tuple[str, int, int]
+type IdentifierRecords = tuple[str, Iterable[TimestampRecord]]
+
+
+def calculate_external_lap_statistics(  # noqa: PLR0913
+    start_log_file: Path,
+    end_log_file: Path,
+    ignore_errors: bool | None,
+    *,
+    multi_lap: bool = False,
+    run_size: int = DEFAULT_EXTERNAL_RUN_SIZE,
+    spill_dir: Path | None = None,
+    use_mmap: bool = False,
+    metrics: Metrics = DISABLED_METRICS,
+    rejections: RejectionReport = DISABLED_REJECTIONS,
+) -> dict[str, LapStatistics]:
+    """
+    Pairs the laps of both logs with a sort-merge join whose memory does not depend on the size of the logs.
+    Each log is spilled as runs of at most run_size (identifier, timestamp) records sorted by identifier to
+    a temporary directory inside spill_dir, the runs are merged back into one sorted stream per log and
+    the two streams are joined by identifier. The last start and end of a driver win as in parse_log_file,
+    or with multi_lap the n-th start is paired with the n-th end as in calculate_lap_statistics.
+    Only identifiers present in both logs get a lap, the others are counted in metrics.
+    Every record carries the sequence number of its entry, so InvalidRaceTimeError is raised for the first
+    driver in the order of the end log whose start time exceeds the end time, as without the external join.
+    """
+    if run_size < 1:
+        raise ValueError(f"The run size must be positive, got {run_size}.")
+    lap_statistics = {}
+    without_start = without_end = 0
+    first_error: tuple[int, InvalidRaceTimeError] | None = None
+    with tempfile.TemporaryDirectory(prefix="f1_join_", dir=spill_dir) as temporary_dir:
+        runs_dir = Path(temporary_dir)
+        log_streams = []
+        for log_file in (start_log_file, end_log_file):
+            entries = iter_log_entries(
+                log_file, ignore_errors, use_mmap=use_mmap, metrics=metrics, rejections=rejections
+            )
+            records = (
+                (
+                    entry["identifier"],
+                    datetime_to_epoch_ns(entry["timestamp"]) // NANOSECONDS_PER_MICROSECOND,
+                    sequence,
+                )
+                for sequence, entry in enumerate(entries)
+            )
+            runs = spill_sorted_runs(records, runs_dir, run_size)
+            metrics.increment("runs_spilled", len(runs))
+            log_streams.append(group_timestamps(merge_sorted_runs(runs, runs_dir), keep_all=multi_lap))
+
+        for identifier, starts, ends in merge_join(*log_streams):
+            if starts is None:
+                without_start += 1
+                continue
+            if ends is None:
+                without_end += 1
+                continue
+            end_timestamps = _SequencedTimestamps(ends)
+            try:
+                lap = pair_lap_timestamps(
+                    identifier, (timestamp for _, timestamp, _ in starts), end_timestamps, ignore_errors
+                )
+            except InvalidRaceTimeError as error:
+                if first_error is None or end_timestamps.sequence < first_error[0]:
+                    first_error = (end_timestamps.sequence, error)
+                continue
+            if lap is not None:
+                lap_statistics[identifier] = lap
+    if first_error is not None:
+        raise first_error[1]
+    count_unmatched_identifiers(metrics, without_start=without_start, without_end=without_end)
+    return lap_statistics
+
+
+def spill_sorted_runs(records: Iterable[TimestampRecord], runs_dir: Path, run_size: int) -> list[Path]:
+    """
+    Writes the records to run files of at most run_size records, each sorted by identifier.
+    The sort is stable, so the records of an identifier keep their file order within a run.
+    """
+    return [write_run(sorted(batch, key=itemgetter(0)), runs_dir) for batch in batched(records, run_size)]
+
+
+def merge_sorted_runs(runs: list[Path], runs_dir: Path, fan_in: int = MERGE_FAN_IN) -> Iterator[TimestampRecord]:
+    """
+    Lazily merges sorted runs into one stream sorted by identifier, opening at most fan_in runs at once.
+    Consecutive runs are merged in intermediate passes while there are more, and equal identifiers
+    are taken from the earlier run first, so the records of an identifier stay in file order.
+    """
+    while len(runs) > fan_in:
+        merged_runs = []
+        for run_group in batched(runs, fan_in):
+            merged_runs.append(write_run(_merge_runs(list(run_group)), runs_dir))
+            for run in run_group:
+                run.unlink()
+        runs = merged_runs
+    yield from _merge_runs(runs)
+
+
+def _merge_runs(runs: list[Path]) -> Iterator[TimestampRecord]:
+    with ExitStack() as stack:
+        streams = [stack.enter_context(_RunReader(run)) for run in runs]
+        yield from heapq.merge(*streams, key=itemgetter(0))
+
+
+def write_run(records: Iterable[TimestampRecord], runs_dir: Path) -> Path:
+    """
+    Writes the records to a new run file in runs_dir and returns its path.
+    """
+    with tempfile.NamedTemporaryFile(
+        "wb", buffering=RUN_BUFFER_SIZE, suffix=RUN_FILE_SUFFIX, dir=runs_dir, delete=False
+    ) as run_file:
+        for identifier, timestamp, sequence in records:
+            encoded_identifier = identifier.encode()
+            run_file.write(RUN_RECORD.pack(timestamp, sequence, len(encoded_identifier)))
+            run_file.write(encoded_identifier)
+    return Path(run_file.name)
+
+
+class _RunReader:
+    """
+    Iterates the records of a run file, which is closed when the reader exits its context.
+    """
+
+    def __init__(self, run: Path) -> None:
+        self._run_file = Path.open(run, "rb", buffering=RUN_BUFFER_SIZE)
+
+    def __enter__(self) -> "_RunReader":  # noqa: PYI034
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._run_file.close()
+
+    def __iter__(self) -> Iterator[TimestampRecord]:
+        while header := self._run_file.read(RUN_RECORD.size):
+            timestamp, sequence, identifier_length = RUN_RECORD.unpack(header)
+            yield self._run_file.read(identifier_length).decode(), timestamp, sequence
+
+
+class _SequencedTimestamps:
+    """
+    Iterates the timestamps of records and keeps the sequence number of the last record read.
+    """
+
+    def __init__(self, records: Iterable[TimestampRecord]) -> None:
+        self._records = records
+        self.sequence = -1
+
+    def __iter__(self) -> Iterator[int]:
+        for _, timestamp, sequence in self._records:
+            self.sequence = sequence
+            yield timestamp
+
+
+def group_timestamps(records: Iterable[TimestampRecord], *, keep_all: bool) -> Iterator[IdentifierRecords]:
+    """
+    Groups a stream sorted by identifier into the records of every identifier, in file order.
+    With keep_all the records of a group are streamed, so a group must be consumed before the next one.
+    Without keep_all only the last timestamp of an identifier is kept, in a record with the sequence
+    number of the first entry of the identifier, i.e. its position in the order of the log.
+    """
+    for identifier, group in groupby(records, key=itemgetter(0)):
+        if keep_all:
+            yield identifier, group
+        else:
+            yield identifier, [_last_timestamp_record(group)]
+
+
+def _last_timestamp_record(records: Iterator[TimestampRecord]) -> TimestampRecord:
+    identifier, first_timestamp, first_sequence = next(records)
+    last_records = deque(records, maxlen=1)
+    return identifier, last_records[0][1] if last_records else first_timestamp, first_sequence
+
+
+def merge_join(
+    start_groups: Iterator[IdentifierRecords], end_groups: Iterator[IdentifierRecords]
+) -> Iterator[tuple[str, Iterable[TimestampRecord] | None, Iterable[TimestampRecord] | None]]:
+    """
+    Full outer join of two streams grouped by identifier in the same order. Yields the identifier with
+    its start and end records, where the records of the log missing the identifier are None.
+    """
+    start_group = next(start_groups, None)
+    end_group = next(end_groups, None)
+    while start_group is not None and end_group is not None:
+        if start_group[0] < end_group[0]:
+            yield start_group[0], start_group[1], None
+            start_group = next(start_groups, None)
+        elif end_group[0] < start_group[0]:
+            yield end_group[0], None, end_group[1]
+            end_group = next(end_groups, None)
+        else:
+            yield start_group[0], start_group[1], end_group[1]
+            start_group = next(start_groups, None)
+            end_group = next(end_groups, None)
+    if start_group is not None:
+        for identifier, starts in chain([start_group], start_groups):
+            yield identifier, starts, None
+    if end_group is not None:
+        for identifier, ends in chain([end_group], end_groups):
+            yield identifier, None, ends
@@ -0,0 +1,171 @@
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import queue
+import threading
+from collections.abc import Buffer, Iterator
+from pathlib import Path
+from typing import BinaryIO, TextIO
+
+from formula1_race_analysis.exceptions import InvalidFormatDataError, MissedFileError
+
+COMPRESSION_SUFFIXES = (".gz", ".bz2", ".xz")
+DECOMPRESSED_BLOCK_SIZE = 1024 * 1024
+DECOMPRESSION_QUEUE_SIZE = 8
+DECOMPRESSION_POLL_INTERVAL = 0.1
+
+
+def resolve_session_file(base_dir: Path, file_name: str) -> Path:
+    """
+    Returns the path of a session file in base_dir, or of its compressed variant when only that one exists.
+    Falls back to the plain path, so that a missing file is reported under its plain name.
+    """
+    filepath = base_dir / file_name
+    if filepath.exists():
+        return filepath
+    for suffix in COMPRESSION_SUFFIXES:
+        compressed_filepath = base_dir / f"{file_name}{suffix}"
+        if compressed_filepath.exists():
+            return compressed_filepath
+    return filepath
+
+
+def is_compressed(filepath: Path) -> bool:
+    return filepath.suffix in COMPRESSION_SUFFIXES
+
+
+def read_file_content(filepath: Path) -> list[str]:
+    """
+    Reads the contents of a file and returns it as a list of lines.
+    Raises MissedFileError if the file is missing or cannot be opened.
+    """
+    return list(iter_file_lines(filepath))
+
+
+def iter_file_lines(filepath: Path, *, use_mmap: bool = False) -> Iterator[str]:
+    """
+    Opens a file and returns a lazy iterator over its lines, so only one line is held in memory at a time.
+    With use_mmap the file is memory-mapped and split on "\\n" instead of being read through a text buffer.
+    Files ending in .gz, .bz2 or .xz are decompressed on a background thread, which hands blocks of
+    decompressed bytes to the text buffer through a bounded queue; use_mmap does not apply to them.
+    Raises MissedFileError right away if the file is missing or cannot be opened.
+    """
+    try:
+        if is_compressed(filepath):
+            pipeline = _DecompressionPipeline(filepath, _open_compressed(filepath))
+            return _iter_text_lines(io.TextIOWrapper(io.BufferedReader(pipeline), encoding="utf-8"))
+        if use_mmap:
+            return _iter_mapped_lines(Path.open(filepath, "rb"))
+        return _iter_text_lines(Path.open(filepath, encoding="utf-8"))
+    except FileNotFoundError as error:
+        raise MissedFileError(f"Error! The file path: {filepath} is not found or cannot be opened.") from error
+
+
+def _iter_text_lines(text_file: TextIO) -> Iterator[str]:
+    with text_file:
+        yield from text_file
+
+
+def _iter_mapped_lines(binary_file: BinaryIO) -> Iterator[str]:
+    with binary_file:
+        if os.fstat(binary_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(binary_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            for raw_line in iter(mapped_file.readline, b""):
+                line = raw_line.decode("utf-8")
+                yield line[:-2] + "\n" if line.endswith("\r\n") else line
+
+
+def _open_compressed(filepath: Path) -> io.BufferedIOBase:
+    if filepath.suffix == ".gz":
+        return gzip.open(filepath, "rb")
+    if filepath.suffix == ".bz2":
+        return bz2.open(filepath, "rb")
+    return lzma.open(filepath, "rb")
+
+
+class _DecompressionPipeline(io.RawIOBase):
+    """
+    Raw stream of the decompressed content of a file. A background thread reads decompressed blocks
+    into a bounded queue, so decompression overlaps with the parsing of the previous blocks while
+    at most DECOMPRESSION_QUEUE_SIZE blocks are held in memory.
+    Closing the stream stops the thread, which then closes the compressed file.
+    Raises InvalidFormatDataError when the compressed data is corrupted or truncated.
+    """
+
+    def __init__(self, filepath: Path, compressed_file: io.BufferedIOBase) -> None:
+        super().__init__()
+        self.filepath = filepath
+        self._blocks: queue.Queue[bytes | Exception] = queue.Queue(maxsize=DECOMPRESSION_QUEUE_SIZE)
+        self._stopped = threading.Event()
+        self._pending = memoryview(b"")
+        self._exhausted = False
+        self._thread = threading.Thread(
+            target=self._decompress, args=(compressed_file,), name=f"decompress-{filepath.name}", daemon=True
+        )
+        self._thread.start()
+
+    def _decompress(self, compressed_file: io.BufferedIOBase) -> None:
+        with compressed_file:
+            try:
+                while block := compressed_file.read(DECOMPRESSED_BLOCK_SIZE):
+                    if not self._put(block):
+                        return
+            except Exception as error:  # noqa: BLE001
+                self._put(error)
+                return
+        self._put(b"")
+
+    def _put(self, item: bytes | Exception) -> bool:
+        """
+        Waits for room in the queue until the stream is closed, returns whether the item was queued.
+        """
+        while not self._stopped.is_set():
+            try:
+                self._blocks.put(item, timeout=DECOMPRESSION_POLL_INTERVAL)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Buffer) -> int:
+        if not self._pending:
+            if self._exhausted:
+                return 0
+            block = self._next_block()
+            if isinstance(block, Exception):
+                self._exhausted = True
+                raise InvalidFormatDataError(f"Error! The file: {self.filepath} cannot be decompressed: {block}") from (
+                    block
+                )
+            if not block:
+                self._exhausted = True
+                return 0
+            self._pending = memoryview(block)
+        target = memoryview(buffer).cast("B")
+        size = min(len(target), len(self._pending))
+        target[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def _next_block(self) -> bytes | Exception:
+        """
+        Waits for the next block while the thread is alive, so a thread that died without queueing
+        the end of the stream raises instead of blocking the reader forever.
+        """
+        while True:
+            try:
+                return self._blocks.get(timeout=DECOMPRESSION_POLL_INTERVAL)
+            except queue.Empty:
+                if not self._thread.is_alive() and self._blocks.empty():
+                    return RuntimeError("the decompression thread stopped unexpectedly")
+
+    def close(self) -> None:
+        self._stopped.set()
+        super().close()
@@ -0,0 +1,341 @@
+import hashlib
+import marshal
+import os
+import sys
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import islice
+from pathlib import Path
+
+from formula1_race_analysis import q1_session_analyzer
+from formula1_race_analysis.config import FilePaths, logger
+from formula1_race_analysis.exceptions import InvalidFormatDataError
+from formula1_race_analysis.file_reader import iter_file_lines, resolve_session_file
+from formula1_race_analysis.instrumentation import DISABLED_METRICS, Metrics
+from formula1_race_analysis.log_parser import classify_log_line
+from formula1_race_analysis.models import ONE_MICROSECOND, Driver, LapStatistics, RaceResult
+from formula1_race_analysis.rejections import DISABLED_REJECTIONS, RejectionReason, RejectionReport, reject_line
+from formula1_race_analysis.schemas import ID_SLICER
+from formula1_race_analysis.timestamps import (
+    NANOSECONDS_PER_MICROSECOND,
+    datetime_to_epoch_ns,
+    decode_fixed_width_epoch_ns,
+)
+
+CHUNK_LINES = 4096
+STATE_FILE_SUFFIX = ".q1state"
+STATE_FORMAT_VERSION = 1
+
+type RejectedLine = tuple[int, str, str]
+
+
+@dataclass(slots=True)
+class LogChunk:
+    """
+    Parsed lines of one chunk of a log file: the timestamps of every identifier in epoch
+    microseconds and in file order, and the rejected lines with their line numbers.
+    """
+
+    digest: str
+    timestamps: dict[str, list[int]]
+    rejected: list[RejectedLine]
+
+
+@dataclass(slots=True)
+class ReuseSummary:
+    """
+    Parts of the session reused by the last incremental build.
+    """
+
+    drivers_reused: bool = False
+    chunks_reused: int = 0
+    chunks_parsed: int = 0
+    laps_reused: int = 0
+    laps_recomputed: int = 0
+
+    def describe(self) -> str:
+        return (
+            f"driver list {'reused' if self.drivers_reused else 'parsed'}, "
+            f"{self.chunks_reused} of {self.chunks_reused + self.chunks_parsed} log chunks reused, "
+            f"{self.laps_reused} of {self.laps_reused + self.laps_recomputed} laps reused"
+        )
+
+
+class IncrementalSession:
+    """
+    Q1 report of one session directory that keeps its intermediate results between builds:
+    the driver list, the start and end timestamps split into chunks of CHUNK_LINES lines and the
+    laps of every identifier, each with the content digest it was computed from.
+    A build parses again only the files and chunks whose digest changed and recomputes only the
+    laps of the identifiers whose timestamps changed; `reuse` tells what the last build could reuse.
+    Inserting or removing log lines shifts the following chunks, which are then parsed again.
+    """
+
+    def __init__(self, base_dir: Path, ignore_errors: bool | None = None, *, multi_lap: bool = False) -> None:
+        self.base_dir = base_dir
+        self.ignore_errors = bool(ignore_errors)
+        self.multi_lap = multi_lap
+        self.abbreviations_digest: str | None = None
+        self.drivers: list[Driver] = []
+        self.drivers_rejected: list[RejectedLine] = []
+        self.start_chunks: list[LogChunk] = []
+        self.end_chunks: list[LogChunk] = []
+        self.laps: dict[str, LapStatistics] = {}
+        self.reuse = ReuseSummary()
+
+    def build(
+        self,
+        *,
+        use_mmap: bool = False,
+        metrics: Metrics = DISABLED_METRICS,
+        rejections: RejectionReport = DISABLED_REJECTIONS,
+    ) -> list[RaceResult]:
+        """
+        Returns the same report as build_q1_report and raises the same InvalidRaceTimeError.
+        The kept results are only replaced once the whole build succeeded, so a failed build leaves
+        them usable for the next one.
+        Rejected lines of reused parts are recorded again in rejections.
+        """
+        reuse = ReuseSummary()
+        abbreviations_file = resolve_session_file(self.base_dir, FilePaths.ABBREVIATIONS)
+        with metrics.stage("create_driver_list"):
+            abbreviations_digest, drivers, drivers_rejected = self._update_drivers(
+                abbreviations_file, use_mmap, metrics, rejections, reuse
+            )
+        if not drivers:
+            raise InvalidFormatDataError("Error! Failed during creating driver database.")
+
+        with metrics.stage("parse_log_file"):
+            start_chunks, changed_starts = self._update_chunks(
+                resolve_session_file(self.base_dir, FilePaths.START_LOG),
+                self.start_chunks,
+                use_mmap,
+                metrics,
+                rejections,
+                reuse,
+            )
+            end_chunks, changed_ends = self._update_chunks(
+                resolve_session_file(self.base_dir, FilePaths.END_LOG),
+                self.end_chunks,
+                use_mmap,
+                metrics,
+                rejections,
+                reuse,
+            )
+        with metrics.stage("calculate_lap_time"):
+            laps = self._update_laps(start_chunks, end_chunks, changed_starts | changed_ends, reuse)
+
+        self.abbreviations_digest, self.drivers, self.drivers_rejected = abbreviations_digest, drivers, drivers_rejected
+        self.start_chunks, self.end_chunks, self.laps = start_chunks, end_chunks, laps
+        self.reuse = reuse
+        metrics.increment("chunks_reused", reuse.chunks_reused)
+        metrics.increment("chunks_parsed", reuse.chunks_parsed)
+        metrics.increment("laps_recomputed", reuse.laps_recomputed)
+        return [
+            RaceResult(
+                driver=driver,
+                lap_time=laps[driver.identifier].best_lap,
+                lap_count=laps[driver.identifier].lap_count,
+                mean_lap_time=laps[driver.identifier].mean_lap if self.multi_lap else None,
+            )
+            for driver in drivers
+            if driver.identifier in laps
+        ]
+
+    def _update_drivers(
+        self, filepath: Path, use_mmap: bool, metrics: Metrics, rejections: RejectionReport, reuse: ReuseSummary
+    ) -> tuple[str, list[Driver], list[RejectedLine]]:
+        digest = _digest_lines(iter_file_lines(filepath, use_mmap=use_mmap))
+        if digest == self.abbreviations_digest:
+            reuse.drivers_reused = True
+            _record_rejections(rejections, filepath, self.drivers_rejected)
+            return digest, self.drivers, self.drivers_rejected
+        recorded = RejectionReport(limit=sys.maxsize)
+        try:
+            drivers = q1_session_analyzer.create_driver_list(
+                filepath, self.ignore_errors, use_mmap=use_mmap, metrics=metrics, rejections=recorded
+            )
+        finally:
+            drivers_rejected = [
+                (rejection.line_number, rejection.reason.value, rejection.excerpt) for rejection in recorded.rejections
+            ]
+            _record_rejections(rejections, filepath, drivers_rejected)
+        return digest, drivers, drivers_rejected
+
+    def _update_chunks(  # noqa: PLR0913, PLR0917
+        self,
+        filepath: Path,
+        chunks: list[LogChunk],
+        use_mmap: bool,
+        metrics: Metrics,
+        rejections: RejectionReport,
+        reuse: ReuseSummary,
+    ) -> tuple[list[LogChunk], set[str]]:
+        """
+        Returns the chunks of the log file and the identifiers whose timestamps changed.
+        """
+        updated_chunks: list[LogChunk] = []
+        changed_identifiers: set[str] = set()
+        lines = iter_file_lines(filepath, use_mmap=use_mmap)
+        first_line = 1
+        while chunk_lines := list(islice(lines, CHUNK_LINES)):
+            digest = _digest_lines(chunk_lines)
+            index = len(updated_chunks)
+            previous_chunk = chunks[index] if index < len(chunks) else None
+            if previous_chunk is not None and previous_chunk.digest == digest:
+                chunk = previous_chunk
+                reuse.chunks_reused += 1
+            else:
+                chunk = self._parse_chunk(filepath, chunk_lines, first_line, digest, metrics, rejections)
+                reuse.chunks_parsed += 1
+                changed_identifiers.update(_changed_identifiers(previous_chunk, chunk))
+            _record_rejections(rejections, filepath, chunk.rejected)
+            updated_chunks.append(chunk)
+            first_line += len(chunk_lines)
+        for removed_chunk in chunks[len(updated_chunks) :]:
+            changed_identifiers.update(removed_chunk.timestamps)
+        return updated_chunks, changed_identifiers
+
+    def _parse_chunk(  # noqa: PLR0913, PLR0917
+        self,
+        filepath: Path,
+        lines: list[str],
+        first_line: int,
+        digest: str,
+        metrics: Metrics,
+        rejections: RejectionReport,
+    ) -> LogChunk:
+        """
+        Parses the lines of a chunk like iter_log_entries. Rejected lines are kept in the chunk
+        and recorded by the caller, the first one is raised right away unless ignore_errors is set.
+        """
+        chunk = LogChunk(digest=digest, timestamps={}, rejected=[])
+        lines_parsed = 0
+        for line_number, line in enumerate(lines, first_line):
+            log_info = line.strip("\n")
+            timestamp = decode_fixed_width_epoch_ns(log_info)
+            if timestamp is None:
+                if line.isspace():
+                    continue
+                entry = classify_log_line(line)
+                if isinstance(entry, RejectionReason):
+                    if not self.ignore_errors:
+                        reject_line(rejections, filepath, line_number, entry, line, ignore_errors=False)
+                    chunk.rejected.append((line_number, entry.value, line))
+                    continue
+                identifier, timestamp = entry["identifier"], datetime_to_epoch_ns(entry["timestamp"])
+            else:
+                identifier = log_info[:ID_SLICER].upper()
+            chunk.timestamps.setdefault(identifier, []).append(timestamp // NANOSECONDS_PER_MICROSECOND)
+            lines_parsed += 1
+        metrics.increment("lines_read", len(lines))
+        metrics.increment("lines_parsed", lines_parsed)
+        metrics.increment("lines_rejected", len(chunk.rejected))
+        return chunk
+
+    def _update_laps(
+        self,
+        start_chunks: list[LogChunk],
+        end_chunks: list[LogChunk],
+        changed_identifiers: set[str],
+        reuse: ReuseSummary,
+    ) -> dict[str, LapStatistics]:
+        laps = {identifier: lap for identifier, lap in self.laps.items() if identifier not in changed_identifiers}
+        reuse.laps_reused = len(laps)
+        reuse.laps_recomputed = len(changed_identifiers)
+        # Laps are recomputed in end log order, so an invalid race time names the same driver as build_q1_report.
+        end_identifiers = dict.fromkeys(identifier for chunk in end_chunks for identifier in chunk.timestamps)
+        for identifier in end_identifiers:
+            if identifier not in changed_identifiers:
+                continue
+            starts = _identifier_timestamps(start_chunks, identifier)
+            ends = _identifier_timestamps(end_chunks, identifier)
+            if not self.multi_lap:
+                starts, ends = starts[-1:], ends[-1:]
+            lap = q1_session_analyzer.pair_lap_timestamps(identifier, starts, ends, self.ignore_errors)
+            if lap is not None:
+                laps[identifier] = lap
+        return laps
+
+    def save(self, state_file: Path) -> None:
+        """
+        Atomically writes the kept results to a file, failing to write it is only logged.
+        """
+        payload = (
+            STATE_FORMAT_VERSION,
+            sys.implementation.cache_tag,
+            (str(self.base_dir.resolve()), self.ignore_errors, self.multi_lap),
+            self.abbreviations_digest,
+            [(driver.identifier, driver.name, driver.car_model) for driver in self.drivers],
+            self.drivers_rejected,
+            [(chunk.digest, chunk.timestamps, chunk.rejected) for chunk in self.start_chunks],
+            [(chunk.digest, chunk.timestamps, chunk.rejected) for chunk in self.end_chunks],
+            {
+                identifier: (lap.best_lap // ONE_MICROSECOND, lap.total_time // ONE_MICROSECOND, lap.lap_count)
+                for identifier, lap in self.laps.items()
+            },
+        )
+        temporary_file = state_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            state_file.parent.mkdir(parents=True, exist_ok=True)
+            temporary_file.write_bytes(marshal.dumps(payload))
+            temporary_file.replace(state_file)
+        except OSError as error:
+            logger.warning(f"Failed to write incremental state '{state_file}': {error}")
+
+    @staticmethod
+    def load(
+        state_file: Path, base_dir: Path, ignore_errors: bool | None = None, *, multi_lap: bool = False
+    ) -> "IncrementalSession":
+        """
+        Returns the session saved in the state file, or an empty session when the file is missing,
+        unreadable or was saved for another directory or other options.
+        """
+        session = IncrementalSession(base_dir, ignore_errors, multi_lap=multi_lap)
+        try:
+            version, python_tag, options, *payload = marshal.loads(state_file.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return session
+        if (version, python_tag) != (STATE_FORMAT_VERSION, sys.implementation.cache_tag):
+            return session
+        if options != (str(base_dir.resolve()), session.ignore_errors, multi_lap):
+            return session
+        abbreviations_digest, drivers, drivers_rejected, start_chunks, end_chunks, laps = payload
+        session.abbreviations_digest = abbreviations_digest
+        session.drivers = [Driver(*driver) for driver in drivers]
+        session.drivers_rejected = drivers_rejected
+        session.start_chunks = [LogChunk(*chunk) for chunk in start_chunks]
+        session.end_chunks = [LogChunk(*chunk) for chunk in end_chunks]
+        session.laps = {
+            identifier: LapStatistics(
+                best_lap=timedelta(microseconds=best_lap),
+                total_time=timedelta(microseconds=total_time),
+                lap_count=count,
+            )
+            for identifier, (best_lap, total_time, count) in laps.items()
+        }
+        return session
+
+
+def _digest_lines(lines: Iterable[str]) -> str:
+    return hashlib.sha256("".join(lines).encode()).hexdigest()
+
+
+def _changed_identifiers(previous_chunk: LogChunk | None, chunk: LogChunk) -> set[str]:
+    if previous_chunk is None:
+        return set(chunk.timestamps)
+    return {
+        identifier
+        for identifier in previous_chunk.timestamps.keys() | chunk.timestamps.keys()
+        if previous_chunk.timestamps.get(identifier) != chunk.timestamps.get(identifier)
+    }
+
+
+def _identifier_timestamps(chunks: list[LogChunk], identifier: str) -> list[int]:
+    return [timestamp for chunk in chunks for timestamp in chunk.timestamps.get(identifier, ())]
+
+
+def _record_rejections(rejections: RejectionReport, filepath: Path, rejected: list[RejectedLine]) -> None:
+    for line_number, reason, line in rejected:
+        rejections.add(filepath, line_number, RejectionReason(reason), line)
@@ -0,0 +1,64 @@
+import json
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from formula1_race_analysis.config import logger
+
+METRICS_FORMAT_VERSION = 1
+
+
+class Metrics:
+    """
+    Stage timings and counters of one report run.
+    A disabled instance records nothing, so the pipeline calls it unconditionally; the per-line
+    counts are accumulated in local variables and added once per file.
+    """
+
+    def __init__(self, *, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.stage_seconds: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Times the enclosed block; the times of a stage entered several times are added up.
+        """
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + elapsed
+            logger.info("stage_finished", stage=name, seconds=round(elapsed, 6))
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "format_version": METRICS_FORMAT_VERSION,
+            "stages": {name: round(seconds, 6) for name, seconds in self.stage_seconds.items()},
+            "counters": dict(self.counters),
+        }
+
+    def emit(self) -> None:
+        """
+        Logs the collected stage timings and counters as one structured event.
+        """
+        if self.enabled:
+            metrics = self.as_dict()
+            logger.info("report_metrics", stages=metrics["stages"], counters=metrics["counters"])
+
+    def write_json(self, filepath: Path) -> None:
+        filepath.write_text(json.dumps(self.as_dict(), indent=2) + "\n", encoding="utf-8")
+
+
+DISABLED_METRICS = Metrics(enabled=False)
@@ -0,0 +1,160 @@
+from bisect import bisect_left, insort
+from collections.abc import Callable
+from datetime import timedelta
+from pathlib import Path
+from threading import Event
+
+from formula1_race_analysis.config import DEFAULT_POLL_INTERVAL, FilePaths
+from formula1_race_analysis.custom_types import TimeStampDict
+from formula1_race_analysis.exceptions import InvalidFormatDataError
+from formula1_race_analysis.log_parser import classify_log_line
+from formula1_race_analysis.models import Driver, RaceResult
+from formula1_race_analysis.q1_session_analyzer import LapPairing, create_driver_list
+from formula1_race_analysis.rejections import RejectionReason
+
+
+class LogTail:
+    """
+    Reads the complete lines appended to a log file since the previous read, with "\r\n" line endings
+    normalized to "\n" like read_file_content does. A trailing line without a newline is kept until the
+    rest of it is written.
+    """
+
+    def __init__(self, filepath: Path) -> None:
+        self.filepath = filepath
+        self.offset = 0
+        self._partial_line = b""
+
+    def read_new_lines(self) -> list[str]:
+        try:
+            with Path.open(self.filepath, "rb") as log_file:
+                if log_file.seek(0, 2) < self.offset:
+                    self.offset, self._partial_line = 0, b""
+                log_file.seek(self.offset)
+                data = log_file.read()
+        except FileNotFoundError:
+            return []
+        self.offset += len(data)
+        *raw_lines, self._partial_line = (self._partial_line + data).split(b"\n")
+        return [raw_line.removesuffix(b"\r").decode("utf-8") + "\n" for raw_line in raw_lines]
+
+
+class LiveLeaderboard:
+    """
+    Ranking of drivers by lap time, kept sorted with binary insertions instead of being rebuilt.
+    """
+
+    def __init__(self) -> None:
+        self._ranking: list[tuple[timedelta, str]] = []
+        self._lap_times: dict[str, timedelta] = {}
+
+    def update(self, identifier: str, lap_time: timedelta) -> bool:
+        """
+        Moves the driver to the position of the new lap time and returns whether the leaderboard changed,
+        i.e. whether the lap time of the driver is new, whatever its position.
+        """
+        previous_lap_time = self._lap_times.get(identifier)
+        if previous_lap_time == lap_time:
+            return False
+        if previous_lap_time is not None:
+            del self._ranking[bisect_left(self._ranking, (previous_lap_time, identifier))]
+        insort(self._ranking, (lap_time, identifier))
+        self._lap_times[identifier] = lap_time
+        return True
+
+    def ranking(self) -> list[tuple[timedelta, str]]:
+        return list(self._ranking)
+
+
+class LiveSession:
+    """
+    Incrementally updated results of a session whose log files are still being written.
+    """
+
+    def __init__(self, base_dir: Path, ignore_errors: bool | None = None, *, multi_lap: bool = False) -> None:
+        self.drivers: dict[str, Driver] = {
+            driver.identifier: driver
+            for driver in create_driver_list(base_dir / Path(FilePaths.ABBREVIATIONS), ignore_errors=ignore_errors)
+        }
+        if not self.drivers:
+            raise InvalidFormatDataError("Error! Failed during creating driver database.")
+        self.multi_lap = multi_lap
+        self.leaderboard = LiveLeaderboard()
+        self._start_tail = LogTail(base_dir / Path(FilePaths.START_LOG))
+        self._end_tail = LogTail(base_dir / Path(FilePaths.END_LOG))
+        self._lap_pairing = LapPairing(ignore_errors)
+        self._start_timestamps: dict[str, TimeStampDict] = {}
+        self._end_timestamps: dict[str, TimeStampDict] = {}
+
+    def poll(self) -> bool:
+        """
+        Parses the lines appended since the previous poll and returns whether the leaderboard changed.
+        """
+        leaderboard_changed = False
+        for is_start, tail in ((True, self._start_tail), (False, self._end_tail)):
+            for line in tail.read_new_lines():
+                entry = classify_log_line(line)
+                # Lines of a live feed are skipped when invalid, a finished session is validated by build_q1_report.
+                if isinstance(entry, RejectionReason):
+                    continue
+                if entry["identifier"] in self.drivers:
+                    leaderboard_changed |= self._add_timestamp(entry, is_start=is_start)
+        return leaderboard_changed
+
+    def report(self) -> list[RaceResult]:
+        """
+        Returns the current results in ascending order of lap time.
+        """
+        results = []
+        for lap_time, identifier in self.leaderboard.ranking():
+            if self.multi_lap:
+                lap_statistics = self._lap_pairing.lap_statistics[identifier]
+                results.append(
+                    RaceResult(
+                        driver=self.drivers[identifier],
+                        lap_time=lap_statistics.best_lap,
+                        lap_count=lap_statistics.lap_count,
+                        mean_lap_time=lap_statistics.mean_lap,
+                    )
+                )
+            else:
+                results.append(RaceResult(driver=self.drivers[identifier], lap_time=lap_time))
+        return results
+
+    def _add_timestamp(self, entry: TimeStampDict, *, is_start: bool) -> bool:
+        identifier = entry["identifier"]
+        if self.multi_lap:
+            lap_statistics = self._lap_pairing.add_timestamp(entry, is_start=is_start)
+            return lap_statistics is not None and self.leaderboard.update(identifier, lap_statistics.best_lap)
+
+        (self._start_timestamps if is_start else self._end_timestamps)[identifier] = entry
+        if identifier not in self._start_timestamps or identifier not in self._end_timestamps:
+            return False
+        lap_time = self._end_timestamps[identifier]["timestamp"] - self._start_timestamps[identifier]["timestamp"]
+        # A start newer than the last end means a lap is in progress, the previous lap time stays on the board.
+        if lap_time < timedelta(0):
+            return False
+        return self.leaderboard.update(identifier, lap_time)
+
+
+def follow_session(
+    session: LiveSession,
+    on_change: Callable[[list[RaceResult]], None],
+    *,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_polls: int | None = None,
+    stop_event: Event | None = None,
+) -> None:
+    """
+    Polls the session logs and calls on_change with the current results whenever a position or a lap time changes.
+    Runs until stop_event is set or max_polls polls were made.
+    """
+    if stop_event is None:
+        stop_event = Event()
+    polls = 0
+    while not stop_event.is_set() and (max_polls is None or polls < max_polls):
+        if session.poll():
+            on_change(session.report())
+        polls += 1
+        if max_polls is None or polls < max_polls:
+            stop_event.wait(poll_interval)
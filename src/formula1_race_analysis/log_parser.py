@@ -0,0 +1,32 @@
+from pydantic import ValidationError
+
+from formula1_race_analysis.custom_types import TimeStampDict
+from formula1_race_analysis.rejections import RejectionReason
+from formula1_race_analysis.schemas import ID_SLICER, LogEntry
+from formula1_race_analysis.timestamps import FIXED_WIDTH_TIMESTAMP, decode_fixed_width_timestamp
+
+TIMESTAMP_CHARACTERS = frozenset("0123456789-_:.")
+
+
+def classify_log_line(line: str) -> TimeStampDict | RejectionReason:
+    """
+    Parses a single "XXXYYYY-MM-DD_HH:MM:SS.mmm" line from the log file and returns the reason of a
+    rejection instead of raising. Lines matching the fixed-width layout are decoded with the date prefix
+    cache of timestamps; lines that are neither fixed-width nor caught by the cheap checks are left to
+    LogEntry, which only happens for unusual but possibly valid layouts.
+    """
+    log_info = line.strip("\n")
+    timestamp = decode_fixed_width_timestamp(log_info)
+    if timestamp is not None:
+        return {"identifier": log_info[:ID_SLICER].upper(), "timestamp": timestamp}
+    string_timestamp = log_info[ID_SLICER:]
+    if not string_timestamp:
+        return RejectionReason.MISSING_TIMESTAMP
+    # A fixed-width timestamp that could not be decoded holds an impossible date.
+    if FIXED_WIDTH_TIMESTAMP.fullmatch(string_timestamp) or not TIMESTAMP_CHARACTERS.issuperset(string_timestamp):
+        return RejectionReason.INVALID_TIMESTAMP
+    try:
+        entry = LogEntry.model_validate(line)
+    except ValidationError:
+        return RejectionReason.INVALID_TIMESTAMP
+    return {"identifier": entry.identifier, "timestamp": entry.timestamp}
@@ -1,46 +1,169 @@
+import sys
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import timedelta
+from typing import TYPE_CHECKING
 
-from formula1_race_analysis.schemas import AbbreviationEntry
+if TYPE_CHECKING:
+    from formula1_race_analysis.schemas import AbbreviationEntry
 
 
-@dataclass(order=True)
+MICROSECONDS_PER_MILLISECOND = 1000
+MICROSECONDS_PER_SECOND = 1_000_000
+SECONDS_PER_MINUTE = 60
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+@dataclass(order=True, frozen=True, slots=True)
 class Driver:
+    """
+    Immutable driver record. The strings are interned, so the drivers of many sessions share
+    one copy of every identifier, name and car model.
+    """
+
     identifier: str
     name: str
     car_model: str
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "identifier", sys.intern(self.identifier))
+        object.__setattr__(self, "name", sys.intern(self.name))
+        object.__setattr__(self, "car_model", sys.intern(self.car_model))
+
     @staticmethod
-    def from_pydantic_model(entry: AbbreviationEntry) -> "Driver":
+    def from_pydantic_model(entry: "AbbreviationEntry") -> "Driver":
         return Driver(identifier=entry.identifier, name=entry.name, car_model=entry.car_model)
 
 
-@dataclass
+@dataclass(slots=True)
+class LapStatistics:
+    best_lap: timedelta
+    total_time: timedelta
+    lap_count: int = 1
+
+    @staticmethod
+    def from_lap_time(lap_time: timedelta) -> "LapStatistics":
+        return LapStatistics(best_lap=lap_time, total_time=lap_time)
+
+    def add_lap(self, lap_time: timedelta) -> None:
+        """
+        Updates the running aggregates with one more completed lap.
+        """
+        self.best_lap = min(self.best_lap, lap_time)
+        self.total_time += lap_time
+        self.lap_count += 1
+
+    @property
+    def mean_lap(self) -> timedelta:
+        return self.total_time / self.lap_count
+
+
 class RaceResult:
-    driver: Driver
-    lap_time: timedelta
+    """
+    Result of one driver. Lap times are kept in slots as integer microseconds, the timedelta
+    attributes of the public interface are produced on access.
+    """
+
+    __slots__ = ("driver", "lap_count", "lap_time_us", "mean_lap_time_us")
+
+    def __init__(
+        self, driver: Driver, lap_time: timedelta, lap_count: int = 1, mean_lap_time: timedelta | None = None
+    ) -> None:
+        self.driver = driver
+        self.lap_time_us = lap_time // ONE_MICROSECOND
+        self.lap_count = lap_count
+        self.mean_lap_time_us = None if mean_lap_time is None else mean_lap_time // ONE_MICROSECOND
+
+    @classmethod
+    def from_microseconds(
+        cls, driver: Driver, lap_time_us: int, lap_count: int = 1, mean_lap_time_us: int | None = None
+    ) -> "RaceResult":
+        result = cls.__new__(cls)
+        result.driver = driver
+        result.lap_time_us = lap_time_us
+        result.lap_count = lap_count
+        result.mean_lap_time_us = mean_lap_time_us
+        return result
+
+    @property
+    def lap_time(self) -> timedelta:
+        return timedelta(microseconds=self.lap_time_us)
+
+    @lap_time.setter
+    def lap_time(self, lap_time: timedelta) -> None:
+        self.lap_time_us = lap_time // ONE_MICROSECOND
+
+    @property
+    def mean_lap_time(self) -> timedelta | None:
+        return None if self.mean_lap_time_us is None else timedelta(microseconds=self.mean_lap_time_us)
+
+    @mean_lap_time.setter
+    def mean_lap_time(self, mean_lap_time: timedelta | None) -> None:
+        self.mean_lap_time_us = None if mean_lap_time is None else mean_lap_time // ONE_MICROSECOND
+
+    @property
+    def best_lap(self) -> timedelta:
+        return self.lap_time
 
     def format_lap_time(self) -> str:
         """
-        Formats a timedelta object representing lap time into "MM:SS.mmm" format.
+        Formats the lap time into "MM:SS.mmm" format.
         """
-        total_seconds = self.lap_time.total_seconds()
-        minutes, seconds = divmod(int(total_seconds), 60)
-        microseconds = self.lap_time.microseconds // 1000
-        return f"{minutes}:{seconds:02}.{microseconds:03}"
+        total_seconds, microseconds = divmod(self.lap_time_us, MICROSECONDS_PER_SECOND)
+        minutes, seconds = divmod(total_seconds, SECONDS_PER_MINUTE)
+        return f"{minutes}:{seconds:02}.{microseconds // MICROSECONDS_PER_MILLISECOND:03}"
 
     @property
     def formatted_lap_time(self) -> str:
         return self.format_lap_time()
 
+    def as_record(self, position: int) -> dict[str, str | int]:
+        """
+        Returns the result as a flat JSON-serializable record.
+        """
+        return {
+            "position": position,
+            "identifier": self.driver.identifier,
+            "name": self.driver.name,
+            "car_model": self.driver.car_model,
+            "lap_time": self.format_lap_time(),
+            "lap_count": self.lap_count,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RaceResult):
+            return NotImplemented
+        return (self.driver, self.lap_time_us, self.lap_count, self.mean_lap_time_us) == (
+            other.driver,
+            other.lap_time_us,
+            other.lap_count,
+            other.mean_lap_time_us,
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __copy__(self) -> "RaceResult":
+        return RaceResult.from_microseconds(self.driver, self.lap_time_us, self.lap_count, self.mean_lap_time_us)
 
-@dataclass
+    def __repr__(self) -> str:
+        return (
+            f"RaceResult(driver={self.driver!r}, lap_time={self.lap_time!r}, "
+            f"lap_count={self.lap_count!r}, mean_lap_time={self.mean_lap_time!r})"
+        )
+
+
+@dataclass(slots=True)
 class TableSize:
     name_column_width: int
     car_column_width: int
 
     @staticmethod
-    def calculate_column_width(report: list[RaceResult]) -> "TableSize":
-        name_width = max(len(data.driver.name) for data in report)
-        car_width = max(len(data.driver.car_model) for data in report)
+    def calculate_column_width(report: Iterable[RaceResult]) -> "TableSize":
+        """
+        Measures both columns in a single pass over the report.
+        """
+        name_width = car_width = 0
+        for data in report:
+            name_width = max(name_width, len(data.driver.name))
+            car_width = max(car_width, len(data.driver.car_model))
         return TableSize(name_column_width=name_width, car_column_width=car_width)
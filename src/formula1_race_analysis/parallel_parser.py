@@ -0,0 +1,189 @@
+from dataclasses import dataclass
+from multiprocessing import Pool
+from pathlib import Path
+
+from formula1_race_analysis.config import DEFAULT_PARSE_CHUNK_SIZE
+from formula1_race_analysis.exceptions import MissedFileError
+from formula1_race_analysis.file_reader import is_compressed
+from formula1_race_analysis.instrumentation import DISABLED_METRICS, Metrics
+from formula1_race_analysis.log_parser import classify_log_line
+from formula1_race_analysis.models import LapStatistics
+from formula1_race_analysis.profiling import profile_worker
+from formula1_race_analysis.q1_session_analyzer import pair_lap_timestamps
+from formula1_race_analysis.rejections import DISABLED_REJECTIONS, RejectionReason, RejectionReport, reject_line
+from formula1_race_analysis.schemas import ID_SLICER
+from formula1_race_analysis.timestamps import (
+    NANOSECONDS_PER_MICROSECOND,
+    datetime_to_epoch_ns,
+    decode_fixed_width_epoch_ns,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ByteRange:
+    filepath: Path
+    start: int
+    end: int
+
+
+@dataclass(slots=True)
+class ByteRangeTimestamps:
+    """
+    Timestamps parsed from one byte range, in epoch microseconds and in file order per identifier.
+    Rejected lines are numbered from the start of the range.
+    """
+
+    line_count: int
+    lines_parsed: int
+    timestamps: dict[str, list[int]]
+    rejected: list[tuple[int, RejectionReason, str]]
+
+
+def split_byte_ranges(filepath: Path, chunk_size: int = DEFAULT_PARSE_CHUNK_SIZE) -> list[ByteRange]:
+    """
+    Splits a file into ranges of about chunk_size bytes, each ending right after a newline or at the end of the file.
+    Raises MissedFileError if the file is missing or cannot be opened.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"The chunk size must be positive, got {chunk_size}.")
+    if is_compressed(filepath):
+        raise ValueError(f"The compressed file: {filepath} cannot be split into byte ranges.")
+    try:
+        binary_file = Path.open(filepath, "rb")
+    except FileNotFoundError as error:
+        raise MissedFileError(f"Error! The file path: {filepath} is not found or cannot be opened.") from error
+    byte_ranges = []
+    with binary_file:
+        file_size = binary_file.seek(0, 2)
+        start = 0
+        while start < file_size:
+            binary_file.seek(min(start + chunk_size, file_size) - 1)
+            binary_file.readline()
+            end = binary_file.tell()
+            byte_ranges.append(ByteRange(filepath, start, end))
+            start = end
+    return byte_ranges
+
+
+def parse_byte_range(byte_range: ByteRange, *, keep_all: bool) -> ByteRangeTimestamps:
+    """
+    Parses the log lines of a byte range like iter_log_entries. With keep_all every timestamp of
+    an identifier is kept, otherwise only the last one.
+    Runs in the worker processes, so rejected lines are returned instead of being recorded.
+    """
+    with Path.open(byte_range.filepath, "rb") as binary_file:
+        binary_file.seek(byte_range.start)
+        text = binary_file.read(byte_range.end - byte_range.start).decode("utf-8")
+    lines = text.replace("\r\n", "\n").split("\n")
+    if not lines[-1]:
+        lines.pop()
+    timestamps: dict[str, list[int]] = {}
+    rejected = []
+    lines_parsed = 0
+    for line_index, line in enumerate(lines):
+        timestamp = decode_fixed_width_epoch_ns(line)
+        if timestamp is None:
+            if not line or line.isspace():
+                continue
+            entry = classify_log_line(line)
+            if isinstance(entry, RejectionReason):
+                rejected.append((line_index, entry, line))
+                continue
+            identifier, timestamp = entry["identifier"], datetime_to_epoch_ns(entry["timestamp"])
+        else:
+            identifier = line[:ID_SLICER].upper()
+        if keep_all and identifier in timestamps:
+            timestamps[identifier].append(timestamp // NANOSECONDS_PER_MICROSECOND)
+        else:
+            timestamps[identifier] = [timestamp // NANOSECONDS_PER_MICROSECOND]
+        lines_parsed += 1
+    return ByteRangeTimestamps(len(lines), lines_parsed, timestamps, rejected)
+
+
+def _parse_byte_range_task(task: tuple[ByteRange, bool]) -> ByteRangeTimestamps:
+    byte_range, keep_all = task
+    with profile_worker():
+        return parse_byte_range(byte_range, keep_all=keep_all)
+
+
+def calculate_parallel_lap_statistics(  # noqa: PLR0913
+    start_log_file: Path,
+    end_log_file: Path,
+    ignore_errors: bool | None,
+    *,
+    multi_lap: bool = False,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_PARSE_CHUNK_SIZE,
+    metrics: Metrics = DISABLED_METRICS,
+    rejections: RejectionReport = DISABLED_REJECTIONS,
+) -> dict[str, LapStatistics]:
+    """
+    Parses both logs as newline-aligned byte ranges over a pool of worker processes and pairs the laps.
+    The ranges are merged in file order, so the last start and end of a driver win as in
+    parse_log_file, or with multi_lap the n-th start is paired with the n-th end as in calculate_lap_statistics.
+    Rejected lines are recorded in file order and the first one is raised unless ignore_errors is set.
+    With a single worker the ranges are parsed in the current process.
+    """
+    start_ranges = split_byte_ranges(start_log_file, chunk_size)
+    end_ranges = split_byte_ranges(end_log_file, chunk_size)
+    tasks = [(byte_range, multi_lap) for byte_range in start_ranges + end_ranges]
+    if workers <= 1:
+        results = list(map(_parse_byte_range_task, tasks))
+    else:
+        with Pool(processes=min(workers, max(len(tasks), 1))) as pool:
+            results = pool.map(_parse_byte_range_task, tasks)
+
+    starts = _merge_byte_ranges(
+        start_log_file,
+        results[: len(start_ranges)],
+        ignore_errors,
+        keep_all=multi_lap,
+        metrics=metrics,
+        rejections=rejections,
+    )
+    ends = _merge_byte_ranges(
+        end_log_file,
+        results[len(start_ranges) :],
+        ignore_errors,
+        keep_all=multi_lap,
+        metrics=metrics,
+        rejections=rejections,
+    )
+    lap_statistics = {}
+    for identifier, end_timestamps in ends.items():
+        if identifier not in starts:
+            continue
+        lap = pair_lap_timestamps(identifier, starts[identifier], end_timestamps, ignore_errors)
+        if lap is not None:
+            lap_statistics[identifier] = lap
+    return lap_statistics
+
+
+def _merge_byte_ranges(  # noqa: PLR0913
+    filepath: Path,
+    results: list[ByteRangeTimestamps],
+    ignore_errors: bool | None,
+    *,
+    keep_all: bool,
+    metrics: Metrics,
+    rejections: RejectionReport,
+) -> dict[str, list[int]]:
+    """
+    Merges the timestamps of consecutive byte ranges of one file in file order. Without keep_all
+    the last timestamp of an identifier replaces the ones of the previous ranges.
+    """
+    timestamps: dict[str, list[int]] = {}
+    first_line = 1
+    for result in results:
+        for line_index, reason, line in result.rejected:
+            reject_line(rejections, filepath, first_line + line_index, reason, line, ignore_errors=ignore_errors)
+        for identifier, range_timestamps in result.timestamps.items():
+            if keep_all and identifier in timestamps:
+                timestamps[identifier].extend(range_timestamps)
+            else:
+                timestamps[identifier] = range_timestamps
+        metrics.increment("lines_read", result.line_count)
+        metrics.increment("lines_parsed", result.lines_parsed)
+        metrics.increment("lines_rejected", len(result.rejected))
+        first_line += result.line_count
+    return timestamps
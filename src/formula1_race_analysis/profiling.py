@@ -0,0 +1,205 @@
+import cProfile
+import itertools
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import threading
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import ClassVar
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+PACKAGE_PREFIX = f"{PACKAGE_DIR}{os.sep}"
+DEFAULT_TOP_FUNCTIONS = 15
+DEFAULT_SAMPLE_INTERVAL = 0.005
+MEMORY_TOP_LINES = 25
+STATS_SUFFIX = ".prof"
+COLLAPSED_SUFFIX = ".collapsed"
+MEMORY_SUFFIX = ".memory.txt"
+# Set by PipelineProfiler to "<profiled process id><os.pathsep><directory>" for the worker processes it starts.
+PROFILE_WORKERS_ENV = "F1_PROFILE_WORKERS"
+_worker_task_ids = itertools.count()
+
+
+class StackSampler:
+    """
+    Samples the call stack of one thread from a background thread and counts identical stacks.
+    The counts are written in the collapsed-stack format read by flamegraph tools.
+    """
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._frame_names: dict[CodeType, str] = {}
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread.join()
+
+    def write_collapsed(self, filepath: Path) -> None:
+        with Path.open(filepath, "w", encoding="utf-8") as collapsed_file:
+            for stack, count in self.stacks.most_common():
+                collapsed_file.write(f"{stack} {count}\n")
+
+    def _sample(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            if frame is not None:
+                self.stacks[self.collapse_stack(frame)] += 1
+
+    def collapse_stack(self, frame: FrameType | None) -> str:
+        """
+        Returns the stack ending at the frame as "outermost;...;innermost" module-qualified names.
+        """
+        names = []
+        while frame is not None:
+            name = self._frame_names.get(frame.f_code)
+            if name is None:
+                module_name = frame.f_globals.get("__name__", "?")
+                name = f"{module_name}.{frame.f_code.co_qualname}".replace(";", ":").replace(" ", "_")
+                self._frame_names[frame.f_code] = name
+            names.append(name)
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+
+def package_hot_functions(profile: cProfile.Profile | pstats.Stats, top: int = DEFAULT_TOP_FUNCTIONS) -> list[str]:
+    """
+    Returns the functions of the package that spent the most time in their own code, one line each.
+    The profiler itself is left out, cProfile also records the sampler thread.
+    """
+    stats = profile if isinstance(profile, pstats.Stats) else pstats.Stats(profile)
+    raw_stats = stats.stats  # type: ignore[attr-defined]
+    package_stats = [
+        (function, stats)
+        for function, stats in raw_stats.items()
+        if function[0].startswith(PACKAGE_PREFIX) and function[0] != __file__
+    ]
+    package_stats.sort(key=lambda item: item[1][2], reverse=True)
+
+    lines = [f"{'own time':>10} {'total time':>10} {'calls':>9}  function"]
+    for (filename, line_number, function_name), (_, calls, own_time, total_time, _) in package_stats[:top]:
+        module_name = ".".join(Path(filename).relative_to(PACKAGE_DIR.parent).with_suffix("").parts)
+        lines.append(f"{own_time:>9.4f}s {total_time:>9.4f}s {calls:>9}  {module_name}:{line_number}({function_name})")
+    return lines
+
+
+def write_memory_report(snapshot: tracemalloc.Snapshot, peak: int, filepath: Path) -> None:
+    with Path.open(filepath, "w", encoding="utf-8") as memory_file:
+        memory_file.write(f"Peak traced memory: {peak} B\n")
+        for statistic in snapshot.statistics("lineno")[:MEMORY_TOP_LINES]:
+            memory_file.write(f"{statistic}\n")
+
+
+@contextmanager
+def profile_worker() -> Iterator[None]:
+    """
+    Profiles the enclosed task when it runs in a worker process started by a profiled run. The stats
+    of every task are dumped for PipelineProfiler, which merges them into the profile of the run.
+    """
+    setting = os.environ.get(PROFILE_WORKERS_ENV)
+    if setting is None:
+        yield
+        return
+    profiled_pid, _, profile_dir = setting.partition(os.pathsep)
+    # Tasks run in the profiled process itself are already recorded by its profiler.
+    if int(profiled_pid) == os.getpid():
+        yield
+        return
+    # Forked worker processes inherit the profiler of the profiled process still enabled.
+    if PipelineProfiler.active_profiler is not None:
+        PipelineProfiler.active_profiler.disable()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(Path(profile_dir) / f"worker-{os.getpid()}-{next(_worker_task_ids)}{STATS_SUFFIX}")
+
+
+class PipelineProfiler:
+    """
+    Runs the enclosed block under cProfile and a stack sampler, optionally with tracemalloc.
+    Tasks run in worker processes under profile_worker are profiled there and merged into the stats.
+    On exit, also when the block fails, it writes the pstats file, the collapsed stacks of the main
+    process and the memory report next to output_prefix and fills summary with the hot functions
+    of the package.
+    """
+
+    active_profiler: ClassVar[cProfile.Profile | None] = None
+
+    def __init__(self, output_prefix: Path, *, trace_memory: bool = False, top: int = DEFAULT_TOP_FUNCTIONS) -> None:
+        self.output_prefix = output_prefix
+        self.trace_memory = trace_memory
+        self.top = top
+        self.summary: list[str] = []
+        self._profiler = cProfile.Profile()
+        self._sampler = StackSampler(threading.get_ident())
+        self._worker_dir: Path | None = None
+        self._previous_workers_setting: str | None = None
+
+    def __enter__(self) -> "PipelineProfiler":  # noqa: PYI034
+        self._worker_dir = Path(tempfile.mkdtemp(prefix="f1-profile-"))
+        self._previous_workers_setting = os.environ.get(PROFILE_WORKERS_ENV)
+        os.environ[PROFILE_WORKERS_ENV] = f"{os.getpid()}{os.pathsep}{self._worker_dir}"
+        if self.trace_memory:
+            tracemalloc.start()
+        self._sampler.start()
+        PipelineProfiler.active_profiler = self._profiler
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._profiler.disable()
+        PipelineProfiler.active_profiler = None
+        self._sampler.stop()
+        self._restore_workers_setting()
+        self.output_prefix.parent.mkdir(parents=True, exist_ok=True)
+        stats_file = self._output_file(STATS_SUFFIX)
+        collapsed_file = self._output_file(COLLAPSED_SUFFIX)
+        stats, worker_profiles = self._merge_worker_profiles()
+        stats.dump_stats(stats_file)
+        self._sampler.write_collapsed(collapsed_file)
+        self.summary = package_hot_functions(stats, self.top)
+        if worker_profiles:
+            self.summary.append(f"Merged the profiles of {worker_profiles} tasks run in worker processes.")
+        self.summary.append(f"Profile written to '{stats_file}', collapsed stacks to '{collapsed_file}'.")
+        if self.trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            memory_file = self._output_file(MEMORY_SUFFIX)
+            write_memory_report(snapshot, peak, memory_file)
+            self.summary.append(f"Peak traced memory: {peak} B, allocations written to '{memory_file}'.")
+
+    def _restore_workers_setting(self) -> None:
+        if self._previous_workers_setting is None:
+            os.environ.pop(PROFILE_WORKERS_ENV, None)
+        else:
+            os.environ[PROFILE_WORKERS_ENV] = self._previous_workers_setting
+
+    def _merge_worker_profiles(self) -> tuple[pstats.Stats, int]:
+        stats = pstats.Stats(self._profiler)
+        if self._worker_dir is None:
+            return stats, 0
+        worker_files = sorted(self._worker_dir.glob(f"*{STATS_SUFFIX}"))
+        for worker_file in worker_files:
+            stats.add(str(worker_file))
+        shutil.rmtree(self._worker_dir, ignore_errors=True)
+        return stats, len(worker_files)
+
+    def _output_file(self, suffix: str) -> Path:
+        return self.output_prefix.with_name(self.output_prefix.name + suffix)
@@ -1,43 +1,173 @@
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import timedelta
+from itertools import zip_longest
 from pathlib import Path
 
-from pydantic import ValidationError
-
-from formula1_race_analysis.config import FilePaths
+from formula1_race_analysis.columnar import calculate_columnar_lap_times
+from formula1_race_analysis.config import (
+    DEFAULT_EXTERNAL_RUN_SIZE,
+    DEFAULT_PARSE_CHUNK_SIZE,
+    FilePaths,
+    LapTimeBackend,
+    logger,
+)
 from formula1_race_analysis.custom_types import LapTimeDict, TimeStampDict
 from formula1_race_analysis.exceptions import (
     InvalidFormatDataError,
     InvalidRaceTimeError,
-    MissedFileError,
 )
-from formula1_race_analysis.models import Driver, RaceResult
-from formula1_race_analysis.schemas import AbbreviationEntry, LogEntry
+from formula1_race_analysis.file_reader import iter_file_lines, resolve_session_file
+from formula1_race_analysis.instrumentation import DISABLED_METRICS, Metrics
+from formula1_race_analysis.log_parser import classify_log_line
+from formula1_race_analysis.models import Driver, LapStatistics, RaceResult
+from formula1_race_analysis.rejections import DISABLED_REJECTIONS, RejectionReason, RejectionReport, reject_line
+from formula1_race_analysis.schemas import AbbreviationEntry
 
-IGNORE_ERRORS = False
+NANOSECONDS_PER_MICROSECOND = 1000
 
 
-def build_q1_report(base_dir: Path, ignore_errors: bool | None = None) -> list[RaceResult]:
+def build_q1_report(  # noqa: PLR0913
+    base_dir: Path,
+    ignore_errors: bool | None = None,
+    *,
+    use_mmap: bool = False,
+    multi_lap: bool = False,
+    backend: LapTimeBackend = LapTimeBackend.PYTHON,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_PARSE_CHUNK_SIZE,
+    external_join: bool = False,
+    run_size: int = DEFAULT_EXTERNAL_RUN_SIZE,
+    metrics: Metrics = DISABLED_METRICS,
+    rejections: RejectionReport = DISABLED_REJECTIONS,
+) -> list[RaceResult]:
     """
     Calculates the results of the first Formula One qualifying session based on driver data.
     Reads input files containing driver abbreviations, start timestamps, and end timestamps.
+    Each file may also be stored compressed with a .gz, .bz2 or .xz suffix and is then decompressed
+    while it is parsed.
     Processes the data, calculates the lap time for each driver, and returns a list of drivers
     with their corresponding lap times.
+    Files are streamed line by line (memory-mapped with use_mmap), so memory depends on the number
+    of drivers rather than on the size of the files.
+    With multi_lap every start is paired with the matching end of the same driver and the
+    result holds the best lap, the lap count and the mean lap time of each driver.
+    The columnar backend computes single-lap results over typed arrays and returns the same report.
+    With more than one worker both logs are split into newline-aligned byte ranges of about
+    chunk_size bytes, parsed over a pool of worker processes and merged into the same report.
+    With external_join both logs are spilled to sorted runs of at most run_size records in temporary
+    files and joined by merging the runs, so logs larger than the memory can be processed.
+    A session converted into the binary format is memory-mapped and used instead of the text files,
+    without any parsing or validation, whatever the backend and parsing options, unless one of the
+    text files was changed since the conversion, or the conversion dropped invalid lines that this
+    build has to raise or record in rejections.
+    Stage timings and line and driver counters are recorded in metrics when it is enabled, the file,
+    line number and reason of every rejected line in rejections.
     Raises InvalidFormatDataError if the driver database could not be created due to invalid
     file format.
     """
-    if ignore_errors is None:
-        ignore_errors = IGNORE_ERRORS
+    ignore_errors = bool(ignore_errors)
+    _check_report_options(backend, multi_lap=multi_lap, workers=workers, external_join=external_join)
+
+    binary_report = _binary_session_report(
+        base_dir, ignore_errors, multi_lap=multi_lap, metrics=metrics, rejections=rejections
+    )
+    if binary_report is not None:
+        if backend != LapTimeBackend.PYTHON or workers > 1 or external_join:
+            logger.info(f"Using the binary session of '{base_dir}', the backend and parsing options do not apply.")
+        return binary_report
 
-    abbreviations_file = base_dir / Path(FilePaths.ABBREVIATIONS)
-    start_log_file = base_dir / Path(FilePaths.START_LOG)
-    end_log_file = base_dir / Path(FilePaths.END_LOG)
+    abbreviations_file = resolve_session_file(base_dir, FilePaths.ABBREVIATIONS)
+    start_log_file = resolve_session_file(base_dir, FilePaths.START_LOG)
+    end_log_file = resolve_session_file(base_dir, FilePaths.END_LOG)
 
-    drivers = create_driver_list(abbreviations_file, ignore_errors=ignore_errors)
+    with metrics.stage("create_driver_list"):
+        drivers = create_driver_list(
+            abbreviations_file, ignore_errors=ignore_errors, use_mmap=use_mmap, metrics=metrics, rejections=rejections
+        )
     if not drivers:
         raise InvalidFormatDataError("Error! Failed during creating driver database.")
 
-    start_timestamps = parse_log_file(start_log_file, ignore_errors=ignore_errors)
-    end_timestamps = parse_log_file(end_log_file, ignore_errors=ignore_errors)
-    lap_times = calculate_lap_time(start_timestamps, end_timestamps, ignore_errors=ignore_errors)
+    if backend == LapTimeBackend.COLUMNAR:
+        lap_times_ns = calculate_columnar_lap_times(
+            start_log_file,
+            end_log_file,
+            ignore_errors=ignore_errors,
+            use_mmap=use_mmap,
+            metrics=metrics,
+            rejections=rejections,
+        )
+        _count_matched_drivers(metrics, drivers, lap_times_ns)
+        return [
+            RaceResult.from_microseconds(driver, lap_times_ns[driver.identifier] // NANOSECONDS_PER_MICROSECOND)
+            for driver in drivers
+            if driver.identifier in lap_times_ns
+        ]
+
+    if external_join:
+        # The external join builds on this module, so it is imported on use.
+        from formula1_race_analysis.external_join import calculate_external_lap_statistics  # noqa: PLC0415
+
+        with metrics.stage("calculate_external_lap_statistics"):
+            lap_statistics = calculate_external_lap_statistics(
+                start_log_file,
+                end_log_file,
+                ignore_errors=ignore_errors,
+                multi_lap=multi_lap,
+                run_size=run_size,
+                use_mmap=use_mmap,
+                metrics=metrics,
+                rejections=rejections,
+            )
+        _count_matched_drivers(metrics, drivers, lap_statistics)
+        return _lap_statistics_report(drivers, lap_statistics, multi_lap=multi_lap)
+
+    if workers > 1:
+        # The parallel parser builds on this module and loads multiprocessing, so it is imported on use.
+        from formula1_race_analysis.parallel_parser import calculate_parallel_lap_statistics  # noqa: PLC0415
+
+        with metrics.stage("calculate_parallel_lap_statistics"):
+            lap_statistics = calculate_parallel_lap_statistics(
+                start_log_file,
+                end_log_file,
+                ignore_errors=ignore_errors,
+                multi_lap=multi_lap,
+                workers=workers,
+                chunk_size=chunk_size,
+                metrics=metrics,
+                rejections=rejections,
+            )
+        _count_matched_drivers(metrics, drivers, lap_statistics)
+        return _lap_statistics_report(drivers, lap_statistics, multi_lap=multi_lap)
+
+    if multi_lap:
+        with metrics.stage("calculate_lap_statistics"):
+            lap_statistics = calculate_lap_statistics(
+                start_log_file,
+                end_log_file,
+                ignore_errors=ignore_errors,
+                use_mmap=use_mmap,
+                metrics=metrics,
+                rejections=rejections,
+            )
+        _count_matched_drivers(metrics, drivers, lap_statistics)
+        return _lap_statistics_report(drivers, lap_statistics, multi_lap=multi_lap)
+
+    with metrics.stage("parse_log_file"):
+        start_timestamps = parse_log_file(
+            start_log_file, ignore_errors=ignore_errors, use_mmap=use_mmap, metrics=metrics, rejections=rejections
+        )
+        end_timestamps = parse_log_file(
+            end_log_file, ignore_errors=ignore_errors, use_mmap=use_mmap, metrics=metrics, rejections=rejections
+        )
+    with metrics.stage("calculate_lap_time"):
+        lap_times = calculate_lap_time(start_timestamps, end_timestamps, ignore_errors=ignore_errors)
+    count_unmatched_identifiers(
+        metrics,
+        without_start=len(end_timestamps.keys() - start_timestamps.keys()),
+        without_end=len(start_timestamps.keys() - end_timestamps.keys()),
+    )
+    _count_matched_drivers(metrics, drivers, lap_times)
 
     return [
         RaceResult(driver=driver, lap_time=lap_times[driver.identifier]["lap_time"])
@@ -46,48 +176,270 @@ def build_q1_report(base_dir: Path, ignore_errors: bool | None = None) -> list[R
     ]
 
 
-def read_file_content(filepath: Path) -> list[str]:
+def _binary_session_report(
+    base_dir: Path, ignore_errors: bool | None, *, multi_lap: bool, metrics: Metrics, rejections: RejectionReport
+) -> list[RaceResult] | None:
+    # The binary session reader builds on this module, so it is imported on use.
+    from formula1_race_analysis.binary_session import (  # noqa: PLC0415
+        BinarySession,
+        calculate_binary_lap_statistics,
+        find_binary_session,
+    )
+
+    filepath = find_binary_session(base_dir)
+    if filepath is None:
+        return None
+    with BinarySession(filepath) as session:
+        if not session.header.is_valid_for(ignore_errors, record_rejections=rejections.enabled):
+            logger.warning(
+                f"Binary session '{filepath}' dropped {session.header.rejected_lines} invalid lines, "
+                "the text files are validated instead."
+            )
+            return None
+        drivers = session.drivers
+        if not drivers:
+            raise InvalidFormatDataError("Error! Failed during creating driver database.")
+        with metrics.stage("calculate_binary_lap_statistics"):
+            lap_statistics = calculate_binary_lap_statistics(
+                session, ignore_errors, multi_lap=multi_lap, metrics=metrics
+            )
+    _count_matched_drivers(metrics, drivers, lap_statistics)
+    return _lap_statistics_report(drivers, lap_statistics, multi_lap=multi_lap)
+
+
+def _check_report_options(backend: LapTimeBackend, *, multi_lap: bool, workers: int, external_join: bool) -> None:
+    if multi_lap and backend == LapTimeBackend.COLUMNAR:
+        raise ValueError("The columnar backend does not support multi-lap sessions.")
+    if workers > 1 and backend == LapTimeBackend.COLUMNAR:
+        raise ValueError("The columnar backend does not support parallel parsing.")
+    if external_join and backend == LapTimeBackend.COLUMNAR:
+        raise ValueError("The columnar backend does not support external joins.")
+    if external_join and workers > 1:
+        raise ValueError("External joins do not support parallel parsing.")
+
+
+def _lap_statistics_report(
+    drivers: list[Driver], lap_statistics: dict[str, LapStatistics], *, multi_lap: bool
+) -> list[RaceResult]:
     """
-    Reads the contents of a file and returns it as a list of lines.
-    Raises MissedFileError if the file is missing or cannot be opened.
+    Returns the results of the drivers with laps, with the lap count and mean lap time of multi-lap sessions.
     """
-    try:
-        with Path.open(filepath, encoding="utf-8") as text_file:
-            return text_file.readlines()
-    except FileNotFoundError as error:
-        raise MissedFileError(f"Error! The file path: {filepath} is not found or cannot be opened.") from error
+    return [
+        RaceResult(
+            driver=driver,
+            lap_time=lap_statistics[driver.identifier].best_lap,
+            lap_count=lap_statistics[driver.identifier].lap_count,
+            mean_lap_time=lap_statistics[driver.identifier].mean_lap if multi_lap else None,
+        )
+        for driver in drivers
+        if driver.identifier in lap_statistics
+    ]
 
 
-def create_driver_list(filepath: Path, ignore_errors: bool | None) -> list[Driver]:
+def create_driver_list(
+    filepath: Path,
+    ignore_errors: bool | None,
+    *,
+    use_mmap: bool = False,
+    metrics: Metrics = DISABLED_METRICS,
+    rejections: RejectionReport = DISABLED_REJECTIONS,
+) -> list[Driver]:
     """
     Parses the driver abbreviation file and returns a list of Driver objects.
+    Whitespace-only lines are skipped, other invalid lines are recorded in rejections.
+    Raises InvalidFormatDataError for the first invalid line unless ignore_errors is set.
     """
     drivers = []
-    raw_data_from_abbreviation_file = read_file_content(filepath)
-    for line in raw_data_from_abbreviation_file:
-        try:
-            entry = AbbreviationEntry.model_validate(line)
-            drivers.append(Driver.from_pydantic_model(entry))
-        except ValidationError:
-            if ignore_errors:
-                continue
+    lines_read = lines_rejected = 0
+    for lines_read, line in enumerate(iter_file_lines(filepath, use_mmap=use_mmap), 1):
+        if line.isspace():
+            continue
+        reason = AbbreviationEntry.check_line(line)
+        if reason is not None:
+            lines_rejected += 1
+            reject_line(rejections, filepath, lines_read, reason, line, ignore_errors=ignore_errors)
+            continue
+        drivers.append(Driver.from_pydantic_model(AbbreviationEntry.model_validate(line)))
+    _count_lines(metrics, lines_read, len(drivers), lines_rejected)
     return drivers
 
 
-def parse_log_file(filepath: Path, ignore_errors: bool | None) -> dict[str, TimeStampDict]:
+def parse_log_file(
+    filepath: Path,
+    ignore_errors: bool | None,
+    *,
+    use_mmap: bool = False,
+    metrics: Metrics = DISABLED_METRICS,
+    rejections: RejectionReport = DISABLED_REJECTIONS,
+) -> dict[str, TimeStampDict]:
     """
     Parses a log file to extract driver timestamps.
     """
-    timestamps = {}
-    raw_data_from_log_file = read_file_content(filepath)
-    for line in raw_data_from_log_file:
-        try:
-            entry = LogEntry.model_validate(line)
-            timestamps[entry.identifier] = TimeStampDict(identifier=entry.identifier, timestamp=entry.timestamp)
-        except ValidationError:
+    return {
+        entry["identifier"]: entry
+        for entry in iter_log_entries(
+            filepath, ignore_errors, use_mmap=use_mmap, metrics=metrics, rejections=rejections
+        )
+    }
+
+
+def iter_log_entries(
+    filepath: Path,
+    ignore_errors: bool | None,
+    *,
+    use_mmap: bool = False,
+    metrics: Metrics = DISABLED_METRICS,
+    rejections: RejectionReport = DISABLED_REJECTIONS,
+) -> Iterator[TimeStampDict]:
+    """
+    Lazily parses a log file and yields driver timestamps in file order.
+    Whitespace-only lines are skipped, other invalid lines are recorded in rejections.
+    Raises InvalidFormatDataError for the first invalid line unless ignore_errors is set.
+    The line counters are recorded when the file is exhausted or the iterator is closed.
+    """
+    lines_read = lines_parsed = lines_rejected = 0
+    try:
+        for lines_read, line in enumerate(iter_file_lines(filepath, use_mmap=use_mmap), 1):
+            if line.isspace():
+                continue
+            entry = classify_log_line(line)
+            if isinstance(entry, RejectionReason):
+                lines_rejected += 1
+                reject_line(rejections, filepath, lines_read, entry, line, ignore_errors=ignore_errors)
+                continue
+            lines_parsed += 1
+            yield entry
+    finally:
+        _count_lines(metrics, lines_read, lines_parsed, lines_rejected)
+
+
+def _count_lines(metrics: Metrics, lines_read: int, lines_parsed: int, lines_rejected: int) -> None:
+    metrics.increment("lines_read", lines_read)
+    metrics.increment("lines_parsed", lines_parsed)
+    metrics.increment("lines_rejected", lines_rejected)
+
+
+def _count_matched_drivers(metrics: Metrics, drivers: list[Driver], lap_times: Mapping[str, object]) -> None:
+    """
+    Counts the drivers with a lap time, the drivers without one and the logged identifiers
+    missing from the abbreviation file.
+    """
+    if not metrics.enabled:
+        return
+    driver_identifiers = {driver.identifier for driver in drivers}
+    matched_identifiers = driver_identifiers.intersection(lap_times)
+    metrics.increment("drivers_matched", len(matched_identifiers))
+    metrics.increment("drivers_unmatched", len(driver_identifiers) - len(matched_identifiers))
+    metrics.increment("identifiers_unmatched", len(lap_times.keys() - driver_identifiers))
+
+
+def count_unmatched_identifiers(metrics: Metrics, *, without_start: int, without_end: int) -> None:
+    """
+    Counts the identifiers logged in only one of the logs, which get no lap time.
+    The counters are only recorded when such identifiers were found.
+    """
+    if without_start:
+        metrics.increment("identifiers_without_start", without_start)
+    if without_end:
+        metrics.increment("identifiers_without_end", without_end)
+
+
+def calculate_lap_statistics(  # noqa: PLR0913
+    start_log_file: Path,
+    end_log_file: Path,
+    ignore_errors: bool | None,
+    *,
+    use_mmap: bool = False,
+    metrics: Metrics = DISABLED_METRICS,
+    rejections: RejectionReport = DISABLED_REJECTIONS,
+) -> dict[str, LapStatistics]:
+    """
+    Pairs the n-th start of each driver with the n-th end of the same driver and aggregates the laps.
+    Both logs are read in lockstep, so only unpaired timestamps and per-driver aggregates are kept
+    in memory. Starts or ends left without a pair at the end of the session are dropped.
+    Raises InvalidRaceTimeError when the start of a lap is greater than its end.
+    """
+    lap_pairing = LapPairing(ignore_errors)
+    start_entries = iter_log_entries(
+        start_log_file, ignore_errors, use_mmap=use_mmap, metrics=metrics, rejections=rejections
+    )
+    end_entries = iter_log_entries(
+        end_log_file, ignore_errors, use_mmap=use_mmap, metrics=metrics, rejections=rejections
+    )
+    for start_entry, end_entry in zip_longest(start_entries, end_entries):
+        if start_entry is not None:
+            lap_pairing.add_timestamp(start_entry, is_start=True)
+        if end_entry is not None:
+            lap_pairing.add_timestamp(end_entry, is_start=False)
+
+    return lap_pairing.lap_statistics
+
+
+class LapPairing:
+    """
+    Pairs the n-th start of each driver with the n-th end of the same driver, in whatever order
+    the timestamps arrive, and keeps running lap aggregates per driver.
+    """
+
+    def __init__(self, ignore_errors: bool | None) -> None:
+        self.ignore_errors = ignore_errors
+        self.lap_statistics: dict[str, LapStatistics] = {}
+        self._pending_starts: dict[str, deque[TimeStampDict]] = {}
+        self._pending_ends: dict[str, deque[TimeStampDict]] = {}
+
+    def add_timestamp(self, entry: TimeStampDict, *, is_start: bool) -> LapStatistics | None:
+        """
+        Adds a start or end timestamp and returns the updated aggregates when it completes a lap.
+        Raises InvalidRaceTimeError when the start of the completed lap is greater than its end.
+        """
+        identifier = entry["identifier"]
+        waiting, opposite = (
+            (self._pending_starts, self._pending_ends) if is_start else (self._pending_ends, self._pending_starts)
+        )
+        if not opposite.get(identifier):
+            waiting.setdefault(identifier, deque()).append(entry)
+            return None
+        lap_start, lap_end = entry, opposite[identifier].popleft()
+        if not is_start:
+            lap_start, lap_end = lap_end, lap_start
+        dt_start_time = lap_start["timestamp"]
+        dt_end_time = lap_end["timestamp"]
+        if dt_start_time > dt_end_time:
+            if self.ignore_errors:
+                return None
+            raise InvalidRaceTimeError(
+                f"Race time error for driver: '{identifier}'. Start time is greater than end time.",
+            )
+        lap_time = dt_end_time - dt_start_time
+        if identifier in self.lap_statistics:
+            self.lap_statistics[identifier].add_lap(lap_time)
+        else:
+            self.lap_statistics[identifier] = LapStatistics.from_lap_time(lap_time)
+        return self.lap_statistics[identifier]
+
+
+def pair_lap_timestamps(
+    identifier: str, starts: Iterable[int], ends: Iterable[int], ignore_errors: bool | None
+) -> LapStatistics | None:
+    """
+    Pairs the n-th start of a driver with its n-th end, like LapPairing, for timestamps in
+    integer epoch microseconds. Returns None when no lap could be paired.
+    Raises InvalidRaceTimeError when the start of a lap is greater than its end.
+    """
+    lap_statistics = None
+    for start, end in zip(starts, ends, strict=False):
+        if start > end:
             if ignore_errors:
                 continue
-    return timestamps
+            raise InvalidRaceTimeError(
+                f"Race time error for driver: '{identifier}'. Start time is greater than end time.",
+            )
+        lap_time = timedelta(microseconds=end - start)
+        if lap_statistics is None:
+            lap_statistics = LapStatistics.from_lap_time(lap_time)
+        else:
+            lap_statistics.add_lap(lap_time)
+    return lap_statistics
 
 
 def calculate_lap_time(
@@ -97,10 +449,13 @@ def calculate_lap_time(
 ) -> dict[str, LapTimeDict]:
     """
     Calculates lap times for each driver based on start and end timestamps.
+    Only drivers present in both logs get a lap time, in the order of the end log.
     Raised InvalidRaceTimeError is raised when the driver's start time exceeds than the end time.
     """
     lap_times = {}
-    for identifier in start_timestamps.keys() and end_timestamps.keys():
+    for identifier in end_timestamps:
+        if identifier not in start_timestamps:
+            continue
         dt_start_time = start_timestamps[identifier]["timestamp"]
         dt_end_time = end_timestamps[identifier]["timestamp"]
         if dt_start_time > dt_end_time:
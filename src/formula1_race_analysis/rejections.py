@@ -0,0 +1,93 @@
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+from formula1_race_analysis.exceptions import InvalidFormatDataError
+
+REJECTIONS_FORMAT_VERSION = 1
+DEFAULT_REJECTION_LIMIT = 1000
+MAX_EXCERPT_LENGTH = 80
+
+
+class RejectionReason(StrEnum):
+    WRONG_FIELD_COUNT = "wrong_field_count"
+    INVALID_IDENTIFIER = "invalid_identifier"
+    INVALID_NAME = "invalid_name"
+    MISSING_TIMESTAMP = "missing_timestamp"
+    INVALID_TIMESTAMP = "invalid_timestamp"
+
+
+@dataclass(frozen=True, slots=True)
+class Rejection:
+    file: str
+    line_number: int
+    reason: RejectionReason
+    excerpt: str
+
+
+class RejectionReport:
+    """
+    Rejected input lines of one report run.
+    Every rejection is counted, but only the first `limit` ones are kept with their file, line
+    number and excerpt, so a very dirty input cannot exhaust memory.
+    A disabled instance records nothing, like a disabled Metrics.
+    """
+
+    def __init__(self, *, enabled: bool = True, limit: int = DEFAULT_REJECTION_LIMIT) -> None:
+        self.enabled = enabled
+        self.limit = limit
+        self.rejections: list[Rejection] = []
+        self.reason_counts: Counter[RejectionReason] = Counter()
+
+    @property
+    def total(self) -> int:
+        return self.reason_counts.total()
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > len(self.rejections)
+
+    def add(self, filepath: Path, line_number: int, reason: RejectionReason, line: str) -> None:
+        if not self.enabled:
+            return
+        self.reason_counts[reason] += 1
+        if len(self.rejections) < self.limit:
+            excerpt = line.rstrip("\r\n")[:MAX_EXCERPT_LENGTH]
+            self.rejections.append(Rejection(str(filepath), line_number, reason, excerpt))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "format_version": REJECTIONS_FORMAT_VERSION,
+            "total": self.total,
+            "truncated": self.truncated,
+            "reasons": {reason.value: count for reason, count in self.reason_counts.most_common()},
+            "rejections": [asdict(rejection) for rejection in self.rejections],
+        }
+
+    def write_json(self, filepath: Path) -> None:
+        filepath.write_text(json.dumps(self.as_dict(), indent=2) + "\n", encoding="utf-8")
+
+
+DISABLED_REJECTIONS = RejectionReport(enabled=False)
+
+
+def reject_line(  # noqa: PLR0913
+    rejections: RejectionReport,
+    filepath: Path,
+    line_number: int,
+    reason: RejectionReason,
+    line: str,
+    *,
+    ignore_errors: bool | None,
+) -> None:
+    """
+    Records a rejected line and raises InvalidFormatDataError for it unless errors are ignored.
+    """
+    rejections.add(filepath, line_number, reason, line)
+    if not ignore_errors:
+        raise InvalidFormatDataError(
+            f"Error! Incorrect data format: '{line.rstrip()}' ({filepath}, line {line_number}: {reason})."
+        )
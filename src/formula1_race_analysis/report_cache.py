@@ -0,0 +1,179 @@
+import copy
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+from formula1_race_analysis.config import DEFAULT_REPORT_CACHE_BYTES, LapTimeBackend
+from formula1_race_analysis.instrumentation import DISABLED_METRICS, Metrics
+from formula1_race_analysis.models import RaceResult
+from formula1_race_analysis.q1_session_analyzer import build_q1_report
+from formula1_race_analysis.session_cache import session_files
+
+type SessionKey = tuple[str, bool, bool, LapTimeBackend]
+type StatFingerprints = tuple[tuple[str, int, int] | None, ...]
+
+
+@dataclass(slots=True)
+class ReportCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedReport:
+    fingerprints: StatFingerprints
+    report: list[RaceResult]
+    size_bytes: int
+
+
+class _PendingBuild:
+    """
+    Report being built by one request and awaited by the concurrent requests for the same key.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.report: list[RaceResult] = []
+        self.error: BaseException | None = None
+
+
+class ReportCache:
+    """
+    Thread-safe in-process cache of built reports, for services calling build_q1_report from many threads.
+    A report is keyed by the resolved session directory, the options that change it and the size and
+    modification time of the session files, so a changed file is a miss whose report replaces the
+    outdated one. The least recently used reports are evicted while their estimated size exceeds max_bytes.
+    Concurrent requests for a report that is being built wait for that build instead of parsing the
+    files again; a failed build is raised in all of them and not cached.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_REPORT_CACHE_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError(f"The memory budget must not be negative, got {max_bytes}.")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._reports: OrderedDict[SessionKey, _CachedReport] = OrderedDict()
+        self._pending: dict[tuple[SessionKey, StatFingerprints], _PendingBuild] = {}
+        self._stats = ReportCacheStats()
+
+    @property
+    def stats(self) -> ReportCacheStats:
+        """
+        Returns a snapshot of the hit, miss, coalesced request and eviction counters and of the cache size.
+        """
+        with self._lock:
+            return replace(self._stats)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reports.clear()
+            self._stats.entries = self._stats.size_bytes = 0
+
+    def get_report(
+        self,
+        base_dir: Path,
+        ignore_errors: bool | None = None,
+        *,
+        multi_lap: bool = False,
+        backend: LapTimeBackend = LapTimeBackend.PYTHON,
+        metrics: Metrics = DISABLED_METRICS,
+    ) -> list[RaceResult]:
+        """
+        Returns the report of build_q1_report from the cache, or builds it once for all concurrent requests.
+        Every request gets its own copy of the results, so sorting, filtering or updating them does not
+        change the cached report. The drivers are immutable and shared.
+        """
+        session_key = (str(base_dir.resolve()), bool(ignore_errors), multi_lap, backend)
+        fingerprints = _stat_fingerprints(base_dir)
+        with self._lock:
+            cached = self._reports.get(session_key)
+            if cached is not None and cached.fingerprints == fingerprints:
+                self._reports.move_to_end(session_key)
+                self._stats.hits += 1
+                metrics.increment("report_cache_hits")
+                return _copy_report(cached.report)
+            pending = self._pending.get((session_key, fingerprints))
+            is_leader = pending is None
+            if pending is None:
+                pending = self._pending[session_key, fingerprints] = _PendingBuild()
+                self._stats.misses += 1
+            else:
+                self._stats.coalesced += 1
+
+        if not is_leader:
+            metrics.increment("report_cache_coalesced")
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return _copy_report(pending.report)
+
+        metrics.increment("report_cache_misses")
+        try:
+            pending.report = build_q1_report(
+                base_dir, ignore_errors, multi_lap=multi_lap, backend=backend, metrics=metrics
+            )
+        except BaseException as error:
+            pending.error = error
+            raise
+        else:
+            self._store(session_key, fingerprints, pending.report)
+        finally:
+            with self._lock:
+                del self._pending[session_key, fingerprints]
+            pending.done.set()
+        return _copy_report(pending.report)
+
+    def _store(self, session_key: SessionKey, fingerprints: StatFingerprints, report: list[RaceResult]) -> None:
+        size_bytes = estimate_report_size(report)
+        with self._lock:
+            outdated = self._reports.pop(session_key, None)
+            if outdated is not None:
+                self._stats.size_bytes -= outdated.size_bytes
+            if size_bytes <= self.max_bytes:
+                self._reports[session_key] = _CachedReport(fingerprints, report, size_bytes)
+                self._stats.size_bytes += size_bytes
+            while self._stats.size_bytes > self.max_bytes:
+                _, evicted = self._reports.popitem(last=False)
+                self._stats.size_bytes -= evicted.size_bytes
+                self._stats.evictions += 1
+            self._stats.entries = len(self._reports)
+
+
+def _copy_report(report: list[RaceResult]) -> list[RaceResult]:
+    return [copy.copy(data) for data in report]
+
+
+def estimate_report_size(report: list[RaceResult]) -> int:
+    """
+    Estimates the memory held by a report: the list, the results, their drivers and the driver strings.
+    The interned strings shared between reports are counted in each of them, so the estimate errs on the large side.
+    """
+    return sys.getsizeof(report) + sum(
+        sys.getsizeof(data)
+        + sys.getsizeof(data.driver)
+        + sys.getsizeof(data.driver.identifier)
+        + sys.getsizeof(data.driver.name)
+        + sys.getsizeof(data.driver.car_model)
+        for data in report
+    )
+
+
+def _stat_fingerprints(base_dir: Path) -> StatFingerprints:
+    fingerprints: list[tuple[str, int, int] | None] = []
+    for filepath in session_files(base_dir):
+        try:
+            file_stat = filepath.stat()
+        except OSError:
+            fingerprints.append(None)
+            continue
+        fingerprints.append((filepath.name, file_stat.st_size, file_stat.st_mtime_ns))
+    return tuple(fingerprints)
@@ -0,0 +1,223 @@
+import json
+import threading
+from datetime import UTC, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from formula1_race_analysis.batch_report import BatchOptions
+from formula1_race_analysis.config import logger
+from formula1_race_analysis.display.display_race_report import SortStrategy, filter_report, sort_report
+from formula1_race_analysis.driver_index import DriverIndex
+from formula1_race_analysis.exceptions import (
+    Formula1RaceAnalysisError,
+    InvalidQueryError,
+    MissedFileError,
+    NoDataFoundError,
+)
+from formula1_race_analysis.models import RaceResult
+from formula1_race_analysis.q1_session_analyzer import build_q1_report
+from formula1_race_analysis.session_cache import FileFingerprint, session_files
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+class LoadedSession:
+    """
+    Report of one session directory together with the lookup structures reused by every query.
+    The files are fingerprinted before they are parsed, so a change made while the report is
+    being built is still detected by is_outdated.
+    """
+
+    def __init__(self, name: str, data_dir: Path, options: BatchOptions) -> None:
+        self.name = name
+        self.data_dir = data_dir
+        files = session_files(data_dir)
+        self.fingerprints = [FileFingerprint.from_file(filepath) for filepath in files if filepath.exists()]
+        if len(self.fingerprints) != len(files):
+            missing_file = next(filepath for filepath in files if not filepath.exists())
+            raise MissedFileError(f"Error! The file path: {missing_file} is not found or cannot be opened.")
+        self.report = build_q1_report(
+            data_dir, options.ignore_errors, multi_lap=options.multi_lap, backend=options.backend
+        )
+        self.index = DriverIndex(self.report)
+        self.positions = {
+            id(data): position
+            for position, data in enumerate(sort_report(self.report, SortStrategy.ASCENDING_ORDER), start=1)
+        }
+        self.loaded_at = datetime.now(tz=UTC)
+
+    def is_outdated(self) -> bool:
+        """
+        Checks whether a session file changed. The mtime of a file found unchanged by its content hash
+        is kept, so only the first query after a touch hashes the file.
+        """
+        files = session_files(self.data_dir)
+        if [fingerprint.name for fingerprint in self.fingerprints] != [filepath.name for filepath in files]:
+            return True
+        fingerprints = []
+        for fingerprint, filepath in zip(self.fingerprints, files, strict=True):
+            refreshed_fingerprint = fingerprint.refresh(filepath)
+            if refreshed_fingerprint is None:
+                return True
+            fingerprints.append(refreshed_fingerprint)
+        self.fingerprints = fingerprints
+        return False
+
+    def records(self, report: list[RaceResult]) -> list[dict[str, str | int]]:
+        """
+        Converts results into JSON records numbered by their qualifying position, whatever the order of the query.
+        """
+        return [data.as_record(self.positions[id(data)]) for data in report]
+
+    def summary(self) -> dict[str, str | int]:
+        return {
+            "name": self.name,
+            "data_dir": str(self.data_dir),
+            "drivers": len(self.report),
+            "loaded_at": self.loaded_at.isoformat(timespec="seconds"),
+        }
+
+
+class SessionStore:
+    """
+    Sessions answered by the report server, keyed by the name of their directory.
+    A session is parsed on its first query and reloaded on the first query after any of its files
+    changed; each session has its own lock, so a reload only blocks the queries of that session.
+    """
+
+    def __init__(self, data_dirs: list[Path], options: BatchOptions) -> None:
+        self.options = options
+        self._data_dirs = {data_dir.name: data_dir for data_dir in data_dirs}
+        if len(self._data_dirs) != len(data_dirs):
+            raise ValueError("Session directories must have different names.")
+        self._locks = {name: threading.Lock() for name in self._data_dirs}
+        self._sessions: dict[str, LoadedSession] = {}
+        self.reloads = 0
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._data_dirs)
+
+    def load_all(self) -> None:
+        for name in self._data_dirs:
+            self.get(name)
+
+    def get(self, name: str) -> LoadedSession:
+        """
+        Returns the up-to-date session, raises NoDataFoundError for an unknown name.
+        """
+        data_dir = self._data_dirs.get(name)
+        if data_dir is None:
+            raise NoDataFoundError(f"Error! Unknown session: '{name}'.")
+        with self._locks[name]:
+            session = self._sessions.get(name)
+            if session is not None and not session.is_outdated():
+                return session
+            if session is not None:
+                logger.info(f"Session files changed, reloading session '{name}'.")
+                self.reloads += 1
+            session = LoadedSession(name, data_dir, self.options)
+            self._sessions[name] = session
+            return session
+
+
+def handle_query(store: SessionStore, path: str) -> dict[str, Any]:
+    """
+    Answers a GET request path of the report server:
+    /sessions, /sessions/NAME/report?order=asc|desc&top=N|bottom=N and /sessions/NAME/drivers?driver=QUERY.
+    Raises NoDataFoundError for an unknown path, session or driver and InvalidQueryError for invalid parameters.
+    """
+    url = urlsplit(path)
+    parts = [unquote(part) for part in url.path.strip("/").split("/")]
+    parameters = parse_qs(url.query)
+    match parts:
+        case ["sessions"]:
+            return {"sessions": [store.get(name).summary() for name in store.names]}
+        case ["sessions", name, "report"]:
+            session = store.get(name)
+            return {"session": name, "results": session.records(_sorted_report(session, parameters))}
+        case ["sessions", name, "drivers"]:
+            session = store.get(name)
+            return {"session": name, "results": session.records(_filtered_report(session, parameters))}
+    raise NoDataFoundError(f"Error! Unknown path: '{url.path}'.")
+
+
+def _sorted_report(session: LoadedSession, parameters: dict[str, list[str]]) -> list[RaceResult]:
+    order = _single_parameter(parameters, "order") or SortStrategy.ASCENDING_ORDER.value
+    if order.lower() not in set(SortStrategy):
+        raise InvalidQueryError(f"Error! Invalid order: '{order}'. Expected 'asc' or 'desc'.")
+    top = _positive_parameter(parameters, "top")
+    bottom = _positive_parameter(parameters, "bottom")
+    if top is not None and bottom is not None:
+        raise InvalidQueryError("Error! Parameters 'top' and 'bottom' cannot be used together.")
+    return sort_report(session.report, SortStrategy(order.lower()), top or bottom, slowest=bottom is not None)
+
+
+def _filtered_report(session: LoadedSession, parameters: dict[str, list[str]]) -> list[RaceResult]:
+    raw_requests = parameters.get("driver")
+    if not raw_requests:
+        raise InvalidQueryError("Error! Parameter 'driver' is required.")
+    filtered_data = []
+    for raw_request in raw_requests:
+        driver_data = filter_report(session.report, raw_request, session.index)
+        if not driver_data:
+            raise NoDataFoundError(f"Error! No data found for driver: '{raw_request}'.")
+        filtered_data.extend(driver_data)
+    return list({id(data): data for data in filtered_data}.values())
+
+
+def _single_parameter(parameters: dict[str, list[str]], name: str) -> str | None:
+    values = parameters.get(name)
+    if values is None:
+        return None
+    if len(values) > 1:
+        raise InvalidQueryError(f"Error! Parameter '{name}' can only be given once.")
+    return values[0]
+
+
+def _positive_parameter(parameters: dict[str, list[str]], name: str) -> int | None:
+    value = _single_parameter(parameters, name)
+    if value is None:
+        return None
+    if not (value.isascii() and value.isdigit()) or int(value) < 1:
+        raise InvalidQueryError(f"Error! Parameter '{name}' must be a positive integer, got '{value}'.")
+    return int(value)
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    server: "ReportServer"
+
+    def do_GET(self) -> None:
+        try:
+            status, body = HTTPStatus.OK, handle_query(self.server.store, self.path)
+        except NoDataFoundError as error:
+            status, body = HTTPStatus.NOT_FOUND, {"error": str(error)}
+        except InvalidQueryError as error:
+            status, body = HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        except Formula1RaceAnalysisError as error:
+            logger.error(f"Failed during loading session: {error}")
+            status, body = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(error)}
+        payload = json.dumps(body, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", JSON_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class ReportServer(ThreadingHTTPServer):
+    """
+    HTTP server answering report queries from the sessions of a SessionStore, one thread per request.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], store: SessionStore) -> None:
+        super().__init__(address, ReportRequestHandler)
+        self.store = store
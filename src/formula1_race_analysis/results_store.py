@@ -0,0 +1,191 @@
+import sqlite3
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from itertools import batched
+from pathlib import Path
+from types import TracebackType
+
+from formula1_race_analysis.batch_report import BatchOptions, BatchSummary
+from formula1_race_analysis.config import logger
+from formula1_race_analysis.exceptions import Formula1RaceAnalysisError, InvalidFormatDataError
+from formula1_race_analysis.models import Driver, RaceResult
+from formula1_race_analysis.q1_session_analyzer import build_q1_report
+
+SCHEMA_VERSION = 1
+INSERT_BATCH_SIZE = 10_000
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    ingested_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    identifier TEXT NOT NULL,
+    name TEXT NOT NULL,
+    car_model TEXT NOT NULL,
+    lap_time_us INTEGER NOT NULL,
+    lap_count INTEGER NOT NULL,
+    mean_lap_time_us INTEGER
+);
+CREATE INDEX IF NOT EXISTS results_by_identifier ON results (identifier, lap_time_us);
+CREATE INDEX IF NOT EXISTS results_by_session ON results (session_id, lap_time_us);
+"""
+INSERT_RESULT = """
+INSERT INTO results (session_id, position, identifier, name, car_model, lap_time_us, lap_count, mean_lap_time_us)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SEASON_LEADERBOARD_QUERY = """
+SELECT sessions.path, results.identifier, results.name, results.car_model, MIN(results.lap_time_us), results.lap_count
+FROM results JOIN sessions ON sessions.id = results.session_id
+GROUP BY results.identifier
+ORDER BY MIN(results.lap_time_us), results.identifier
+LIMIT ?
+"""
+SESSION_LEADERBOARD_QUERY = """
+SELECT sessions.path, results.identifier, results.name, results.car_model, MIN(results.lap_time_us), results.lap_count
+FROM results JOIN sessions ON sessions.id = results.session_id
+WHERE sessions.path = ?
+GROUP BY results.identifier
+ORDER BY MIN(results.lap_time_us), results.identifier
+LIMIT ?
+"""
+DRIVER_HISTORY_QUERY = """
+SELECT sessions.path, results.position, results.identifier, results.name, results.car_model, results.lap_time_us,
+    results.lap_count
+FROM results JOIN sessions ON sessions.id = results.session_id
+WHERE results.identifier = ?
+ORDER BY sessions.path
+"""
+NO_LIMIT = -1
+
+
+@dataclass(frozen=True, slots=True)
+class StoredResult:
+    """
+    A result read back from the store with the session it belongs to.
+    """
+
+    session: str
+    position: int
+    result: RaceResult
+
+    def as_record(self) -> dict[str, str | int]:
+        return {"session": self.session, **self.result.as_record(self.position)}
+
+
+class ResultsStore:
+    """
+    SQLite database of parsed session reports, indexed by driver identifier, session and lap time.
+    Lap times are stored as integer microseconds, as held by RaceResult.
+    """
+
+    def __init__(self, database: Path) -> None:
+        self.database = database
+        self.connection = sqlite3.connect(database)
+        try:
+            self.connection.execute("PRAGMA foreign_keys = ON")
+            version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        except sqlite3.DatabaseError as error:
+            self.connection.close()
+            raise InvalidFormatDataError(f"Error! The file is not a results store: '{database}'.") from error
+        if version not in {0, SCHEMA_VERSION}:
+            self.connection.close()
+            raise InvalidFormatDataError(f"Error! Unsupported results store version {version}: '{database}'.")
+        with self.connection:
+            self.connection.executescript(SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __enter__(self) -> "ResultsStore":  # noqa: PYI034
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def ingest_report(self, session_dir: Path, report: list[RaceResult]) -> None:
+        """
+        Stores the report of a session in one transaction, replacing a previous ingest of the same directory.
+        Rows are inserted in batches of INSERT_BATCH_SIZE.
+        """
+        ranked_report = sorted(report, key=lambda data: data.lap_time_us)
+        session_path = str(session_dir.resolve())
+        with self.connection:
+            self.connection.execute("DELETE FROM sessions WHERE path = ?", (session_path,))
+            session_id = self.connection.execute(
+                "INSERT INTO sessions (path, ingested_at) VALUES (?, ?)",
+                (session_path, datetime.now(tz=UTC).isoformat(timespec="seconds")),
+            ).lastrowid
+            rows = (
+                (
+                    session_id,
+                    position,
+                    data.driver.identifier,
+                    data.driver.name,
+                    data.driver.car_model,
+                    data.lap_time_us,
+                    data.lap_count,
+                    data.mean_lap_time_us,
+                )
+                for position, data in enumerate(ranked_report, start=1)
+            )
+            for batch in batched(rows, INSERT_BATCH_SIZE):
+                self.connection.executemany(INSERT_RESULT, batch)
+
+    def leaderboard(self, limit: int | None = None, session_dir: Path | None = None) -> list[StoredResult]:
+        """
+        Returns the best lap of every driver across all sessions, or within one session, fastest first.
+        Each entry names the session in which the lap was set.
+        """
+        limit = NO_LIMIT if limit is None else limit
+        if session_dir is None:
+            rows = self.connection.execute(SEASON_LEADERBOARD_QUERY, (limit,)).fetchall()
+        else:
+            rows = self.connection.execute(SESSION_LEADERBOARD_QUERY, (str(session_dir.resolve()), limit)).fetchall()
+        return [
+            StoredResult(
+                session=path,
+                position=position,
+                result=RaceResult.from_microseconds(Driver(identifier, name, car_model), lap_time_us, lap_count),
+            )
+            for position, (path, identifier, name, car_model, lap_time_us, lap_count) in enumerate(rows, start=1)
+        ]
+
+    def driver_history(self, identifier: str) -> list[StoredResult]:
+        """
+        Returns the result and position of a driver in every stored session, ordered by session path.
+        """
+        rows = self.connection.execute(DRIVER_HISTORY_QUERY, (identifier.upper(),)).fetchall()
+        return [
+            StoredResult(
+                session=path,
+                position=position,
+                result=RaceResult.from_microseconds(Driver(driver_id, name, car_model), lap_time_us, lap_count),
+            )
+            for path, position, driver_id, name, car_model, lap_time_us, lap_count in rows
+        ]
+
+
+def ingest_sessions(store: ResultsStore, session_dirs: list[Path], options: BatchOptions) -> BatchSummary:
+    """
+    Parses every session and stores its report. A session that fails to parse is recorded in the
+    summary and skipped, as in batch-report.
+    """
+    summary = BatchSummary()
+    for session_dir in session_dirs:
+        summary.processed += 1
+        try:
+            report = build_q1_report(
+                session_dir, options.ignore_errors, multi_lap=options.multi_lap, backend=options.backend
+            )
+        except Formula1RaceAnalysisError as error:
+            summary.failed[str(session_dir)] = f"{type(error).__name__}: {error}"
+            continue
+        store.ingest_report(session_dir, report)
+        logger.debug(f"Ingested {len(report)} results of session '{session_dir}'.")
+    return summary
@@ -2,14 +2,17 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
+from formula1_race_analysis.config import ID_LENGTH, ID_SLICER
 from formula1_race_analysis.exceptions import (
     InvalidFormatDataError,
     InvalidIdentifierFormatError,
     InvalidNameFormatError,
 )
+from formula1_race_analysis.rejections import RejectionReason
+from formula1_race_analysis.timestamps import TIMESTAMP_FORMAT, decode_fixed_width_timestamp
 
-ID_SLICER = 3
-ID_LENGTH = 3
+ABBREVIATION_FIELDS = 3
+NAME_PARTS = 2
 
 
 class AbbreviationEntry(BaseModel):
@@ -70,6 +73,24 @@ class AbbreviationEntry(BaseModel):
             except InvalidNameFormatError:
                 return None, None
 
+    @staticmethod
+    def check_line(line: str) -> RejectionReason | None:
+        """
+        Returns the reason why the line would fail validation, or None for a valid line.
+        Only string checks are made, so rejecting a line costs no exception.
+        """
+        fields = line.strip("\n").split("_")
+        if len(fields) != ABBREVIATION_FIELDS:
+            return RejectionReason.WRONG_FIELD_COUNT
+        identifier, name, _ = fields
+        identifier = identifier.upper()
+        if len(identifier) != ID_LENGTH or not identifier.isalpha():
+            return RejectionReason.INVALID_IDENTIFIER
+        name_parts = name.strip().split(" ")
+        if len(name_parts) != NAME_PARTS or not all(name_parts):
+            return RejectionReason.INVALID_NAME
+        return None
+
 
 class LogEntry(BaseModel):
     identifier: str
@@ -80,6 +101,7 @@ class LogEntry(BaseModel):
     def format_data_from_log_file(cls, entry: str) -> dict[str, str | datetime]:
         """
         Formats raw data from the log file into a dictionary of driver IDs and timestamps.
+        Fixed-width timestamps are decoded with the date prefix cache, any other layout with strptime.
         Raises InvalidFormatDataError when data in file is not in the expected format.
         """
         try:
@@ -88,5 +110,5 @@ class LogEntry(BaseModel):
             string_timestamp = log_info[ID_SLICER:]
         except ValueError as error:
             raise InvalidFormatDataError(f"Error! Incorrect data format: '{entry}'.") from error
-        timestamp = datetime.strptime(string_timestamp, "%Y-%m-%d_%H:%M:%S.%f")
+        timestamp = decode_fixed_width_timestamp(log_info) or datetime.strptime(string_timestamp, TIMESTAMP_FORMAT)
         return {"identifier": identifier.upper(), "timestamp": timestamp}
@@ -0,0 +1,221 @@
+import hashlib
+import marshal
+import os
+import sys
+from dataclasses import astuple, dataclass, replace
+from pathlib import Path
+
+from formula1_race_analysis import q1_session_analyzer
+from formula1_race_analysis.binary_session import find_binary_session
+from formula1_race_analysis.config import (
+    DEFAULT_EXTERNAL_RUN_SIZE,
+    DEFAULT_PARSE_CHUNK_SIZE,
+    TEXT_SESSION_FILES,
+    FilePaths,
+    LapTimeBackend,
+    logger,
+)
+from formula1_race_analysis.file_reader import resolve_session_file
+from formula1_race_analysis.incremental import STATE_FILE_SUFFIX, IncrementalSession
+from formula1_race_analysis.instrumentation import DISABLED_METRICS, Metrics
+from formula1_race_analysis.models import Driver, RaceResult
+
+CACHE_DIR_NAME = ".f1_cache"
+CACHE_FILE_SUFFIX = ".q1cache"
+CACHE_FORMAT_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+type CachedRaceResult = tuple[str, str, str, int, int, int | None]
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    name: str
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    @staticmethod
+    def from_file(filepath: Path) -> "FileFingerprint":
+        file_stat = filepath.stat()
+        return FileFingerprint(
+            name=filepath.name, size=file_stat.st_size, mtime_ns=file_stat.st_mtime_ns, sha256=hash_file(filepath)
+        )
+
+    def matches(self, filepath: Path) -> bool:
+        """
+        Checks whether the file still has the fingerprinted content.
+        Size and mtime are compared first; the content hash is only computed when the size
+        is unchanged but the mtime differs, e.g. after the file was rewritten with the same data.
+        """
+        return self.refresh(filepath) is not None
+
+    def refresh(self, filepath: Path) -> "FileFingerprint | None":
+        """
+        Returns the fingerprint with the current mtime of the file when it still has the fingerprinted
+        content, otherwise None. Keeping the refreshed fingerprint avoids hashing a touched file again.
+        """
+        try:
+            file_stat = filepath.stat()
+        except OSError:
+            return None
+        if file_stat.st_size != self.size:
+            return None
+        if file_stat.st_mtime_ns == self.mtime_ns:
+            return self
+        if hash_file(filepath) != self.sha256:
+            return None
+        return replace(self, mtime_ns=file_stat.st_mtime_ns)
+
+
+def hash_file(filepath: Path) -> str:
+    digest = hashlib.sha256()
+    with Path.open(filepath, "rb") as binary_file:
+        while chunk := binary_file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def session_files(base_dir: Path) -> list[Path]:
+    """
+    Returns the files the report of a session depends on: its binary session and the remaining text
+    files when the binary session is up to date, otherwise the text files.
+    """
+    text_files = [resolve_session_file(base_dir, file_name) for file_name in TEXT_SESSION_FILES]
+    binary_session = find_binary_session(base_dir)
+    if binary_session is not None:
+        return [binary_session, *(filepath for filepath in text_files if filepath.exists())]
+    return text_files
+
+
+def cache_file_path(base_dir: Path, cache_dir: Path | None, *, ignore_errors: bool, multi_lap: bool) -> Path:
+    """
+    Returns the cache file of a session. By default the cache lives in a hidden directory next to
+    the session files; the name also encodes the options that change the report.
+    """
+    if cache_dir is None:
+        cache_dir = base_dir / CACHE_DIR_NAME
+    cache_key = f"{base_dir.resolve()}|ignore_errors={ignore_errors}|multi_lap={multi_lap}"
+    return cache_dir / f"{hashlib.sha256(cache_key.encode()).hexdigest()[:32]}{CACHE_FILE_SUFFIX}"
+
+
+def build_cached_q1_report(  # noqa: PLR0913
+    base_dir: Path,
+    ignore_errors: bool | None = None,
+    *,
+    cache_dir: Path | None = None,
+    use_mmap: bool = False,
+    multi_lap: bool = False,
+    backend: LapTimeBackend = LapTimeBackend.PYTHON,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_PARSE_CHUNK_SIZE,
+    external_join: bool = False,
+    run_size: int = DEFAULT_EXTERNAL_RUN_SIZE,
+    metrics: Metrics = DISABLED_METRICS,
+    incremental: bool = False,
+) -> list[RaceResult]:
+    """
+    Returns the Q1 report from the on-disk cache when none of the session files has changed,
+    otherwise builds it with build_q1_report and stores it for the next run.
+    With incremental the intermediate results are kept next to the cache as well, and a changed
+    session is rebuilt by an IncrementalSession that only parses again the changed parts.
+    """
+    ignore_errors = bool(ignore_errors)
+    if incremental and backend == LapTimeBackend.COLUMNAR:
+        raise ValueError("The columnar backend does not support incremental builds.")
+    if incremental and workers > 1:
+        raise ValueError("Incremental builds do not support parallel parsing.")
+    if incremental and external_join:
+        raise ValueError("Incremental builds do not support external joins.")
+
+    cache_file = cache_file_path(base_dir, cache_dir, ignore_errors=ignore_errors, multi_lap=multi_lap)
+    files = session_files(base_dir)
+    with metrics.stage("load_cached_report"):
+        cached_report = load_cached_report(cache_file, files)
+    if cached_report is not None:
+        logger.info(f"Session cache hit: '{cache_file}'.")
+        metrics.increment("cache_hits")
+        return cached_report
+
+    logger.info(f"Session cache miss: '{cache_file}'.")
+    metrics.increment("cache_misses")
+    fingerprints = [FileFingerprint.from_file(filepath) for filepath in files if filepath.exists()]
+    # A binary session is loaded without parsing, so there is nothing to rebuild incrementally.
+    if incremental and files[0].name != FilePaths.BINARY_SESSION:
+        state_file = cache_file.with_suffix(STATE_FILE_SUFFIX)
+        session = IncrementalSession.load(state_file, base_dir, ignore_errors, multi_lap=multi_lap)
+        report = session.build(use_mmap=use_mmap, metrics=metrics)
+        logger.info(f"Incremental build of '{base_dir}': {session.reuse.describe()}.")
+        session.save(state_file)
+    else:
+        report = q1_session_analyzer.build_q1_report(
+            base_dir,
+            ignore_errors,
+            use_mmap=use_mmap,
+            multi_lap=multi_lap,
+            backend=backend,
+            workers=workers,
+            chunk_size=chunk_size,
+            external_join=external_join,
+            run_size=run_size,
+            metrics=metrics,
+        )
+    if len(fingerprints) == len(files):
+        store_cached_report(cache_file, fingerprints, report)
+    return report
+
+
+def load_cached_report(cache_file: Path, files: list[Path]) -> list[RaceResult] | None:
+    """
+    Loads a cached report, returns None when the cache is missing, unreadable or outdated.
+    """
+    try:
+        version, python_tag, raw_fingerprints, raw_results = marshal.loads(cache_file.read_bytes())
+        fingerprints = [FileFingerprint(*raw_fingerprint) for raw_fingerprint in raw_fingerprints]
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if version != CACHE_FORMAT_VERSION or python_tag != sys.implementation.cache_tag:
+        return None
+    if [fingerprint.name for fingerprint in fingerprints] != [filepath.name for filepath in files]:
+        return None
+    if not all(fingerprint.matches(filepath) for fingerprint, filepath in zip(fingerprints, files, strict=True)):
+        return None
+    return [_decode_race_result(raw_result) for raw_result in raw_results]
+
+
+def store_cached_report(cache_file: Path, fingerprints: list[FileFingerprint], report: list[RaceResult]) -> None:
+    """
+    Atomically writes the report and the fingerprints of the session files to the cache.
+    Failing to write the cache is logged and does not interrupt the report generation.
+    """
+    payload = (
+        CACHE_FORMAT_VERSION,
+        sys.implementation.cache_tag,
+        [astuple(fingerprint) for fingerprint in fingerprints],
+        [_encode_race_result(data) for data in report],
+    )
+    temporary_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temporary_file.write_bytes(marshal.dumps(payload))
+        temporary_file.replace(cache_file)
+    except OSError as error:
+        logger.warning(f"Failed to write session cache '{cache_file}': {error}")
+
+
+def _encode_race_result(data: RaceResult) -> CachedRaceResult:
+    return (
+        data.driver.identifier,
+        data.driver.name,
+        data.driver.car_model,
+        data.lap_time_us,
+        data.lap_count,
+        data.mean_lap_time_us,
+    )
+
+
+def _decode_race_result(raw_result: CachedRaceResult) -> RaceResult:
+    identifier, name, car_model, lap_time, lap_count, mean_lap_time = raw_result
+    return RaceResult.from_microseconds(
+        Driver(identifier=identifier, name=name, car_model=car_model), lap_time, lap_count, mean_lap_time
+    )
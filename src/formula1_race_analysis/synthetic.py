@@ -0,0 +1,100 @@
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from string import ascii_uppercase
+
+from formula1_race_analysis.config import ID_LENGTH, FilePaths
+
+MAX_DRIVERS = len(ascii_uppercase) ** ID_LENGTH
+SESSION_START = datetime(2018, 5, 24, 12)
+MAX_START_DELAY_MS = 20 * 60 * 1000
+MIN_LAP_TIME_MS = 60 * 1000
+MAX_LAP_TIME_MS = 90 * 1000
+FIRST_NAMES = ("Daniel", "Sebastian", "Lewis", "Kimi", "Valtteri", "Esteban", "Fernando", "Charles", "Sergio", "Pierre")
+LAST_NAMES = ("Ricciardo", "Vettel", "Hamilton", "Raikkonen", "Bottas", "Ocon", "Alonso", "Leclerc", "Perez", "Gasly")
+CAR_MODELS = (
+    "FERRARI",
+    "MERCEDES",
+    "RED BULL RACING TAG HEUER",
+    "MCLAREN RENAULT",
+    "WILLIAMS MERCEDES",
+    "HAAS FERRARI",
+)
+MALFORMED_LINES = (
+    "\n",
+    "malformed line\n",
+    "{identifier}\n",
+    "{identifier}2018-05-24 12:00:00\n",
+    "{identifier}2018-13-45_25:61:61.000\n",
+)
+
+
+@dataclass(frozen=True)
+class SessionSpec:
+    """
+    Scale of a synthetic session: every driver drives `laps` consecutive laps, and after each valid
+    log line a malformed one is written with the probability `malformed_rate`.
+    The same spec and seed always produce the same files.
+    """
+
+    drivers: int = 20
+    laps: int = 1
+    malformed_rate: float = 0.0
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.drivers <= MAX_DRIVERS:
+            raise ValueError(f"The number of drivers must be between 1 and {MAX_DRIVERS}, got {self.drivers}.")
+        if self.laps < 1:
+            raise ValueError(f"The number of laps must be positive, got {self.laps}.")
+        if not 0 <= self.malformed_rate < 1:
+            raise ValueError(f"The malformed line rate must be in [0, 1), got {self.malformed_rate}.")
+
+    @property
+    def records(self) -> int:
+        return self.drivers * self.laps
+
+
+def generate_session(base_dir: Path, spec: SessionSpec) -> Path:
+    """
+    Writes abbreviations.txt, start.log and end.log of a synthetic session into base_dir.
+    Laps are written round by round, so memory stays proportional to the number of drivers.
+    Malformed lines are only written to the log files, where the analyzer rejects them.
+    """
+    generator = random.Random(spec.seed)
+    base_dir.mkdir(parents=True, exist_ok=True)
+    identifiers = [_encode_identifier(code) for code in generator.sample(range(MAX_DRIVERS), spec.drivers)]
+
+    with Path.open(base_dir / FilePaths.ABBREVIATIONS, "w", encoding="utf-8") as abbreviations_file:
+        for identifier in identifiers:
+            name = f"{generator.choice(FIRST_NAMES)} {generator.choice(LAST_NAMES)}"
+            abbreviations_file.write(f"{identifier}_{name}_{generator.choice(CAR_MODELS)}\n")
+
+    clocks = [generator.randrange(MAX_START_DELAY_MS) for _ in identifiers]
+    with (
+        Path.open(base_dir / FilePaths.START_LOG, "w", encoding="utf-8") as start_log,
+        Path.open(base_dir / FilePaths.END_LOG, "w", encoding="utf-8") as end_log,
+    ):
+        for _ in range(spec.laps):
+            for position, identifier in enumerate(identifiers):
+                lap_start = clocks[position]
+                clocks[position] += generator.randint(MIN_LAP_TIME_MS, MAX_LAP_TIME_MS)
+                for log_file, offset in ((start_log, lap_start), (end_log, clocks[position])):
+                    log_file.write(_format_log_line(identifier, offset))
+                    if spec.malformed_rate and generator.random() < spec.malformed_rate:
+                        log_file.write(generator.choice(MALFORMED_LINES).format(identifier=identifier))
+    return base_dir
+
+
+def _encode_identifier(code: int) -> str:
+    letters = []
+    for _ in range(ID_LENGTH):
+        code, letter = divmod(code, len(ascii_uppercase))
+        letters.append(ascii_uppercase[letter])
+    return "".join(letters)
+
+
+def _format_log_line(identifier: str, offset_ms: int) -> str:
+    timestamp = SESSION_START + timedelta(milliseconds=offset_ms)
+    return f"{identifier}{timestamp:%Y-%m-%d_%H:%M:%S}.{timestamp.microsecond // 1000:03}\n"
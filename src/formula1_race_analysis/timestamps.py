@@ -0,0 +1,84 @@
+import re
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+from formula1_race_analysis.config import ID_SLICER
+
+TIMESTAMP_FORMAT = "%Y-%m-%d_%H:%M:%S.%f"
+FIXED_WIDTH_TIMESTAMP = re.compile(r"\d{4}-\d\d-\d\d_\d\d:\d\d:\d\d\.\d{3}", re.ASCII)
+DATE_PREFIX_LENGTH = len("YYYY-MM-DD")
+DATE_CACHE_SIZE = 64
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+HOURS_PER_DAY = 24
+MINUTES_PER_HOUR = SECONDS_PER_MINUTE = 60
+NANOSECONDS_PER_MICROSECOND = 1000
+NANOSECONDS_PER_SECOND = 1_000_000_000
+NANOSECONDS_PER_MILLISECOND = 1_000_000
+SECONDS_PER_DAY = HOURS_PER_DAY * MINUTES_PER_HOUR * SECONDS_PER_MINUTE
+
+_DATE_START = ID_SLICER
+_DATE_END = _DATE_START + DATE_PREFIX_LENGTH
+_TIME_START = _DATE_END + 1
+_MILLISECONDS_START = _TIME_START + len("HH:MM:SS.")
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def decode_date_prefix(date_prefix: str) -> tuple[int, int, int, int] | None:
+    """
+    Decodes a "YYYY-MM-DD" prefix into its year, month, day and the seconds from the Unix epoch to its midnight.
+    Log lines of a session share a few dates, so the results are kept in a small LRU cache; sessions
+    crossing midnight or spanning several days use one entry per day.
+    Returns None for an impossible date.
+    """
+    try:
+        midnight = date(int(date_prefix[0:4]), int(date_prefix[5:7]), int(date_prefix[8:10]))
+    except ValueError:
+        return None
+    return midnight.year, midnight.month, midnight.day, (midnight.toordinal() - EPOCH_ORDINAL) * SECONDS_PER_DAY
+
+
+def decode_fixed_width_timestamp(log_info: str) -> datetime | None:
+    """
+    Decodes the timestamp of a fixed-width log line without strptime, taking the date from the date prefix cache.
+    Returns None when the line does not match the layout or holds an impossible date or time.
+    """
+    if FIXED_WIDTH_TIMESTAMP.fullmatch(log_info, ID_SLICER) is None:
+        return None
+    decoded_date = decode_date_prefix(log_info[_DATE_START:_DATE_END])
+    if decoded_date is None:
+        return None
+    year, month, day, _ = decoded_date
+    hours = int(log_info[_TIME_START : _TIME_START + 2])
+    minutes = int(log_info[_TIME_START + 3 : _TIME_START + 5])
+    seconds = int(log_info[_TIME_START + 6 : _TIME_START + 8])
+    if hours >= HOURS_PER_DAY or minutes >= MINUTES_PER_HOUR or seconds >= SECONDS_PER_MINUTE:
+        return None
+    return datetime(year, month, day, hours, minutes, seconds, int(log_info[_MILLISECONDS_START:]) * 1000)
+
+
+def decode_fixed_width_epoch_ns(log_info: str) -> int | None:
+    """
+    Decodes the timestamp of a fixed-width log line into integer nanoseconds since the Unix epoch:
+    the time of day is added as an offset to the cached midnight of its date.
+    Returns None in the same cases as decode_fixed_width_timestamp.
+    """
+    if FIXED_WIDTH_TIMESTAMP.fullmatch(log_info, ID_SLICER) is None:
+        return None
+    decoded_date = decode_date_prefix(log_info[_DATE_START:_DATE_END])
+    if decoded_date is None:
+        return None
+    hours = int(log_info[_TIME_START : _TIME_START + 2])
+    minutes = int(log_info[_TIME_START + 3 : _TIME_START + 5])
+    seconds = int(log_info[_TIME_START + 6 : _TIME_START + 8])
+    if hours >= HOURS_PER_DAY or minutes >= MINUTES_PER_HOUR or seconds >= SECONDS_PER_MINUTE:
+        return None
+    epoch_seconds = decoded_date[3] + (hours * MINUTES_PER_HOUR + minutes) * SECONDS_PER_MINUTE + seconds
+    return epoch_seconds * NANOSECONDS_PER_SECOND + int(log_info[_MILLISECONDS_START:]) * NANOSECONDS_PER_MILLISECOND
+
+
+def datetime_to_epoch_ns(timestamp: datetime) -> int:
+    """
+    Converts a naive datetime into integer nanoseconds since the Unix epoch.
+    """
+    return (timestamp - EPOCH) // timedelta(microseconds=1) * NANOSECONDS_PER_MICROSECOND
@@ -49,3 +49,34 @@ def prepare_invalid_data(tmp_path: Path) -> Path:
     tmp_start_log.write_text(start_log_content)
 
     return data_dir
+
+
+@pytest.fixture
+def prepare_multi_lap_data(tmp_path: Path) -> Path:
+    data_dir = tmp_path / "multi_lap_data"
+    data_dir.mkdir()
+
+    tmp_abbreviations = data_dir / FilePaths.ABBREVIATIONS
+    abbreviations_content = "PGS_Pierre Gasly_SCUDERIA TORO ROSSO HONDA\nKMH_Kevin Magnussen_HAAS FERRARI\n"
+    tmp_abbreviations.write_text(abbreviations_content)
+
+    tmp_start_log = data_dir / FilePaths.START_LOG
+    start_log_content = (
+        "PGS2018-05-24_12:00:00.000\n"
+        "KMH2018-05-24_12:00:30.000\n"
+        "PGS2018-05-24_12:01:15.000\n"
+        "KMH2018-05-24_12:01:45.500\n"
+        "PGS2018-05-24_12:02:28.000\n"
+    )
+    tmp_start_log.write_text(start_log_content)
+
+    tmp_end_log = data_dir / FilePaths.END_LOG
+    end_log_content = (
+        "PGS2018-05-24_12:01:15.000\n"
+        "KMH2018-05-24_12:01:45.500\n"
+        "PGS2018-05-24_12:02:28.000\n"
+        "KMH2018-05-24_12:03:00.000\n"
+    )
+    tmp_end_log.write_text(end_log_content)
+
+    return data_dir
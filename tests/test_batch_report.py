@@ -0,0 +1,106 @@
+import gzip
+import io
+import json
+import logging
+import shutil
+from pathlib import Path
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+from click.testing import CliRunner
+
+from formula1_race_analysis.batch_report import BatchOptions, discover_sessions, run_batch_report
+from formula1_race_analysis.config import FilePaths
+from formula1_race_analysis.display import batch_report
+
+
+@pytest.fixture
+def prepare_season(prepare_correct_data: Path, tmp_path: Path) -> Path:
+    season_dir = tmp_path / "season"
+    for round_name in ("round_01/q1", "round_02/q1"):
+        shutil.copytree(prepare_correct_data, season_dir / round_name)
+    broken_session = season_dir / "round_03" / "q1"
+    broken_session.mkdir(parents=True)
+    (broken_session / FilePaths.ABBREVIATIONS).write_text("Valtteri Bottas_MERCEDES\n")
+    (season_dir / "notes").mkdir()
+    return season_dir
+
+
+class TestBatchReport:
+    def test_discover_sessions_in_root_directory(self, prepare_season: Path) -> None:
+        # When
+        sessions = discover_sessions(prepare_season)
+        # Then
+        assert sessions == [
+            prepare_season / "round_01" / "q1",
+            prepare_season / "round_02" / "q1",
+            prepare_season / "round_03" / "q1",
+        ]
+
+    def test_discover_sessions_with_compressed_abbreviations(self, prepare_season: Path) -> None:
+        # Given
+        abbreviations = prepare_season / "round_02" / "q1" / FilePaths.ABBREVIATIONS
+        abbreviations.with_name(f"{FilePaths.ABBREVIATIONS}.gz").write_bytes(gzip.compress(abbreviations.read_bytes()))
+        abbreviations.unlink()
+        # When
+        sessions = discover_sessions(prepare_season)
+        # Then
+        assert sessions == [
+            prepare_season / "round_01" / "q1",
+            prepare_season / "round_02" / "q1",
+            prepare_season / "round_03" / "q1",
+        ]
+
+    def test_discover_sessions_with_glob_pattern(self, prepare_season: Path) -> None:
+        # When
+        sessions = discover_sessions(f"{prepare_season}/round_0[12]/*")
+        # Then
+        assert sessions == [prepare_season / "round_01" / "q1", prepare_season / "round_02" / "q1"]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_run_batch_report_collects_errors(self, prepare_season: Path, workers: int) -> None:
+        # Given
+        output = io.StringIO()
+        sessions = discover_sessions(prepare_season)
+        # When
+        summary = run_batch_report(sessions, output, BatchOptions(), workers=workers, chunksize=2)
+        records = {record["session"]: record for record in map(json.loads, output.getvalue().splitlines())}
+        # Then
+        assert summary.processed == len(sessions)
+        assert list(summary.failed) == [str(prepare_season / "round_03" / "q1")]
+        assert "InvalidFormatDataError" in summary.failed[str(prepare_season / "round_03" / "q1")]
+        first_session = records[str(prepare_season / "round_01" / "q1")]
+        assert first_session["status"] == "ok"
+        assert first_session["results"][0] == {
+            "position": 1,
+            "identifier": "FAM",
+            "name": "Fernando Alonso",
+            "car_model": "MCLAREN RENAULT",
+            "lap_time": "1:12.657",
+            "lap_count": 1,
+        }
+
+    def test_batch_report_command(
+        self, runner: CliRunner, prepare_season: Path, tmp_path: Path, caplog: LogCaptureFixture
+    ) -> None:
+        caplog.set_level(logging.INFO)
+        # Given
+        output_file = tmp_path / "season.jsonl"
+        # When
+        result = runner.invoke(
+            batch_report, ["--sessions", str(prepare_season), "--output", str(output_file), "--workers", "1"]
+        )
+        # Then
+        assert result.exit_code == 1
+        assert len(output_file.read_text().splitlines()) == len(discover_sessions(prepare_season))
+        assert "Batch report finished: 2 succeeded, 1 failed." in caplog.text
+
+    def test_batch_report_command_without_sessions(
+        self, runner: CliRunner, tmp_path: Path, caplog: LogCaptureFixture
+    ) -> None:
+        caplog.set_level(logging.ERROR)
+        # When
+        result = runner.invoke(batch_report, ["--sessions", str(tmp_path), "--output", str(tmp_path / "out.jsonl")])
+        # Then
+        assert result.exit_code == 1
+        assert f"No sessions found for: '{tmp_path}'." in caplog.text
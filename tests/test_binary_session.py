@@ -0,0 +1,238 @@
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+from click.testing import CliRunner
+
+from formula1_race_analysis import InvalidFormatDataError, InvalidRaceTimeError, MissedFileError, build_q1_report
+from formula1_race_analysis.batch_report import discover_sessions
+from formula1_race_analysis.binary_session import (
+    BINARY_SESSION_VERSION,
+    BinarySession,
+    convert_session,
+    find_binary_session,
+    source_fingerprints,
+)
+from formula1_race_analysis.config import TEXT_SESSION_FILES, FilePaths, LapTimeBackend
+from formula1_race_analysis.display import convert, generate_report
+from formula1_race_analysis.instrumentation import Metrics
+from formula1_race_analysis.session_cache import build_cached_q1_report
+from formula1_race_analysis.timestamps import EPOCH
+
+
+def append_invalid_start_line(data_dir: Path) -> None:
+    with Path.open(data_dir / FilePaths.START_LOG, "a") as start_log:
+        start_log.write("garbage\n")
+
+
+def remove_text_files(data_dir: Path) -> None:
+    for file_name in TEXT_SESSION_FILES:
+        (data_dir / file_name).unlink()
+
+
+class TestBinarySession:
+    @pytest.mark.parametrize("multi_lap", [False, True])
+    def test_build_q1_report_with_binary_session(self, prepare_multi_lap_data: Path, multi_lap: bool) -> None:
+        # Given
+        expected_report = build_q1_report(prepare_multi_lap_data, multi_lap=multi_lap)
+        convert_session(prepare_multi_lap_data)
+        remove_text_files(prepare_multi_lap_data)
+        # When
+        report = build_q1_report(prepare_multi_lap_data, multi_lap=multi_lap)
+        # Then
+        assert report == expected_report
+
+    def test_changed_text_file_outdates_binary_session(
+        self, prepare_correct_data: Path, caplog: LogCaptureFixture
+    ) -> None:
+        caplog.set_level(logging.WARNING)
+        # Given
+        convert_session(prepare_correct_data)
+        cached_report = build_cached_q1_report(prepare_correct_data)
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text(end_log.read_text().replace("KMH2018-05-24_12:04:04.396", "KMH2018-05-24_12:04:01.5"))
+        # When
+        report = build_q1_report(prepare_correct_data)
+        # Then
+        assert find_binary_session(prepare_correct_data) is None
+        assert "is older than the text files, run convert again." in caplog.text
+        assert report[1].format_lap_time() == "1:10.497"
+        assert build_cached_q1_report(prepare_correct_data) == report != cached_report
+
+    def test_strict_build_validates_lenient_conversion(self, prepare_correct_data: Path) -> None:
+        # Given
+        append_invalid_start_line(prepare_correct_data)
+        header = convert_session(prepare_correct_data, ignore_errors=True)
+        metrics = Metrics()
+        # When / Then
+        with pytest.raises(InvalidFormatDataError, match=re.escape("Error! Incorrect data format: 'garbage'")):
+            build_q1_report(prepare_correct_data)
+        build_q1_report(prepare_correct_data, ignore_errors=True, metrics=metrics)
+        assert header.ignore_errors
+        assert header.rejected_lines == 1
+        assert list(metrics.stage_seconds) == ["calculate_binary_lap_statistics"]
+
+    def test_rejects_out_lists_lines_dropped_by_conversion(
+        self, runner: CliRunner, prepare_correct_data: Path, tmp_path: Path
+    ) -> None:
+        # Given
+        append_invalid_start_line(prepare_correct_data)
+        convert_session(prepare_correct_data, ignore_errors=True)
+        rejects_file = tmp_path / "rejects.json"
+        # When
+        result = runner.invoke(
+            generate_report,
+            [
+                "--data_dir",
+                str(prepare_correct_data),
+                "--no-cache",
+                "--ignore_errors",
+                "--rejects-out",
+                str(rejects_file),
+            ],
+        )
+        # Then
+        assert result.exit_code == 0
+        assert json.loads(rejects_file.read_text())["total"] == 1
+
+    def test_binary_session_with_invalid_report_options(self, prepare_correct_data: Path) -> None:
+        # Given
+        convert_session(prepare_correct_data)
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape("The columnar backend does not support multi-lap sessions.")):
+            build_q1_report(prepare_correct_data, multi_lap=True, backend=LapTimeBackend.COLUMNAR)
+
+    def test_removed_text_file_keeps_binary_session(self, prepare_correct_data: Path) -> None:
+        # Given
+        convert_session(prepare_correct_data)
+        (prepare_correct_data / FilePaths.START_LOG).unlink()
+        expected_drivers = 3
+        # When
+        binary_session = find_binary_session(prepare_correct_data)
+        # Then
+        assert binary_session == prepare_correct_data / FilePaths.BINARY_SESSION
+        assert len(build_q1_report(prepare_correct_data)) == expected_drivers
+
+    def test_binary_session_records(self, prepare_correct_data: Path) -> None:
+        # Given
+        header = convert_session(prepare_correct_data)
+        expected_records = 3
+        expected_first_start = (datetime(2018, 5, 24, 12, 13, 4, 512000) - EPOCH) // datetime.resolution
+        # When
+        with BinarySession(prepare_correct_data / FilePaths.BINARY_SESSION) as session:
+            start_records = list(session.start_records())
+            end_records = list(session.end_records())
+            identifiers = session.identifiers
+            drivers = session.drivers
+        # Then
+        assert header.start_count == header.end_count == expected_records
+        assert session.sources == source_fingerprints(prepare_correct_data)
+        assert len(start_records) == len(end_records) == expected_records
+        assert start_records[0] == (expected_first_start, identifiers.index("FAM"))
+        assert [driver.identifier for driver in drivers] == identifiers
+        assert drivers[0].name == "Pierre Gasly"
+
+    def test_unmatched_identifiers_are_kept(self, prepare_correct_data: Path) -> None:
+        # Given
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text(end_log.read_text() + "NHR2018-05-24_12:04:02.979\n")
+        header = convert_session(prepare_correct_data)
+        metrics = Metrics()
+        expected_identifiers = 4
+        # When
+        report = build_q1_report(prepare_correct_data, metrics=metrics)
+        # Then
+        assert header.identifier_count == expected_identifiers
+        assert [data.driver.identifier for data in report] == ["PGS", "KMH", "FAM"]
+        assert metrics.counters["identifiers_without_start"] == 1
+        assert list(metrics.stage_seconds) == ["calculate_binary_lap_statistics"]
+
+    def test_binary_session_raises_invalid_race_time_error(self, prepare_correct_data: Path) -> None:
+        # Given
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text(end_log.read_text().replace("KMH2018-05-24_12:04:04.396", "KMH2018-05-24_12:01:04.396"))
+        convert_session(prepare_correct_data)
+        expected_laps = 2
+        # When / Then
+        with pytest.raises(InvalidRaceTimeError, match="Race time error for driver: 'KMH'"):
+            build_q1_report(prepare_correct_data)
+        assert len(build_q1_report(prepare_correct_data, ignore_errors=True)) == expected_laps
+
+    @pytest.mark.parametrize("content", [b"", b"F1Q1", b"F1Q0" + bytes(28)])
+    def test_invalid_binary_session(self, tmp_path: Path, content: bytes) -> None:
+        # Given
+        binary_session = tmp_path / FilePaths.BINARY_SESSION
+        binary_session.write_bytes(content)
+        # When / Then
+        with pytest.raises(
+            InvalidFormatDataError,
+            match=re.escape(f"Error! The file: {binary_session} is not a binary session of version "),
+        ):
+            BinarySession(binary_session)
+
+    def test_truncated_binary_session(self, prepare_correct_data: Path) -> None:
+        # Given
+        convert_session(prepare_correct_data)
+        binary_session = prepare_correct_data / FilePaths.BINARY_SESSION
+        binary_session.write_bytes(binary_session.read_bytes()[:-1])
+        # When / Then
+        with pytest.raises(InvalidFormatDataError, match=re.escape(f"of version {BINARY_SESSION_VERSION}.")):
+            build_q1_report(prepare_correct_data)
+
+    def test_missing_binary_session(self, tmp_path: Path) -> None:
+        # When / Then
+        with pytest.raises(MissedFileError):
+            BinarySession(tmp_path / FilePaths.BINARY_SESSION)
+
+    def test_convert_session_with_too_long_car_model(self, prepare_correct_data: Path) -> None:
+        # Given
+        abbreviations = prepare_correct_data / FilePaths.ABBREVIATIONS
+        abbreviations.write_text(abbreviations.read_text().replace("HAAS FERRARI", "HAAS " * 30 + "FERRARI"))
+        # When / Then
+        with pytest.raises(InvalidFormatDataError, match=re.escape("is longer than 124 bytes.")):
+            convert_session(prepare_correct_data)
+        assert not list(prepare_correct_data.glob("*.f1bin*"))
+
+    def test_build_cached_q1_report_with_binary_session(self, prepare_correct_data: Path) -> None:
+        # Given
+        convert_session(prepare_correct_data)
+        remove_text_files(prepare_correct_data)
+        report = build_cached_q1_report(prepare_correct_data, incremental=True)
+        metrics = Metrics()
+        # When
+        cached_report = build_cached_q1_report(prepare_correct_data, incremental=True, metrics=metrics)
+        # Then
+        assert cached_report == report
+        assert metrics.counters == {"cache_hits": 1}
+
+    def test_discover_sessions_with_binary_session(self, prepare_correct_data: Path) -> None:
+        # Given
+        convert_session(prepare_correct_data)
+        remove_text_files(prepare_correct_data)
+        # When / Then
+        assert discover_sessions(prepare_correct_data.parent) == [prepare_correct_data]
+
+    def test_convert_command(
+        self, runner: CliRunner, prepare_correct_data: Path, tmp_path: Path, caplog: LogCaptureFixture
+    ) -> None:
+        caplog.set_level(logging.INFO)
+        # Given
+        output = tmp_path / "converted.f1bin"
+        # When
+        result = runner.invoke(convert, ["--data_dir", str(prepare_correct_data), "--output", str(output)])
+        # Then
+        assert result.exit_code == 0
+        assert "3 drivers, 3 start and 3 end records, 0 invalid lines dropped." in caplog.text
+        with BinarySession(output) as session:
+            assert len(session.drivers) == len(session.identifiers)
+
+    def test_convert_command_with_invalid_session(self, runner: CliRunner, prepare_invalid_data: Path) -> None:
+        # When
+        result = runner.invoke(convert, ["--data_dir", str(prepare_invalid_data)])
+        # Then
+        assert result.exit_code == 1
+        assert not (prepare_invalid_data / FilePaths.BINARY_SESSION).exists()
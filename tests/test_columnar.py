@@ -0,0 +1,78 @@
+import re
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from formula1_race_analysis import InvalidRaceTimeError, build_q1_report
+from formula1_race_analysis.columnar import calculate_columnar_lap_times
+from formula1_race_analysis.config import FilePaths, LapTimeBackend
+from formula1_race_analysis.display import generate_report
+
+
+class TestColumnar:
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_calculate_columnar_lap_times(self, prepare_correct_data: Path, use_numpy: bool) -> None:
+        # Given
+        tmp_start_log = prepare_correct_data / FilePaths.START_LOG
+        tmp_end_log = prepare_correct_data / FilePaths.END_LOG
+        expected_result = {"FAM": 72_657_000_000, "KMH": 73_393_000_000, "PGS": 72_941_000_000}
+        # When
+        actual_result = calculate_columnar_lap_times(
+            tmp_start_log, tmp_end_log, ignore_errors=False, use_numpy=use_numpy
+        )
+        # Then
+        assert actual_result == expected_result
+
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_calculate_columnar_lap_times_keeps_last_line_and_skips_unmatched(
+        self, prepare_correct_data: Path, use_numpy: bool
+    ) -> None:
+        # Given
+        tmp_start_log = prepare_correct_data / FilePaths.START_LOG
+        tmp_end_log = prepare_correct_data / FilePaths.END_LOG
+        tmp_start_log.write_text("FAM2018-05-24_12:00:00.000\nFAM2018-5-24_12:13:4.5\n\n")
+        tmp_end_log.write_text("SVF2018-05-24_12:04:04.396\nFAM2018-05-24_12:14:17.169\n")
+        # When
+        actual_result = calculate_columnar_lap_times(
+            tmp_start_log, tmp_end_log, ignore_errors=False, use_numpy=use_numpy
+        )
+        # Then
+        assert actual_result == {"FAM": 72_669_000_000}
+
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_calculate_columnar_lap_times_with_invalid_race_time(
+        self, prepare_correct_data: Path, use_numpy: bool
+    ) -> None:
+        # Given
+        tmp_start_log = prepare_correct_data / FilePaths.START_LOG
+        tmp_end_log = prepare_correct_data / FilePaths.END_LOG
+        tmp_end_log.write_text("KMH2018-05-24_12:04:04.396\nPGS2018-05-24_12:00:00.000\nFAM2018-05-24_12:00:00.000\n")
+        # When / Then
+        with pytest.raises(InvalidRaceTimeError, match=re.escape("Race time error for driver: 'PGS'.")):
+            calculate_columnar_lap_times(tmp_start_log, tmp_end_log, ignore_errors=False, use_numpy=use_numpy)
+        assert calculate_columnar_lap_times(tmp_start_log, tmp_end_log, ignore_errors=True, use_numpy=use_numpy) == {
+            "KMH": 73_393_000_000
+        }
+
+    def test_build_q1_report_with_columnar_backend(self, prepare_correct_data: Path) -> None:
+        # When
+        actual_result = build_q1_report(prepare_correct_data, backend=LapTimeBackend.COLUMNAR)
+        # Then
+        assert actual_result == build_q1_report(prepare_correct_data)
+
+    def test_build_q1_report_with_columnar_backend_and_multi_lap(self, prepare_correct_data: Path) -> None:
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape("The columnar backend does not support multi-lap sessions.")):
+            build_q1_report(prepare_correct_data, multi_lap=True, backend=LapTimeBackend.COLUMNAR)
+
+    def test_generate_report_with_columnar_backend_and_multi_lap(
+        self, runner: CliRunner, prepare_correct_data: Path
+    ) -> None:
+        # When
+        result = runner.invoke(
+            generate_report, ["--data_dir", str(prepare_correct_data), "--multi_lap", "--backend", "columnar"]
+        )
+        # Then
+        assert result.exit_code != 0
+        assert "Option '--multi_lap' cannot be used with '--backend columnar'." in result.output
@@ -3,7 +3,14 @@ from pathlib import Path
 import pytest
 
 from formula1_race_analysis import build_q1_report
-from formula1_race_analysis.display import SortStrategy, display_race_report, filter_report, sort_report
+from formula1_race_analysis.display import (
+    SortStrategy,
+    display_race_report,
+    filter_report,
+    first_report_position,
+    sort_report,
+)
+from formula1_race_analysis.models import Driver, RaceResult
 
 
 class TestDisplayRaceReport:
@@ -37,3 +44,80 @@ class TestDisplayRaceReport:
         captured = capsys.readouterr()
         # Then
         assert captured.out == " 1. Pierre Gasly | SCUDERIA TORO ROSSO HONDA | 1:12.941\n"
+
+    @pytest.mark.parametrize(
+        ("sort_strategy", "limit", "slowest", "expected_identifiers"),
+        [
+            (SortStrategy.ASCENDING_ORDER, None, False, ["FAM", "PGS", "KMH"]),
+            (SortStrategy.DESCENDING_ORDER, None, False, ["KMH", "PGS", "FAM"]),
+            (SortStrategy.ASCENDING_ORDER, 2, False, ["FAM", "PGS"]),
+            (SortStrategy.DESCENDING_ORDER, 2, False, ["PGS", "FAM"]),
+            (SortStrategy.ASCENDING_ORDER, 2, True, ["PGS", "KMH"]),
+            (SortStrategy.DESCENDING_ORDER, 1, True, ["KMH"]),
+        ],
+    )
+    def test_sort_report_with_limit(
+        self,
+        prepare_correct_data: Path,
+        sort_strategy: SortStrategy,
+        limit: int | None,
+        slowest: bool,
+        expected_identifiers: list[str],
+    ) -> None:
+        # Given
+        database = build_q1_report(prepare_correct_data)
+        # When
+        sorted_database = sort_report(database, sort_strategy, limit, slowest=slowest)
+        # Then
+        assert [data.driver.identifier for data in sorted_database] == expected_identifiers
+
+    @pytest.mark.parametrize("sort_strategy", list(SortStrategy))
+    @pytest.mark.parametrize("limit", [1, 2, 3, 4])
+    def test_sort_report_keeps_tied_lap_times_in_order(self, sort_strategy: SortStrategy, limit: int) -> None:
+        # Given
+        report = [
+            RaceResult.from_microseconds(Driver(identifier, identifier, "TEAM"), lap_time_us)
+            for identifier, lap_time_us in [("AAA", 2), ("BBB", 1), ("CCC", 2), ("DDD", 2)]
+        ]
+        full_report = sort_report(report, sort_strategy)
+        expected_slowest = (
+            full_report[-limit:] if sort_strategy == SortStrategy.ASCENDING_ORDER else full_report[:limit]
+        )
+        expected_fastest = (
+            full_report[:limit] if sort_strategy == SortStrategy.ASCENDING_ORDER else full_report[-limit:]
+        )
+        # When
+        slowest = sort_report(report, sort_strategy, limit, slowest=True)
+        fastest = sort_report(report, sort_strategy, limit)
+        # Then
+        assert slowest == expected_slowest
+        assert [id(data) for data in slowest] == [id(data) for data in expected_slowest]
+        assert [id(data) for data in fastest] == [id(data) for data in expected_fastest]
+
+    @pytest.mark.parametrize(
+        ("sort_strategy", "slowest", "expected_position"),
+        [
+            (SortStrategy.ASCENDING_ORDER, False, 1),
+            (SortStrategy.ASCENDING_ORDER, True, 19),
+            (SortStrategy.DESCENDING_ORDER, False, 19),
+            (SortStrategy.DESCENDING_ORDER, True, 1),
+        ],
+    )
+    def test_first_report_position(self, sort_strategy: SortStrategy, slowest: bool, expected_position: int) -> None:
+        # Given / When
+        position = first_report_position(20, 2, sort_strategy, slowest=slowest)
+        # Then
+        assert position == expected_position
+
+    def test_display_race_report_with_knockout_position(
+        self,
+        prepare_correct_data: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        # Given
+        database = sort_report(build_q1_report(prepare_correct_data), SortStrategy.ASCENDING_ORDER)
+        # When
+        display_race_report(database, knockout_position=1)
+        actual_result = capsys.readouterr().out.splitlines()
+        # Then
+        assert actual_result[1] == "_" * 60
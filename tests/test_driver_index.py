@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pytest
+
+from formula1_race_analysis import build_q1_report
+from formula1_race_analysis.driver_index import DriverIndex
+
+
+class TestDriverIndex:
+    @pytest.mark.parametrize(
+        ("raw_request", "expected_identifiers"),
+        [
+            ("PGS", ["PGS"]),
+            ("kmh", ["KMH"]),
+            ("Pierre Gasly", ["PGS"]),
+            ("  pierre   GASLY ", ["PGS"]),
+            ("fern", ["FAM"]),
+            ("magn", ["KMH"]),
+            ("Pierre Gaslie", []),
+            ("", []),
+        ],
+    )
+    def test_lookup(self, prepare_correct_data: Path, raw_request: str, expected_identifiers: list[str]) -> None:
+        # Given
+        index = DriverIndex(build_q1_report(prepare_correct_data))
+        # When
+        actual_result = index.lookup(raw_request)
+        # Then
+        assert [data.driver.identifier for data in actual_result] == expected_identifiers
+
+    def test_lookup_with_prefix_matching_several_drivers(self, prepare_correct_data: Path) -> None:
+        # Given
+        report = build_q1_report(prepare_correct_data)
+        index = DriverIndex(report)
+        # When
+        actual_result = index.lookup("a")
+        # Then
+        assert actual_result == [report[2]]
+        assert index.lookup("") == []
+        assert [data.driver.identifier for data in index.lookup("g")] == ["PGS"]
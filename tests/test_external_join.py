@@ -0,0 +1,198 @@
+import re
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from formula1_race_analysis import InvalidRaceTimeError, build_q1_report
+from formula1_race_analysis.config import FilePaths, LapTimeBackend
+from formula1_race_analysis.display import generate_report
+from formula1_race_analysis.external_join import (
+    calculate_external_lap_statistics,
+    group_timestamps,
+    merge_join,
+    merge_sorted_runs,
+    spill_sorted_runs,
+)
+from formula1_race_analysis.instrumentation import Metrics
+
+
+class TestExternalJoin:
+    @pytest.mark.parametrize("run_size", [1, 2, 1000])
+    def test_build_q1_report_with_external_join(self, prepare_correct_data: Path, run_size: int) -> None:
+        # Given
+        start_log = prepare_correct_data / FilePaths.START_LOG
+        start_log.write_text("FAM2018-05-24_12:00:00.000\n" + start_log.read_text())
+        # When
+        report = build_q1_report(prepare_correct_data, external_join=True, run_size=run_size)
+        # Then
+        assert report == build_q1_report(prepare_correct_data)
+        assert report[2].format_lap_time() == "1:12.657"
+
+    def test_build_q1_report_with_external_join_and_multi_lap(self, prepare_multi_lap_data: Path) -> None:
+        # When
+        report = build_q1_report(prepare_multi_lap_data, multi_lap=True, external_join=True, run_size=2)
+        # Then
+        assert report == build_q1_report(prepare_multi_lap_data, multi_lap=True)
+
+    def test_merge_sorted_runs_keeps_file_order(self, tmp_path: Path) -> None:
+        # Given
+        identifiers = ["PGS", "KMH", "PGS", "FAM", "KMH", "PGS", "FAM"]
+        records = [
+            (identifier, timestamp, sequence)
+            for sequence, (identifier, timestamp) in enumerate(zip(identifiers, [3, 1, 1, 2, 2, 2, 1], strict=True))
+        ]
+        runs = spill_sorted_runs(records, tmp_path, run_size=2)
+        expected_merged_runs = 2
+        # When
+        merged_records = list(merge_sorted_runs(runs, tmp_path, fan_in=2))
+        # Then
+        assert merged_records == [
+            ("FAM", 2, 3),
+            ("FAM", 1, 6),
+            ("KMH", 1, 1),
+            ("KMH", 2, 4),
+            ("PGS", 3, 0),
+            ("PGS", 1, 2),
+            ("PGS", 2, 5),
+        ]
+        assert len(list(tmp_path.iterdir())) == expected_merged_runs
+
+    def test_group_timestamps(self) -> None:
+        # Given
+        records = [("FAM", 2, 3), ("FAM", 1, 6), ("KMH", 1, 1)]
+        # When
+        last_timestamps = [(identifier, list(group)) for identifier, group in group_timestamps(records, keep_all=False)]
+        all_timestamps = [(identifier, list(group)) for identifier, group in group_timestamps(records, keep_all=True)]
+        # Then
+        assert last_timestamps == [("FAM", [("FAM", 1, 3)]), ("KMH", [("KMH", 1, 1)])]
+        assert all_timestamps == [("FAM", [("FAM", 2, 3), ("FAM", 1, 6)]), ("KMH", [("KMH", 1, 1)])]
+
+    def test_merge_join_keeps_unmatched_identifiers(self) -> None:
+        # Given
+        start_groups = iter([("FAM", [("FAM", 1, 0)]), ("KMH", [("KMH", 2, 1)]), ("SVF", [("SVF", 3, 2)])])
+        end_groups = iter(
+            [("KMH", [("KMH", 5, 0)]), ("LHM", [("LHM", 6, 1)]), ("SVF", [("SVF", 7, 2)]), ("VBM", [("VBM", 8, 3)])]
+        )
+        # When
+        joined = list(merge_join(start_groups, end_groups))
+        # Then
+        assert joined == [
+            ("FAM", [("FAM", 1, 0)], None),
+            ("KMH", [("KMH", 2, 1)], [("KMH", 5, 0)]),
+            ("LHM", None, [("LHM", 6, 1)]),
+            ("SVF", [("SVF", 3, 2)], [("SVF", 7, 2)]),
+            ("VBM", None, [("VBM", 8, 3)]),
+        ]
+
+    @pytest.mark.parametrize("external_join", [False, True])
+    def test_unmatched_identifiers_are_counted(self, prepare_correct_data: Path, external_join: bool) -> None:
+        # Given
+        start_log = prepare_correct_data / FilePaths.START_LOG
+        start_log.write_text(start_log.read_text() + "SVF2018-05-24_12:02:58.917\n")
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text(end_log.read_text() + "NHR2018-05-24_12:04:02.979\nLHM2018-05-24_12:07:23.645\n")
+        metrics = Metrics()
+        expected_without_start = 2
+        # When
+        report = build_q1_report(prepare_correct_data, external_join=external_join, metrics=metrics)
+        # Then
+        assert [data.driver.identifier for data in report] == ["PGS", "KMH", "FAM"]
+        assert metrics.counters["identifiers_without_start"] == expected_without_start
+        assert metrics.counters["identifiers_without_end"] == 1
+
+    def test_spilled_runs_are_removed(self, prepare_correct_data: Path, tmp_path: Path) -> None:
+        # Given
+        spill_dir = tmp_path / "spill"
+        spill_dir.mkdir()
+        metrics = Metrics()
+        expected_runs = 6
+        # When
+        lap_statistics = calculate_external_lap_statistics(
+            prepare_correct_data / FilePaths.START_LOG,
+            prepare_correct_data / FilePaths.END_LOG,
+            ignore_errors=False,
+            run_size=1,
+            spill_dir=spill_dir,
+            metrics=metrics,
+        )
+        # Then
+        assert sorted(lap_statistics) == ["FAM", "KMH", "PGS"]
+        assert metrics.counters["runs_spilled"] == expected_runs
+        assert not list(spill_dir.iterdir())
+
+    def test_external_join_raises_invalid_race_time_error(self, prepare_correct_data: Path) -> None:
+        # Given
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text(end_log.read_text().replace("KMH2018-05-24_12:04:04.396", "KMH2018-05-24_12:01:04.396"))
+        expected_laps = 2
+        # When / Then
+        with pytest.raises(InvalidRaceTimeError, match="Race time error for driver: 'KMH'"):
+            build_q1_report(prepare_correct_data, external_join=True)
+        assert len(build_q1_report(prepare_correct_data, ignore_errors=True, external_join=True)) == expected_laps
+
+    @pytest.mark.parametrize("run_size", [1, 1000])
+    def test_external_join_raises_for_first_driver_of_end_log(self, prepare_correct_data: Path, run_size: int) -> None:
+        # Given
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text("PGS2018-05-24_12:06:36.586\nFAM2018-05-24_12:14:17.169\nKMH2018-05-24_12:01:04.396\n")
+        # When / Then
+        with pytest.raises(InvalidRaceTimeError, match="Race time error for driver: 'PGS'"):
+            build_q1_report(prepare_correct_data)
+        with pytest.raises(InvalidRaceTimeError, match="Race time error for driver: 'PGS'"):
+            build_q1_report(prepare_correct_data, external_join=True, run_size=run_size)
+
+    def test_external_join_with_multi_lap_raises_for_first_lap_of_end_log(self, prepare_multi_lap_data: Path) -> None:
+        # Given
+        end_log = prepare_multi_lap_data / FilePaths.END_LOG
+        end_log.write_text(
+            end_log.read_text()
+            .replace("PGS2018-05-24_12:01:15.000", "PGS2018-05-24_11:59:00.000")
+            .replace("KMH2018-05-24_12:01:45.500", "KMH2018-05-24_12:00:00.000")
+        )
+        # When / Then
+        with pytest.raises(InvalidRaceTimeError, match="Race time error for driver: 'PGS'"):
+            build_q1_report(prepare_multi_lap_data, multi_lap=True)
+        with pytest.raises(InvalidRaceTimeError, match="Race time error for driver: 'PGS'"):
+            build_q1_report(prepare_multi_lap_data, multi_lap=True, external_join=True, run_size=2)
+
+    def test_external_join_with_invalid_run_size(self, prepare_correct_data: Path) -> None:
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape("The run size must be positive, got 0.")):
+            build_q1_report(prepare_correct_data, external_join=True, run_size=0)
+
+    @pytest.mark.parametrize(
+        ("backend", "workers", "message"),
+        [
+            (LapTimeBackend.COLUMNAR, 1, "The columnar backend does not support external joins."),
+            (LapTimeBackend.PYTHON, 2, "External joins do not support parallel parsing."),
+        ],
+    )
+    def test_external_join_with_unsupported_options(
+        self, prepare_correct_data: Path, backend: LapTimeBackend, workers: int, message: str
+    ) -> None:
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape(message)):
+            build_q1_report(prepare_correct_data, backend=backend, workers=workers, external_join=True)
+
+    def test_generate_report_with_external_join(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # When
+        result = runner.invoke(
+            generate_report, ["--data_dir", str(prepare_correct_data), "--external-join", "--run-size", "2"]
+        )
+        # Then
+        assert result.exit_code == 0
+        assert result.output.index("Fernando Alonso") < result.output.index("Kevin Magnussen")
+
+    def test_generate_report_with_external_join_and_workers(
+        self, runner: CliRunner, prepare_correct_data: Path
+    ) -> None:
+        # When
+        result = runner.invoke(
+            generate_report, ["--data_dir", str(prepare_correct_data), "--external-join", "--workers", "2"]
+        )
+        # Then
+        assert result.exit_code != 0
+        assert "Option '--external-join' cannot be used with '--incremental', '--workers' or '--backend columnar'." in (
+            result.output
+        )
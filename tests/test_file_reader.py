@@ -0,0 +1,216 @@
+import bz2
+import gzip
+import lzma
+import re
+import threading
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from formula1_race_analysis import (
+    InvalidFormatDataError,
+    MissedFileError,
+    build_q1_report,
+    file_reader,
+    iter_file_lines,
+    read_file_content,
+)
+from formula1_race_analysis.config import TEXT_SESSION_FILES, FilePaths
+from formula1_race_analysis.file_reader import resolve_session_file
+from formula1_race_analysis.incremental import IncrementalSession
+from formula1_race_analysis.instrumentation import Metrics
+from formula1_race_analysis.q1_session_analyzer import parse_log_file
+from formula1_race_analysis.session_cache import build_cached_q1_report
+
+COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    ".gz": gzip.compress,
+    ".bz2": bz2.compress,
+    ".xz": lzma.compress,
+}
+
+
+def compress_session(data_dir: Path, suffix: str) -> None:
+    for file_name in TEXT_SESSION_FILES:
+        plain_file = data_dir / file_name
+        (data_dir / f"{file_name}{suffix}").write_bytes(COMPRESSORS[suffix](plain_file.read_bytes()))
+        plain_file.unlink()
+
+
+@pytest.fixture
+def small_decompressed_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(file_reader, "DECOMPRESSED_BLOCK_SIZE", 7)
+    monkeypatch.setattr(file_reader, "DECOMPRESSION_QUEUE_SIZE", 1)
+
+
+class TestFileReader:
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_iter_file_lines_matches_read_file_content(self, prepare_correct_data: Path, use_mmap: bool) -> None:
+        # Given
+        tmp_start_log = prepare_correct_data / "start.log"
+        # When
+        actual_result = list(iter_file_lines(tmp_start_log, use_mmap=use_mmap))
+        # Then
+        assert actual_result == read_file_content(tmp_start_log)
+
+    def test_iter_file_lines_with_mmap_normalizes_line_endings(self, tmp_path: Path) -> None:
+        # Given
+        tmp_file = tmp_path / "windows.log"
+        tmp_file.write_bytes(b"FAM2018-05-24_12:13:04.512\r\nKMH2018-05-24_12:02:51.003")
+        # When
+        actual_result = list(iter_file_lines(tmp_file, use_mmap=True))
+        # Then
+        assert actual_result == ["FAM2018-05-24_12:13:04.512\n", "KMH2018-05-24_12:02:51.003"]
+
+    def test_iter_file_lines_with_mmap_and_empty_file(self, tmp_path: Path) -> None:
+        # Given
+        tmp_file = tmp_path / "empty.log"
+        tmp_file.write_text("")
+        # When / Then
+        assert list(iter_file_lines(tmp_file, use_mmap=True)) == []
+
+    @pytest.mark.parametrize("use_mmap", [False, True])
+    def test_iter_file_lines_when_file_is_missing(self, tmp_path: Path, use_mmap: bool) -> None:
+        # Given
+        tmp_missing_log = tmp_path / "tmp_missing.log"
+        # When / Then
+        with pytest.raises(
+            MissedFileError,
+            match=re.escape(f"Error! The file path: {tmp_missing_log} is not found or cannot be opened."),
+        ):
+            iter_file_lines(tmp_missing_log, use_mmap=use_mmap)
+
+    def test_build_q1_report_with_mmap(self, prepare_correct_data: Path) -> None:
+        # When / Then
+        assert build_q1_report(prepare_correct_data, use_mmap=True) == build_q1_report(prepare_correct_data)
+
+    def test_parse_log_file_memory_does_not_grow_with_file_size(self, tmp_path: Path) -> None:
+        # Given
+        tmp_log = tmp_path / "start.log"
+        with Path.open(tmp_log, "w", encoding="utf-8") as log_file:
+            for index in range(20_000):
+                identifier = "ABC"[index % 3] * 3
+                log_file.write(f"{identifier}2018-05-24_12:{index // 600 % 60:02}:{index // 10 % 60:02}.000\n")
+        # When
+        tracemalloc.start()
+        timestamps = parse_log_file(tmp_log, ignore_errors=False)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # Then
+        assert set(timestamps) == {"AAA", "BBB", "CCC"}
+        assert peak_memory < tmp_log.stat().st_size // 4
+
+    @pytest.mark.parametrize("suffix", list(COMPRESSORS))
+    def test_build_q1_report_with_compressed_session(self, prepare_correct_data: Path, suffix: str) -> None:
+        # Given
+        expected_report = build_q1_report(prepare_correct_data)
+        compress_session(prepare_correct_data, suffix)
+        # When
+        report = build_q1_report(prepare_correct_data)
+        # Then
+        assert report == expected_report
+
+    @pytest.mark.usefixtures("small_decompressed_blocks")
+    @pytest.mark.parametrize("suffix", list(COMPRESSORS))
+    def test_iter_file_lines_decompresses_in_blocks(self, tmp_path: Path, suffix: str) -> None:
+        # Given
+        content = b"FAM2018-05-24_12:13:04.512\r\nKMH2018-05-24_12:02:51.003\nPGS2018-05-24_12:07:23.645"
+        tmp_file = tmp_path / f"start.log{suffix}"
+        tmp_file.write_bytes(COMPRESSORS[suffix](content))
+        # When
+        actual_result = list(iter_file_lines(tmp_file, use_mmap=True))
+        # Then
+        assert actual_result == [
+            "FAM2018-05-24_12:13:04.512\n",
+            "KMH2018-05-24_12:02:51.003\n",
+            "PGS2018-05-24_12:07:23.645",
+        ]
+
+    @pytest.mark.usefixtures("small_decompressed_blocks")
+    def test_closed_iterator_stops_decompression(self, tmp_path: Path) -> None:
+        # Given
+        tmp_file = tmp_path / "start.log.gz"
+        tmp_file.write_bytes(gzip.compress(b"FAM2018-05-24_12:13:04.512\n" * 100))
+        lines = iter_file_lines(tmp_file)
+        next(lines)
+        # When
+        lines.close()  # type: ignore[attr-defined]
+        # Then
+        for thread in threading.enumerate():
+            if thread.name == "decompress-start.log.gz":
+                thread.join(timeout=1)
+                assert not thread.is_alive()
+
+    def test_iter_file_lines_with_corrupted_compressed_file(self, tmp_path: Path) -> None:
+        # Given
+        tmp_file = tmp_path / "start.log.gz"
+        tmp_file.write_bytes(gzip.compress(b"FAM2018-05-24_12:13:04.512\n")[:-10])
+        # When / Then
+        with pytest.raises(
+            InvalidFormatDataError, match=re.escape(f"Error! The file: {tmp_file} cannot be decompressed")
+        ):
+            list(iter_file_lines(tmp_file))
+
+    @pytest.mark.parametrize("suffix", list(COMPRESSORS))
+    def test_iter_file_lines_with_corrupted_compressed_block(self, tmp_path: Path, suffix: str) -> None:
+        # Given
+        tmp_file = tmp_path / f"start.log{suffix}"
+        compressed = bytearray(COMPRESSORS[suffix](b"FAM2018-05-24_12:13:04.512\n" * 100))
+        compressed[10:20] = b"\xff" * 10
+        tmp_file.write_bytes(compressed)
+        # When / Then
+        with pytest.raises(
+            InvalidFormatDataError, match=re.escape(f"Error! The file: {tmp_file} cannot be decompressed")
+        ):
+            list(iter_file_lines(tmp_file))
+
+    def test_iter_file_lines_when_decompression_thread_stops(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        # Given
+        tmp_file = tmp_path / "start.log.gz"
+        tmp_file.write_bytes(gzip.compress(b"FAM2018-05-24_12:13:04.512\n"))
+        monkeypatch.setattr(file_reader._DecompressionPipeline, "_decompress", lambda *_: None)  # noqa: SLF001
+        # When / Then
+        with pytest.raises(InvalidFormatDataError, match=re.escape("the decompression thread stopped unexpectedly")):
+            list(iter_file_lines(tmp_file))
+
+    def test_resolve_session_file_prefers_plain_file(self, prepare_correct_data: Path) -> None:
+        # Given
+        start_log = prepare_correct_data / FilePaths.START_LOG
+        (prepare_correct_data / f"{FilePaths.START_LOG}.gz").write_bytes(gzip.compress(start_log.read_bytes()))
+        # When / Then
+        assert resolve_session_file(prepare_correct_data, FilePaths.START_LOG) == start_log
+        assert resolve_session_file(prepare_correct_data, "missing.log") == prepare_correct_data / "missing.log"
+
+    def test_build_q1_report_with_compressed_session_and_workers(self, prepare_correct_data: Path) -> None:
+        # Given
+        compress_session(prepare_correct_data, ".gz")
+        start_log = prepare_correct_data / f"{FilePaths.START_LOG}.gz"
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape(f"The compressed file: {start_log} cannot be split")):
+            build_q1_report(prepare_correct_data, workers=2)
+
+    def test_build_cached_q1_report_with_compressed_session(self, prepare_correct_data: Path) -> None:
+        # Given
+        compress_session(prepare_correct_data, ".xz")
+        report = build_cached_q1_report(prepare_correct_data)
+        metrics = Metrics()
+        # When
+        cached_report = build_cached_q1_report(prepare_correct_data, metrics=metrics)
+        # Then
+        assert cached_report == report
+        assert metrics.counters == {"cache_hits": 1}
+
+    def test_incremental_session_with_compressed_session(self, prepare_correct_data: Path) -> None:
+        # Given
+        expected_report = build_q1_report(prepare_correct_data)
+        compress_session(prepare_correct_data, ".bz2")
+        session = IncrementalSession(prepare_correct_data)
+        session.build()
+        # When
+        report = session.build()
+        # Then
+        assert report == expected_report
+        assert session.reuse.drivers_reused
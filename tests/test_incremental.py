@@ -0,0 +1,183 @@
+import logging
+import re
+from pathlib import Path
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+from click.testing import CliRunner
+
+from formula1_race_analysis import InvalidRaceTimeError, build_q1_report, incremental
+from formula1_race_analysis.config import FilePaths, LapTimeBackend
+from formula1_race_analysis.display import generate_report
+from formula1_race_analysis.incremental import IncrementalSession, ReuseSummary
+from formula1_race_analysis.rejections import RejectionReport
+from formula1_race_analysis.session_cache import build_cached_q1_report
+
+
+@pytest.fixture
+def one_line_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(incremental, "CHUNK_LINES", 1)
+
+
+class TestIncrementalSession:
+    @pytest.mark.parametrize("multi_lap", [False, True])
+    def test_first_build_matches_build_q1_report(self, prepare_multi_lap_data: Path, multi_lap: bool) -> None:
+        # Given
+        session = IncrementalSession(prepare_multi_lap_data, multi_lap=multi_lap)
+        # When
+        report = session.build()
+        # Then
+        assert report == build_q1_report(prepare_multi_lap_data, multi_lap=multi_lap)
+        assert not session.reuse.drivers_reused
+        assert session.reuse.chunks_reused == session.reuse.laps_reused == 0
+
+    def test_unchanged_session_is_reused(self, prepare_correct_data: Path) -> None:
+        # Given
+        session = IncrementalSession(prepare_correct_data)
+        first_report = session.build()
+        # When
+        second_report = session.build()
+        # Then
+        assert second_report == first_report
+        assert session.reuse == ReuseSummary(drivers_reused=True, chunks_reused=2, laps_reused=3)
+
+    @pytest.mark.usefixtures("one_line_chunks")
+    def test_changed_end_line_recomputes_one_lap(self, prepare_correct_data: Path) -> None:
+        # Given
+        session = IncrementalSession(prepare_correct_data)
+        session.build()
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text(end_log.read_text().replace("FAM2018-05-24_12:14:17.169", "FAM2018-05-24_12:14:18.5"))
+        # When
+        report = session.build()
+        # Then
+        assert report == build_q1_report(prepare_correct_data)
+        assert report[2].format_lap_time() == "1:13.988"
+        assert session.reuse == ReuseSummary(
+            drivers_reused=True, chunks_reused=5, chunks_parsed=1, laps_reused=2, laps_recomputed=1
+        )
+
+    def test_renamed_driver_reuses_logs(self, prepare_correct_data: Path) -> None:
+        # Given
+        session = IncrementalSession(prepare_correct_data)
+        session.build()
+        abbreviations = prepare_correct_data / FilePaths.ABBREVIATIONS
+        abbreviations.write_text(abbreviations.read_text().replace("Kevin Magnussen", "Kevin Magnusen"))
+        # When
+        report = session.build()
+        # Then
+        assert report[1].driver.name == "Kevin Magnusen"
+        assert session.reuse == ReuseSummary(chunks_reused=2, laps_reused=3)
+
+    @pytest.mark.usefixtures("one_line_chunks")
+    def test_removed_line_drops_lap(self, prepare_multi_lap_data: Path) -> None:
+        # Given
+        session = IncrementalSession(prepare_multi_lap_data, multi_lap=True)
+        session.build()
+        end_log = prepare_multi_lap_data / FilePaths.END_LOG
+        end_log.write_text(end_log.read_text().removesuffix("KMH2018-05-24_12:03:00.000\n"))
+        # When
+        report = session.build()
+        # Then
+        assert report == build_q1_report(prepare_multi_lap_data, multi_lap=True)
+        assert session.reuse == ReuseSummary(drivers_reused=True, chunks_reused=8, laps_reused=1, laps_recomputed=1)
+
+    def test_rejections_of_reused_parts_are_recorded(self, prepare_correct_data: Path) -> None:
+        # Given
+        start_log = prepare_correct_data / FilePaths.START_LOG
+        start_log.write_text(start_log.read_text() + "VBM\n")
+        abbreviations = prepare_correct_data / FilePaths.ABBREVIATIONS
+        abbreviations.write_text(abbreviations.read_text() + "Valtteri Bottas_MERCEDES\n")
+        session = IncrementalSession(prepare_correct_data, ignore_errors=True)
+        first_rejections = RejectionReport()
+        session.build(rejections=first_rejections)
+        second_rejections = RejectionReport()
+        # When
+        session.build(rejections=second_rejections)
+        # Then
+        assert session.reuse.drivers_reused
+        assert second_rejections.as_dict() == first_rejections.as_dict()
+        assert [rejection.line_number for rejection in second_rejections.rejections] == [4, 4]
+
+    @pytest.mark.parametrize("end_order", [("FAM", "KMH", "PGS"), ("PGS", "KMH", "FAM"), ("KMH", "PGS", "FAM")])
+    def test_invalid_race_time_names_first_driver_of_end_log(
+        self, prepare_correct_data: Path, end_order: tuple[str, ...]
+    ) -> None:
+        # Given
+        session = IncrementalSession(prepare_correct_data)
+        session.build()
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text("".join(f"{identifier}2018-05-24_12:00:00.000\n" for identifier in end_order))
+        # When / Then
+        with pytest.raises(InvalidRaceTimeError, match=f"Race time error for driver: '{end_order[0]}'"):
+            build_q1_report(prepare_correct_data)
+        with pytest.raises(InvalidRaceTimeError, match=f"Race time error for driver: '{end_order[0]}'"):
+            session.build()
+
+    def test_failed_build_keeps_previous_results(self, prepare_correct_data: Path) -> None:
+        # Given
+        session = IncrementalSession(prepare_correct_data)
+        report = session.build()
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        original_end_log = end_log.read_text()
+        end_log.write_text(original_end_log.replace("KMH2018-05-24_12:04:04.396", "KMH2018-05-24_12:01:04.396"))
+        with pytest.raises(InvalidRaceTimeError, match="Race time error for driver: 'KMH'"):
+            session.build()
+        end_log.write_text(original_end_log)
+        # When
+        rebuilt_report = session.build()
+        # Then
+        assert rebuilt_report == report
+        assert session.reuse.chunks_parsed == 0
+
+    def test_save_and_load(self, prepare_correct_data: Path, tmp_path: Path) -> None:
+        # Given
+        state_file = tmp_path / "session.q1state"
+        session = IncrementalSession(prepare_correct_data)
+        report = session.build()
+        session.save(state_file)
+        # When
+        loaded_session = IncrementalSession.load(state_file, prepare_correct_data)
+        other_options_session = IncrementalSession.load(state_file, prepare_correct_data, multi_lap=True)
+        missing_session = IncrementalSession.load(tmp_path / "missing.q1state", prepare_correct_data)
+        # Then
+        assert loaded_session.build() == report
+        assert loaded_session.reuse.laps_reused == len(report)
+        assert other_options_session.abbreviations_digest is None
+        assert missing_session.abbreviations_digest is None
+
+    @pytest.mark.usefixtures("one_line_chunks")
+    def test_build_cached_q1_report_incremental(self, prepare_correct_data: Path, caplog: LogCaptureFixture) -> None:
+        caplog.set_level(logging.INFO)
+        # Given
+        build_cached_q1_report(prepare_correct_data, incremental=True)
+        start_log = prepare_correct_data / FilePaths.START_LOG
+        start_log.write_text(start_log.read_text().replace("PGS2018-05-24_12:07:23.645", "PGS2018-05-24_12:07:24.645"))
+        # When
+        report = build_cached_q1_report(prepare_correct_data, incremental=True)
+        # Then
+        assert report == build_q1_report(prepare_correct_data)
+        assert "driver list reused, 5 of 6 log chunks reused, 2 of 3 laps reused." in caplog.text
+
+    def test_build_cached_q1_report_incremental_with_columnar_backend(self, prepare_correct_data: Path) -> None:
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape("The columnar backend does not support incremental builds.")):
+            build_cached_q1_report(prepare_correct_data, backend=LapTimeBackend.COLUMNAR, incremental=True)
+
+    def test_generate_report_incremental(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # When
+        result = runner.invoke(generate_report, ["--data_dir", str(prepare_correct_data), "--incremental"])
+        # Then
+        assert result.exit_code == 0
+        assert "Fernando Alonso" in result.output
+
+    def test_generate_report_incremental_without_cache(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # When
+        result = runner.invoke(
+            generate_report, ["--data_dir", str(prepare_correct_data), "--incremental", "--no-cache"]
+        )
+        # Then
+        assert result.exit_code != 0
+        assert "Option '--incremental' cannot be used with '--no-cache', '--workers' or '--backend columnar'." in (
+            result.output
+        )
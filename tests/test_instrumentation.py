@@ -0,0 +1,111 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+from click.testing import CliRunner
+
+from formula1_race_analysis import build_q1_report
+from formula1_race_analysis.config import FilePaths, LapTimeBackend
+from formula1_race_analysis.display import generate_report
+from formula1_race_analysis.instrumentation import DISABLED_METRICS, Metrics
+
+
+@pytest.fixture
+def prepare_data_with_rejected_lines(prepare_correct_data: Path) -> Path:
+    with Path.open(prepare_correct_data / FilePaths.ABBREVIATIONS, "a") as abbreviations_file:
+        abbreviations_file.write("SVF_Sebastian Vettel_FERRARI\n")
+    with Path.open(prepare_correct_data / FilePaths.START_LOG, "a") as start_log:
+        start_log.write("invalid line\nLHM2018-05-24_12:18:20.125\n")
+    with Path.open(prepare_correct_data / FilePaths.END_LOG, "a") as end_log:
+        end_log.write("LHM2018-05-24_12:19:32.585\n")
+    return prepare_correct_data
+
+
+class TestInstrumentation:
+    def test_metrics_accumulate_stages_and_counters(self) -> None:
+        # Given
+        metrics = Metrics()
+        expected_lines = 5
+        # When
+        for _ in range(2):
+            with metrics.stage("parse_log_file"):
+                metrics.increment("lines_read", 2)
+        metrics.increment("lines_read")
+        # Then
+        assert list(metrics.stage_seconds) == ["parse_log_file"]
+        assert metrics.counters == {"lines_read": expected_lines}
+
+    def test_disabled_metrics_record_nothing(self) -> None:
+        # When
+        with DISABLED_METRICS.stage("parse_log_file"):
+            DISABLED_METRICS.increment("lines_read")
+        DISABLED_METRICS.emit()
+        # Then
+        assert DISABLED_METRICS.stage_seconds == {}
+        assert DISABLED_METRICS.counters == {}
+
+    @pytest.mark.parametrize("backend", list(LapTimeBackend))
+    def test_build_q1_report_counts_lines_and_drivers(
+        self, prepare_data_with_rejected_lines: Path, backend: LapTimeBackend
+    ) -> None:
+        # Given
+        metrics = Metrics()
+        # When
+        build_q1_report(prepare_data_with_rejected_lines, ignore_errors=True, backend=backend, metrics=metrics)
+        # Then
+        assert metrics.counters == {
+            "lines_read": 13,
+            "lines_parsed": 12,
+            "lines_rejected": 1,
+            "drivers_matched": 3,
+            "drivers_unmatched": 1,
+            "identifiers_unmatched": 1,
+        }
+        assert list(metrics.stage_seconds) == ["create_driver_list", "parse_log_file", "calculate_lap_time"]
+
+    def test_build_q1_report_with_multi_lap_counts_lines(self, prepare_multi_lap_data: Path) -> None:
+        # Given
+        metrics = Metrics()
+        expected_lines = 11
+        # When
+        build_q1_report(prepare_multi_lap_data, multi_lap=True, metrics=metrics)
+        # Then
+        assert metrics.counters["lines_read"] == expected_lines
+        assert "calculate_lap_statistics" in metrics.stage_seconds
+
+    def test_generate_report_with_metrics_out(
+        self, runner: CliRunner, prepare_correct_data: Path, tmp_path: Path, caplog: LogCaptureFixture
+    ) -> None:
+        caplog.set_level(logging.INFO)
+        # Given
+        metrics_file = tmp_path / "metrics.json"
+        arguments = ["--data_dir", str(prepare_correct_data), "--driver", "FAM", "--metrics-out", str(metrics_file)]
+        # When
+        result = runner.invoke(generate_report, arguments)
+        metrics = json.loads(metrics_file.read_text())
+        # Then
+        assert result.exit_code == 0
+        assert "report_metrics" in caplog.text
+        assert list(metrics["stages"]) == [
+            "load_cached_report",
+            "create_driver_list",
+            "parse_log_file",
+            "calculate_lap_time",
+            "filter_report",
+            "display_race_report",
+        ]
+        assert metrics["counters"]["cache_misses"] == 1
+        assert metrics["counters"]["lines_rejected"] == 0
+
+    def test_generate_report_with_follow_and_metrics(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # When
+        result = runner.invoke(generate_report, ["--data_dir", str(prepare_correct_data), "--follow", "--metrics"])
+        # Then
+        assert result.exit_code != 0
+        assert (
+            "Option '--follow' cannot be used with '--driver', '--backend columnar', '--workers', '--external-join', "
+            "'--no-cache', '--cache-dir', '--incremental', '--metrics', '--metrics-out', '--rejects-out', "
+            "'--format' or '--output'." in result.output
+        )
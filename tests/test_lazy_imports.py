@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+import pytest
+
+import formula1_race_analysis
+
+HEAVY_MODULES = ("pydantic", "structlog", "numpy")
+# Cumulative import times in microseconds, well above the measured times to absorb slow machines
+# and well below the times measured with the eager imports (about 330 ms and 480 ms).
+IMPORT_TIME_BUDGETS = {
+    "formula1_race_analysis": 150_000,
+    "f1_racing_results": 300_000,
+}
+
+
+def measure_import(module: str) -> tuple[int, list[str]]:
+    script = f"import sys, {module}; print(' '.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script], capture_output=True, text=True, check=True
+    )
+    cumulative_time = next(
+        int(line.split("|")[1])
+        for line in reversed(completed.stderr.splitlines())
+        if line.startswith("import time:") and line.split("|")[2].strip() == module
+    )
+    return cumulative_time, completed.stdout.split()
+
+
+class TestLazyImports:
+    @pytest.mark.parametrize(("module", "budget"), IMPORT_TIME_BUDGETS.items())
+    def test_import_stays_within_budget(self, module: str, budget: int) -> None:
+        # When
+        cumulative_time, loaded_heavy_modules = measure_import(module)
+        # Then
+        assert loaded_heavy_modules == []
+        assert cumulative_time < budget
+
+    def test_public_names_are_loaded_on_access(self) -> None:
+        # When / Then
+        assert formula1_race_analysis.build_q1_report.__module__ == "formula1_race_analysis.q1_session_analyzer"
+        assert "build_q1_report" in dir(formula1_race_analysis)
+        with pytest.raises(AttributeError, match="has no attribute 'missing_name'"):
+            _ = formula1_race_analysis.missing_name
@@ -0,0 +1,178 @@
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from formula1_race_analysis.config import FilePaths
+from formula1_race_analysis.display import generate_report
+from formula1_race_analysis.live_session import LiveLeaderboard, LiveSession, LogTail, follow_session
+from formula1_race_analysis.models import RaceResult
+
+
+def append_line(filepath: Path, line: str) -> None:
+    with Path.open(filepath, "a", encoding="utf-8") as log_file:
+        log_file.write(line)
+
+
+@pytest.fixture
+def prepare_live_data(prepare_correct_data: Path) -> Path:
+    (prepare_correct_data / FilePaths.START_LOG).write_text("")
+    (prepare_correct_data / FilePaths.END_LOG).write_text("")
+    return prepare_correct_data
+
+
+class TestLogTail:
+    def test_read_new_lines_keeps_partial_line(self, tmp_path: Path) -> None:
+        # Given
+        tmp_log = tmp_path / "start.log"
+        tail = LogTail(tmp_log)
+        # When / Then
+        assert tail.read_new_lines() == []
+        tmp_log.write_text("FAM2018-05-24_12:13:04.512\nKMH2018-05-24")
+        assert tail.read_new_lines() == ["FAM2018-05-24_12:13:04.512\n"]
+        append_line(tmp_log, "_12:02:51.003\n")
+        assert tail.read_new_lines() == ["KMH2018-05-24_12:02:51.003\n"]
+        assert tail.read_new_lines() == []
+
+    def test_read_new_lines_after_truncation(self, tmp_path: Path) -> None:
+        # Given
+        tmp_log = tmp_path / "start.log"
+        tmp_log.write_text("FAM2018-05-24_12:13:04.512\nKMH2018-05-24_12:02:51.003\n")
+        tail = LogTail(tmp_log)
+        tail.read_new_lines()
+        # When
+        tmp_log.write_text("PGS2018-05-24_12:07:23.645\n")
+        # Then
+        assert tail.read_new_lines() == ["PGS2018-05-24_12:07:23.645\n"]
+
+    def test_read_new_lines_with_crlf_line_endings(self, tmp_path: Path) -> None:
+        # Given
+        tmp_log = tmp_path / "start.log"
+        tmp_log.write_bytes(b"FAM2018-05-24_12:13:04.512\r\nKMH2018-05-24_12:02:51.003\r")
+        tail = LogTail(tmp_log)
+        # When / Then
+        assert tail.read_new_lines() == ["FAM2018-05-24_12:13:04.512\n"]
+        append_line(tmp_log, "\n")
+        assert tail.read_new_lines() == ["KMH2018-05-24_12:02:51.003\n"]
+
+
+class TestLiveLeaderboard:
+    def test_update_reports_position_and_lap_time_changes(self) -> None:
+        # Given
+        leaderboard = LiveLeaderboard()
+        # When / Then
+        assert leaderboard.update("PGS", timedelta(seconds=73))
+        assert leaderboard.update("FAM", timedelta(seconds=74))
+        assert not leaderboard.update("FAM", timedelta(seconds=74))
+        assert leaderboard.update("FAM", timedelta(seconds=75))
+        assert leaderboard.update("FAM", timedelta(seconds=72))
+        assert [identifier for _, identifier in leaderboard.ranking()] == ["FAM", "PGS"]
+
+
+class TestLiveSession:
+    def test_poll_updates_lap_times_incrementally(self, prepare_live_data: Path) -> None:
+        # Given
+        session = LiveSession(prepare_live_data)
+        tmp_start_log = prepare_live_data / FilePaths.START_LOG
+        tmp_end_log = prepare_live_data / FilePaths.END_LOG
+        # When / Then
+        append_line(
+            tmp_start_log, "PGS2018-05-24_12:07:23.645\nKMH2018-05-24_12:02:51.003\nSVF2018-05-24_12:02:51.003\n"
+        )
+        assert not session.poll()
+        append_line(tmp_end_log, "PGS2018-05-24_12:08:36.586\ninvalid\n")
+        assert session.poll()
+        append_line(tmp_end_log, "KMH2018-05-24_12:04:04.396\n")
+        assert session.poll()
+        append_line(tmp_start_log, "KMH2018-05-24_12:05:00.000\n")
+        assert not session.poll()
+        append_line(tmp_end_log, "KMH2018-05-24_12:06:12.000\n")
+        assert session.poll()
+        assert [(data.driver.identifier, data.format_lap_time()) for data in session.report()] == [
+            ("KMH", "1:12.000"),
+            ("PGS", "1:12.941"),
+        ]
+
+    def test_poll_with_multi_lap(self, prepare_live_data: Path) -> None:
+        # Given
+        expected_lap_count = 2
+        session = LiveSession(prepare_live_data, multi_lap=True)
+        tmp_start_log = prepare_live_data / FilePaths.START_LOG
+        tmp_end_log = prepare_live_data / FilePaths.END_LOG
+        # When
+        append_line(tmp_start_log, "PGS2018-05-24_12:00:00.000\nPGS2018-05-24_12:01:15.000\n")
+        append_line(tmp_end_log, "PGS2018-05-24_12:01:15.000\nPGS2018-05-24_12:02:28.000\n")
+        session.poll()
+        report = session.report()
+        # Then
+        assert report[0].lap_count == expected_lap_count
+        assert report[0].lap_time == timedelta(seconds=73)
+
+    def test_follow_session_with_files_appended_during_the_test(self, prepare_live_data: Path) -> None:
+        # Given
+        session = LiveSession(prepare_live_data)
+        stop_event = threading.Event()
+        redraws: list[list[RaceResult]] = []
+        laps = [
+            ("PGS2018-05-24_12:07:23.645\n", "PGS2018-05-24_12:08:36.586\n"),
+            ("FAM2018-05-24_12:13:04.512\n", "FAM2018-05-24_12:14:17.169\n"),
+        ]
+
+        def on_change(report: list[RaceResult]) -> None:
+            redraws.append(report)
+            if len(redraws) == len(laps):
+                stop_event.set()
+
+        follower = threading.Thread(
+            target=follow_session, args=(session, on_change), kwargs={"poll_interval": 0.01, "stop_event": stop_event}
+        )
+        # When
+        follower.start()
+        for start_line, end_line in laps:
+            append_line(prepare_live_data / FilePaths.START_LOG, start_line)
+            append_line(prepare_live_data / FilePaths.END_LOG, end_line)
+            stop_event.wait(0.1)
+        follower.join(timeout=5)
+        # Then
+        assert not follower.is_alive()
+        assert [data.driver.identifier for data in redraws[-1]] == ["FAM", "PGS"]
+
+    def test_generate_report_with_follow(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # Given
+        arguments = ["--data_dir", str(prepare_correct_data), "--follow", "--max_polls", "1", "--poll_interval", "0"]
+        # When
+        result = runner.invoke(generate_report, arguments)
+        # Then
+        assert result.exit_code == 0
+        assert " 1. Fernando Alonso | MCLAREN RENAULT           | 1:12.657" in result.output
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            ["--driver", "FAM"],
+            ["--backend", "columnar"],
+            ["--workers", "2"],
+            ["--external-join"],
+            ["--no-cache"],
+            ["--cache-dir", "cache"],
+            ["--incremental"],
+        ],
+    )
+    def test_generate_report_with_follow_and_unsupported_options(
+        self, runner: CliRunner, prepare_correct_data: Path, options: list[str]
+    ) -> None:
+        # When
+        result = runner.invoke(generate_report, ["--data_dir", str(prepare_correct_data), "--follow", *options])
+        # Then
+        assert result.exit_code != 0
+        assert "Option '--follow' cannot be used with '--driver', '--backend columnar'" in result.output
+
+    def test_generate_report_with_follow_and_invalid_data(self, runner: CliRunner, prepare_invalid_data: Path) -> None:
+        # When
+        result = runner.invoke(
+            generate_report, ["--data_dir", str(prepare_invalid_data), "--follow", "--max_polls", "1"]
+        )
+        # Then
+        assert result.exit_code == 1
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from formula1_race_analysis import LogEntry
+from formula1_race_analysis.log_parser import classify_log_line
+from formula1_race_analysis.rejections import RejectionReason
+
+
+class TestLogParser:
+    @pytest.mark.parametrize(
+        "line",
+        [
+            "SVF2018-05-24_12:02:58.917\n",
+            "nhr2018-05-24_12:02:49.914",
+            "KRF2018-12-31_23:59:59.999\n",
+        ],
+    )
+    def test_classify_log_line_matches_pydantic_path(self, line: str) -> None:
+        # Given
+        entry = LogEntry.model_validate(line)
+        # When
+        actual_result = classify_log_line(line)
+        # Then
+        assert actual_result == {"identifier": entry.identifier, "timestamp": entry.timestamp}
+
+    def test_classify_log_line_falls_back_for_non_fixed_width_line(self) -> None:
+        # Given
+        given_line = "VBM2018-5-24_1:2:3.9\n"
+        # When
+        actual_result = classify_log_line(given_line)
+        # Then
+        assert actual_result == {"identifier": "VBM", "timestamp": datetime(2018, 5, 24, 1, 2, 3, 900000)}
+
+    @pytest.mark.parametrize(
+        ("line", "expected_reason"),
+        [
+            ("\n", RejectionReason.MISSING_TIMESTAMP),
+            ("VBM\n", RejectionReason.MISSING_TIMESTAMP),
+            ("2018-05-24_12:02:58.917\n", RejectionReason.INVALID_TIMESTAMP),
+            ("VBM2018-02-30_12:02:58.917\n", RejectionReason.INVALID_TIMESTAMP),
+            ("VBM2018-05-24_12:02:58.91٢\n", RejectionReason.INVALID_TIMESTAMP),
+            ("VBM2018-05-24 12:02:58.917\n", RejectionReason.INVALID_TIMESTAMP),
+        ],
+    )
+    def test_classify_log_line_with_invalid_data(self, line: str, expected_reason: RejectionReason) -> None:
+        # When
+        actual_result = classify_log_line(line)
+        # Then
+        assert actual_result == expected_reason
+        with pytest.raises(ValidationError):
+            LogEntry.model_validate(line)
@@ -1,3 +1,5 @@
+import copy
+from dataclasses import FrozenInstanceError
 from datetime import timedelta
 
 import pytest
@@ -14,3 +16,47 @@ class TestModels:
         )
         # Then
         assert result.format_lap_time() == "1:13.265"
+
+    def test_race_result_stores_lap_times_as_microseconds(self) -> None:
+        # Given
+        driver = Driver(identifier="MES", name="Marcus Ericsson", car_model="SAUBER FERRARI")
+        expected_lap_time_us = 73_265_000
+        # When
+        result = RaceResult(driver, timedelta(seconds=73, microseconds=265000), 2, timedelta(seconds=74))
+        # Then
+        assert result.lap_time_us == expected_lap_time_us
+        assert result.mean_lap_time == timedelta(seconds=74)
+        assert result == RaceResult.from_microseconds(driver, expected_lap_time_us, 2, 74_000_000)
+        assert not hasattr(result, "__dict__")
+        assert repr(result).startswith("RaceResult(driver=Driver(identifier='MES'")
+
+    def test_lap_time_setter_keeps_microseconds(self) -> None:
+        # Given
+        result = RaceResult.from_microseconds(Driver("MES", "Marcus Ericsson", "SAUBER FERRARI"), 1)
+        # When
+        result.lap_time = timedelta(minutes=1, seconds=4, microseconds=415000)
+        result.mean_lap_time = None
+        # Then
+        assert result.format_lap_time() == "1:04.415"
+        assert result.mean_lap_time is None
+
+    def test_copy(self) -> None:
+        # Given
+        result = RaceResult.from_microseconds(Driver("MES", "Marcus Ericsson", "SAUBER FERRARI"), 1, 2, 3)
+        # When
+        result_copy = copy.copy(result)
+        result_copy.lap_count = 1
+        # Then
+        assert result == RaceResult.from_microseconds(Driver("MES", "Marcus Ericsson", "SAUBER FERRARI"), 1, 2, 3)
+        assert result_copy.driver is result.driver
+
+    def test_driver_is_frozen_with_interned_strings(self) -> None:
+        # Given
+        car_model = "sauber ferrari".upper()
+        # When
+        driver = Driver(identifier="MES", name="Marcus Ericsson", car_model=car_model)
+        other_driver = Driver(identifier="CLS", name="Charles Leclerc", car_model="SAUBER FERRARI")
+        # Then
+        assert driver.car_model is other_driver.car_model
+        with pytest.raises(FrozenInstanceError):
+            driver.name = "Marcus"  # type: ignore[misc]
@@ -0,0 +1,143 @@
+import gzip
+import re
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from formula1_race_analysis import InvalidFormatDataError, InvalidRaceTimeError, MissedFileError, build_q1_report
+from formula1_race_analysis.config import FilePaths, LapTimeBackend
+from formula1_race_analysis.display import generate_report
+from formula1_race_analysis.instrumentation import Metrics
+from formula1_race_analysis.parallel_parser import ByteRange, calculate_parallel_lap_statistics, split_byte_ranges
+from formula1_race_analysis.rejections import RejectionReport
+
+SMALL_CHUNK_SIZE = 30
+
+
+class TestParallelParser:
+    @pytest.mark.parametrize("chunk_size", [1, SMALL_CHUNK_SIZE, 1024])
+    def test_split_byte_ranges_ends_after_newlines(self, prepare_correct_data: Path, chunk_size: int) -> None:
+        # Given
+        start_log = prepare_correct_data / FilePaths.START_LOG
+        content = start_log.read_bytes()
+        # When
+        byte_ranges = split_byte_ranges(start_log, chunk_size)
+        # Then
+        assert b"".join(content[byte_range.start : byte_range.end] for byte_range in byte_ranges) == content
+        assert all(content[byte_range.end - 1 : byte_range.end] == b"\n" for byte_range in byte_ranges)
+
+    def test_split_byte_ranges_without_trailing_newline(self, tmp_path: Path) -> None:
+        # Given
+        log_file = tmp_path / FilePaths.START_LOG
+        log_file.write_bytes(b"SVF2018-05-24_12:02:58.917\nNHR2018-05-24_12:02:49.914")
+        # When
+        byte_ranges = split_byte_ranges(log_file, chunk_size=20)
+        # Then
+        assert byte_ranges == [ByteRange(log_file, 0, 27), ByteRange(log_file, 27, 53)]
+
+    def test_split_byte_ranges_with_missing_file(self, tmp_path: Path) -> None:
+        # When / Then
+        with pytest.raises(MissedFileError):
+            split_byte_ranges(tmp_path / FilePaths.START_LOG)
+
+    def test_split_byte_ranges_with_invalid_chunk_size(self, prepare_correct_data: Path) -> None:
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape("The chunk size must be positive, got 0.")):
+            split_byte_ranges(prepare_correct_data / FilePaths.START_LOG, 0)
+
+    def test_build_q1_report_with_workers_keeps_last_timestamp(self, prepare_correct_data: Path) -> None:
+        # Given
+        start_log = prepare_correct_data / FilePaths.START_LOG
+        start_log.write_text("FAM2018-05-24_12:00:00.000\r\n" + start_log.read_text().replace("\n", "\r\n"))
+        # When
+        report = build_q1_report(prepare_correct_data, workers=2, chunk_size=SMALL_CHUNK_SIZE)
+        # Then
+        assert report == build_q1_report(prepare_correct_data)
+        assert report[2].format_lap_time() == "1:12.657"
+
+    def test_build_q1_report_with_workers_and_multi_lap(self, prepare_multi_lap_data: Path) -> None:
+        # When
+        report = build_q1_report(prepare_multi_lap_data, multi_lap=True, workers=2, chunk_size=SMALL_CHUNK_SIZE)
+        # Then
+        assert report == build_q1_report(prepare_multi_lap_data, multi_lap=True)
+
+    @pytest.mark.parametrize("end_order", [("FAM", "KMH", "PGS"), ("PGS", "KMH", "FAM"), ("KMH", "PGS", "FAM")])
+    def test_invalid_race_time_names_first_driver_of_end_log(
+        self, prepare_correct_data: Path, end_order: tuple[str, ...]
+    ) -> None:
+        # Given
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text("".join(f"{identifier}2018-05-24_12:00:00.000\n" for identifier in end_order))
+        # When / Then
+        with pytest.raises(InvalidRaceTimeError, match=f"Race time error for driver: '{end_order[0]}'"):
+            build_q1_report(prepare_correct_data, workers=2, chunk_size=SMALL_CHUNK_SIZE)
+
+    def test_build_q1_report_with_workers_and_columnar_backend(self, prepare_correct_data: Path) -> None:
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape("The columnar backend does not support parallel parsing.")):
+            build_q1_report(prepare_correct_data, backend=LapTimeBackend.COLUMNAR, workers=2)
+
+    def test_rejected_lines_are_numbered_across_ranges(self, prepare_correct_data: Path) -> None:
+        # Given
+        start_log = prepare_correct_data / FilePaths.START_LOG
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        start_log.write_text(start_log.read_text() + "\nVBM\n" + "SVF2018-05-24_12:02:58.917\n" + "LHM2018-05-24_\n")
+        metrics = Metrics()
+        rejections = RejectionReport()
+        expected_lines_read = 10
+        # When
+        lap_statistics = calculate_parallel_lap_statistics(
+            start_log, end_log, ignore_errors=True, chunk_size=SMALL_CHUNK_SIZE, metrics=metrics, rejections=rejections
+        )
+        # Then
+        assert sorted(lap_statistics) == ["FAM", "KMH", "PGS"]
+        assert [(rejection.line_number, rejection.reason) for rejection in rejections.rejections] == [
+            (5, "missing_timestamp"),
+            (7, "invalid_timestamp"),
+        ]
+        assert metrics.counters["lines_read"] == expected_lines_read
+
+    def test_first_rejected_line_is_raised(self, prepare_correct_data: Path) -> None:
+        # Given
+        start_log = prepare_correct_data / FilePaths.START_LOG
+        start_log.write_text(start_log.read_text() + "VBM\nLHM2018-05-24_\n")
+        # When / Then
+        with pytest.raises(InvalidFormatDataError, match=re.escape("line 4: missing_timestamp")):
+            calculate_parallel_lap_statistics(
+                start_log, prepare_correct_data / FilePaths.END_LOG, ignore_errors=False, chunk_size=SMALL_CHUNK_SIZE
+            )
+
+    def test_generate_report_with_workers(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # When
+        result = runner.invoke(
+            generate_report,
+            ["--data_dir", str(prepare_correct_data), "--no-cache", "--workers", "2", "--chunk-size", "64"],
+        )
+        # Then
+        assert result.exit_code == 0
+        assert result.output.index("Fernando Alonso") < result.output.index("Kevin Magnussen")
+
+    def test_generate_report_with_workers_and_columnar_backend(
+        self, runner: CliRunner, prepare_correct_data: Path
+    ) -> None:
+        # When
+        result = runner.invoke(
+            generate_report, ["--data_dir", str(prepare_correct_data), "--workers", "2", "--backend", "columnar"]
+        )
+        # Then
+        assert result.exit_code != 0
+        assert "Option '--workers' cannot be used with '--backend columnar'." in result.output
+
+    def test_generate_report_with_workers_and_compressed_logs(
+        self, runner: CliRunner, prepare_correct_data: Path
+    ) -> None:
+        # Given
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.with_name(f"{FilePaths.END_LOG}.gz").write_bytes(gzip.compress(end_log.read_bytes()))
+        end_log.unlink()
+        # When
+        result = runner.invoke(generate_report, ["--data_dir", str(prepare_correct_data), "--workers", "2"])
+        # Then
+        assert result.exit_code != 0
+        assert "Option '--workers' cannot be used with compressed logs." in result.output
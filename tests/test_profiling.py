@@ -0,0 +1,115 @@
+import cProfile
+import os
+import pstats
+import shutil
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from formula1_race_analysis import build_q1_report
+from formula1_race_analysis.display import batch_report, generate_report
+from formula1_race_analysis.profiling import PROFILE_WORKERS_ENV, PipelineProfiler, package_hot_functions
+
+
+class TestProfiling:
+    def test_pipeline_profiler_writes_stats_and_collapsed_stacks(
+        self, prepare_correct_data: Path, tmp_path: Path
+    ) -> None:
+        # Given
+        output_prefix = tmp_path / "profiles" / "run"
+        # When
+        with PipelineProfiler(output_prefix, trace_memory=True, top=3) as profiler:
+            build_q1_report(prepare_correct_data)
+        # Then
+        assert pstats.Stats(str(tmp_path / "profiles" / "run.prof")).total_calls > 0  # type: ignore[attr-defined]
+        for collapsed_line in (tmp_path / "profiles" / "run.collapsed").read_text().splitlines():
+            stack, count = collapsed_line.rsplit(" ", 1)
+            assert stack
+            assert int(count) > 0
+        assert (tmp_path / "profiles" / "run.memory.txt").read_text().startswith("Peak traced memory: ")
+        assert profiler.summary[0].split() == ["own", "time", "total", "time", "calls", "function"]
+        assert any("formula1_race_analysis.q1_session_analyzer:" in line for line in profiler.summary)
+        assert profiler.summary[-1].startswith("Peak traced memory: ")
+
+    def test_package_hot_functions_ignores_other_modules(self, prepare_correct_data: Path) -> None:
+        # Given
+        profiler = cProfile.Profile()
+        expected_lines = 3
+        # When
+        profiler.enable()
+        build_q1_report(prepare_correct_data)
+        sorted(range(100))
+        profiler.disable()
+        summary = package_hot_functions(profiler, top=expected_lines - 1)
+        # Then
+        assert len(summary) == expected_lines
+        assert all(" formula1_race_analysis." in line for line in summary[1:])
+
+    def test_generate_report_with_profile(self, runner: CliRunner, prepare_correct_data: Path, tmp_path: Path) -> None:
+        # Given
+        output_prefix = tmp_path / "report"
+        arguments = ["--data_dir", str(prepare_correct_data), "--no-cache", "--profile", str(output_prefix)]
+        # When
+        result = runner.invoke(generate_report, arguments)
+        # Then
+        assert result.exit_code == 0
+        assert " 1. Fernando Alonso | MCLAREN RENAULT           | 1:12.657" in result.output
+        assert f"Profile written to '{output_prefix}.prof'" in result.output
+        assert (tmp_path / "report.collapsed").exists()
+
+    def test_batch_report_with_profile(self, runner: CliRunner, prepare_correct_data: Path, tmp_path: Path) -> None:
+        # Given
+        arguments = [
+            "--sessions",
+            str(prepare_correct_data),
+            "--output",
+            str(tmp_path / "out.jsonl"),
+            "--workers",
+            "1",
+            "--profile",
+            str(tmp_path / "batch"),
+        ]
+        # When
+        result = runner.invoke(batch_report, arguments)
+        # Then
+        assert result.exit_code == 0
+        assert (tmp_path / "batch.prof").exists()
+
+    def test_generate_report_with_profile_merges_worker_profiles(
+        self, runner: CliRunner, prepare_correct_data: Path, tmp_path: Path
+    ) -> None:
+        # Given
+        output_prefix = tmp_path / "parallel"
+        arguments = ["--data_dir", str(prepare_correct_data), "--no-cache", "--workers", "2", "--chunk-size", "30"]
+        # When
+        result = runner.invoke(generate_report, [*arguments, "--profile", str(output_prefix), "--profile-top", "50"])
+        # Then
+        assert result.exit_code == 0
+        assert "Merged the profiles of " in result.output
+        assert "formula1_race_analysis.parallel_parser:" in result.output
+        worker_functions = {function_name for _, _, function_name in pstats.Stats(f"{output_prefix}.prof").stats}  # type: ignore[attr-defined]
+        assert "parse_byte_range" in worker_functions
+        assert PROFILE_WORKERS_ENV not in os.environ
+
+    def test_batch_report_with_profile_merges_worker_profiles(
+        self, runner: CliRunner, prepare_correct_data: Path, tmp_path: Path
+    ) -> None:
+        # Given
+        second_session = Path(shutil.copytree(prepare_correct_data, tmp_path / "second"))
+        arguments = [
+            "--sessions",
+            str(tmp_path),
+            "--output",
+            str(tmp_path / "out.jsonl"),
+            "--workers",
+            "2",
+            "--profile",
+            str(tmp_path / "batch"),
+        ]
+        # When
+        result = runner.invoke(batch_report, arguments)
+        # Then
+        assert result.exit_code == 0
+        assert second_session.exists()
+        worker_functions = {function_name for _, _, function_name in pstats.Stats(str(tmp_path / "batch.prof")).stats}  # type: ignore[attr-defined]
+        assert {"process_session", "create_driver_list"} <= worker_functions
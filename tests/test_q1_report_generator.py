@@ -77,3 +77,47 @@ class TestQ1GenerateReport:
         # Given
         runner.invoke(generate_report, ["--data_dir", str(prepare_invalid_data)], catch_exceptions=False)
         assert "Failed during report generation:" in caplog.text
+
+    def test_generate_report_with_top(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # Given
+        result = runner.invoke(generate_report, ["--data_dir", str(prepare_correct_data), "--top", "2", "--no-cache"])
+        # When / Then
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [
+            " 1. Fernando Alonso | MCLAREN RENAULT           | 1:12.657",
+            " 2. Pierre Gasly    | SCUDERIA TORO ROSSO HONDA | 1:12.941",
+        ]
+
+    def test_generate_report_with_bottom_keeps_real_positions(
+        self, runner: CliRunner, prepare_correct_data: Path
+    ) -> None:
+        # Given
+        arguments = ["--data_dir", str(prepare_correct_data), "--bottom", "2", "--knockout", "2", "--no-cache"]
+        # When
+        result = runner.invoke(generate_report, arguments)
+        # Then
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [
+            " 2. Pierre Gasly    | SCUDERIA TORO ROSSO HONDA | 1:12.941",
+            "_" * 60,
+            " 3. Kevin Magnussen | HAAS FERRARI              | 1:13.393",
+        ]
+
+    def test_generate_report_with_top_and_bottom(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # Given
+        arguments = ["--data_dir", str(prepare_correct_data), "--top", "2", "--bottom", "1"]
+        result = runner.invoke(generate_report, arguments)
+        # When / Then
+        assert result.exit_code != 0
+        assert "Options '--top' and '--bottom' cannot be used together." in result.output
+
+    def test_generate_report_filter_by_several_drivers(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # Given
+        arguments = ["--data_dir", str(prepare_correct_data), "--driver", "kmh", "--driver", "Gasly", "--driver", "PGS"]
+        result = runner.invoke(generate_report, arguments)
+        # When / Then
+        assert result.exit_code == 0
+        assert result.output.splitlines() == [
+            " 1. Kevin Magnussen | HAAS FERRARI              | 1:13.393",
+            " 2. Pierre Gasly    | SCUDERIA TORO ROSSO HONDA | 1:12.941",
+        ]
@@ -1,5 +1,5 @@
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -9,9 +9,12 @@ from formula1_race_analysis import (
     InvalidFormatDataError,
     InvalidRaceTimeError,
     MissedFileError,
+    build_q1_report,
     create_driver_list,
 )
+from formula1_race_analysis.config import FilePaths
 from formula1_race_analysis.q1_session_analyzer import (
+    calculate_lap_statistics,
     calculate_lap_time,
     parse_log_file,
 )
@@ -78,3 +81,59 @@ class TestQ1SessionAnalyser:
             match=f"Race time error for driver: '{driver_id}'. Start time is greater than end time.",
         ):
             calculate_lap_time(start_timestamp, end_timestamp, ignore_errors=False)
+
+    def test_calculate_lap_time_skips_driver_missing_from_one_log(self) -> None:
+        # Given
+        start_timestamp = {"NHR": {"identifier": "NHR", "timestamp": datetime(2018, 5, 24, 12, 2, 49, 914000)}}
+        end_timestamp = {
+            "SVF": {"identifier": "SVF", "timestamp": datetime(2018, 5, 24, 12, 4, 3, 332000)},
+            "NHR": {"identifier": "NHR", "timestamp": datetime(2018, 5, 24, 12, 4, 2, 979000)},
+        }
+        # When
+        lap_times = calculate_lap_time(start_timestamp, end_timestamp, ignore_errors=False)
+        # Then
+        assert list(lap_times) == ["NHR"]
+        assert lap_times["NHR"]["lap_time"] == timedelta(minutes=1, seconds=13, microseconds=65000)
+
+    def test_calculate_lap_statistics_pairs_laps_in_order(self, prepare_multi_lap_data: Path) -> None:
+        # Given
+        expected_lap_count = 2
+        # When
+        lap_statistics = calculate_lap_statistics(
+            prepare_multi_lap_data / FilePaths.START_LOG,
+            prepare_multi_lap_data / FilePaths.END_LOG,
+            ignore_errors=False,
+        )
+        # Then
+        assert lap_statistics["PGS"].lap_count == expected_lap_count
+        assert lap_statistics["PGS"].best_lap == timedelta(seconds=73)
+        assert lap_statistics["PGS"].mean_lap == timedelta(seconds=74)
+        assert lap_statistics["KMH"].lap_count == expected_lap_count
+        assert lap_statistics["KMH"].best_lap == timedelta(seconds=74, microseconds=500000)
+
+    def test_calculate_lap_statistics_with_invalid_race_time(self, prepare_multi_lap_data: Path) -> None:
+        # Given
+        tmp_end_log = prepare_multi_lap_data / FilePaths.END_LOG
+        tmp_end_log.write_text("PGS2018-05-24_11:59:00.000\nPGS2018-05-24_12:02:28.000\n")
+        tmp_start_log = prepare_multi_lap_data / FilePaths.START_LOG
+        # When / Then
+        with pytest.raises(InvalidRaceTimeError, match=re.escape("Race time error for driver: 'PGS'.")):
+            calculate_lap_statistics(tmp_start_log, tmp_end_log, ignore_errors=False)
+        lap_statistics = calculate_lap_statistics(tmp_start_log, tmp_end_log, ignore_errors=True)
+        assert lap_statistics["PGS"].lap_count == 1
+        assert lap_statistics["PGS"].best_lap == timedelta(seconds=73)
+
+    def test_build_q1_report_with_multi_lap(self, prepare_multi_lap_data: Path) -> None:
+        # When
+        report = build_q1_report(prepare_multi_lap_data, multi_lap=True)
+        # Then
+        assert [(data.driver.identifier, data.lap_count) for data in report] == [("PGS", 2), ("KMH", 2)]
+        assert report[0].best_lap == timedelta(seconds=73)
+        assert report[0].mean_lap_time == timedelta(seconds=74)
+        assert report[0].format_lap_time() == "1:13.000"
+
+    def test_build_q1_report_with_multi_lap_on_single_lap_session(self, prepare_correct_data: Path) -> None:
+        # When
+        report = build_q1_report(prepare_correct_data, multi_lap=True)
+        # Then
+        assert [data.lap_time for data in report] == [data.lap_time for data in build_q1_report(prepare_correct_data)]
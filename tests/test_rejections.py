@@ -0,0 +1,164 @@
+import json
+import re
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from formula1_race_analysis import InvalidFormatDataError, build_q1_report, create_driver_list
+from formula1_race_analysis.config import FilePaths, LapTimeBackend
+from formula1_race_analysis.display import generate_report
+from formula1_race_analysis.q1_session_analyzer import parse_log_file
+from formula1_race_analysis.rejections import (
+    DISABLED_REJECTIONS,
+    Rejection,
+    RejectionReason,
+    RejectionReport,
+)
+
+
+@pytest.fixture
+def prepare_dirty_data(prepare_correct_data: Path) -> Path:
+    with Path.open(prepare_correct_data / FilePaths.ABBREVIATIONS, "a") as abbreviations_file:
+        abbreviations_file.write("\nSVF_Sebastian_FERRARI\n")
+    with Path.open(prepare_correct_data / FilePaths.START_LOG, "a") as start_log:
+        start_log.write("  \nLHM\nLHM2018-05-24 12:18:20.125\n")
+    with Path.open(prepare_correct_data / FilePaths.END_LOG, "a") as end_log:
+        end_log.write("LHM2018-02-30_12:19:32.585\n")
+    return prepare_correct_data
+
+
+class TestRejections:
+    def test_rejection_report_keeps_first_rejections_and_counts_all(self) -> None:
+        # Given
+        rejections = RejectionReport(limit=2)
+        filepath = Path("start.log")
+        expected_total = 3
+        # When
+        for line_number in range(1, expected_total + 1):
+            rejections.add(filepath, line_number, RejectionReason.MISSING_TIMESTAMP, "VBM\n")
+        # Then
+        assert rejections.total == expected_total
+        assert rejections.truncated
+        assert rejections.rejections == [
+            Rejection("start.log", 1, RejectionReason.MISSING_TIMESTAMP, "VBM"),
+            Rejection("start.log", 2, RejectionReason.MISSING_TIMESTAMP, "VBM"),
+        ]
+
+    def test_disabled_rejection_report_records_nothing(self) -> None:
+        # When
+        DISABLED_REJECTIONS.add(Path("start.log"), 1, RejectionReason.INVALID_TIMESTAMP, "invalid\n")
+        # Then
+        assert DISABLED_REJECTIONS.total == 0
+        assert DISABLED_REJECTIONS.rejections == []
+
+    def test_create_driver_list_raises_for_invalid_line(self, prepare_dirty_data: Path) -> None:
+        # Given
+        abbreviations_file = prepare_dirty_data / FilePaths.ABBREVIATIONS
+        expected_line_number = 5
+        # When / Then
+        with pytest.raises(
+            InvalidFormatDataError,
+            match=re.escape(
+                f"Error! Incorrect data format: 'SVF_Sebastian_FERRARI' "
+                f"({abbreviations_file}, line {expected_line_number}: invalid_name)."
+            ),
+        ):
+            create_driver_list(abbreviations_file, ignore_errors=False)
+
+    def test_parse_log_file_skips_whitespace_lines(self, tmp_path: Path) -> None:
+        # Given
+        log_file = tmp_path / FilePaths.START_LOG
+        log_file.write_text("\nSVF2018-05-24_12:02:58.917\n \t\n")
+        rejections = RejectionReport()
+        # When
+        timestamps = parse_log_file(log_file, ignore_errors=False, rejections=rejections)
+        # Then
+        assert list(timestamps) == ["SVF"]
+        assert rejections.total == 0
+
+    @pytest.mark.parametrize("backend", list(LapTimeBackend))
+    def test_build_q1_report_records_rejections(self, prepare_dirty_data: Path, backend: LapTimeBackend) -> None:
+        # Given
+        rejections = RejectionReport()
+        expected_rejections = [
+            Rejection(
+                str(prepare_dirty_data / FilePaths.ABBREVIATIONS),
+                5,
+                RejectionReason.INVALID_NAME,
+                "SVF_Sebastian_FERRARI",
+            ),
+            Rejection(str(prepare_dirty_data / FilePaths.START_LOG), 5, RejectionReason.MISSING_TIMESTAMP, "LHM"),
+            Rejection(
+                str(prepare_dirty_data / FilePaths.START_LOG),
+                6,
+                RejectionReason.INVALID_TIMESTAMP,
+                "LHM2018-05-24 12:18:20.125",
+            ),
+            Rejection(
+                str(prepare_dirty_data / FilePaths.END_LOG),
+                4,
+                RejectionReason.INVALID_TIMESTAMP,
+                "LHM2018-02-30_12:19:32.585",
+            ),
+        ]
+        expected_results = 3
+        # When
+        report = build_q1_report(prepare_dirty_data, ignore_errors=True, backend=backend, rejections=rejections)
+        # Then
+        assert len(report) == expected_results
+        assert rejections.rejections == expected_rejections
+
+    @pytest.mark.parametrize("backend", list(LapTimeBackend))
+    def test_build_q1_report_raises_for_invalid_log_line(
+        self, prepare_dirty_data: Path, backend: LapTimeBackend
+    ) -> None:
+        # Given
+        (prepare_dirty_data / FilePaths.ABBREVIATIONS).write_text("LHM_Lewis Hamilton_MERCEDES\n")
+        # When / Then
+        with pytest.raises(InvalidFormatDataError, match=re.escape("line 5: missing_timestamp")):
+            build_q1_report(prepare_dirty_data, ignore_errors=False, backend=backend)
+
+    def test_generate_report_with_rejects_out(
+        self, runner: CliRunner, prepare_dirty_data: Path, tmp_path: Path
+    ) -> None:
+        # Given
+        rejects_file = tmp_path / "rejects.json"
+        expected_total = 4
+        expected_listed = 1
+        # When
+        result = runner.invoke(
+            generate_report,
+            [
+                "--data_dir",
+                str(prepare_dirty_data),
+                "--ignore_errors",
+                "--rejects-out",
+                str(rejects_file),
+                "--rejects-limit",
+                str(expected_listed),
+            ],
+        )
+        rejects = json.loads(rejects_file.read_text())
+        # Then
+        assert result.exit_code == 0
+        assert "Kevin Magnussen" in result.output
+        assert rejects["total"] == expected_total
+        assert rejects["truncated"]
+        assert rejects["reasons"] == {"invalid_timestamp": 2, "invalid_name": 1, "missing_timestamp": 1}
+        assert len(rejects["rejections"]) == expected_listed
+
+    def test_generate_report_writes_rejects_out_on_failure(
+        self, runner: CliRunner, prepare_dirty_data: Path, tmp_path: Path
+    ) -> None:
+        # Given
+        rejects_file = tmp_path / "rejects.json"
+        # When
+        result = runner.invoke(
+            generate_report, ["--data_dir", str(prepare_dirty_data), "--rejects-out", str(rejects_file)]
+        )
+        rejects = json.loads(rejects_file.read_text())
+        # Then
+        assert result.exit_code == 1
+        assert rejects["total"] == 1
+        assert rejects["rejections"][0]["reason"] == "invalid_name"
@@ -0,0 +1,158 @@
+import re
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+
+from formula1_race_analysis import MissedFileError, ReportCache, build_q1_report, report_cache
+from formula1_race_analysis.config import FilePaths, LapTimeBackend
+from formula1_race_analysis.instrumentation import Metrics
+from formula1_race_analysis.models import RaceResult
+from formula1_race_analysis.report_cache import ReportCacheStats, estimate_report_size
+
+CONCURRENT_REQUESTS = 8
+
+
+class TestReportCache:
+    def test_cached_report_is_reused(self, prepare_correct_data: Path) -> None:
+        # Given
+        cache = ReportCache()
+        first_report = cache.get_report(prepare_correct_data)
+        first_report.reverse()
+        metrics = Metrics()
+        # When
+        report = cache.get_report(prepare_correct_data, metrics=metrics)
+        # Then
+        assert report == build_q1_report(prepare_correct_data)
+        assert cache.stats == ReportCacheStats(hits=1, misses=1, entries=1, size_bytes=estimate_report_size(report))
+        assert metrics.counters == {"report_cache_hits": 1}
+
+    def test_changed_result_does_not_change_cached_report(self, prepare_correct_data: Path) -> None:
+        # Given
+        cache = ReportCache()
+        first_report = cache.get_report(prepare_correct_data)
+        expected_report = build_q1_report(prepare_correct_data)
+        # When
+        first_report[0].lap_time_us = 0
+        first_report[0].lap_count = 0
+        report = cache.get_report(prepare_correct_data)
+        # Then
+        assert report == expected_report
+        assert report[0] is not first_report[0]
+        assert report[0].driver is first_report[0].driver
+
+    def test_changed_file_replaces_report(self, prepare_correct_data: Path) -> None:
+        # Given
+        cache = ReportCache()
+        cache.get_report(prepare_correct_data)
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text(end_log.read_text().replace("FAM2018-05-24_12:14:17.169", "FAM2018-05-24_12:14:18.5"))
+        # When
+        report = cache.get_report(prepare_correct_data)
+        # Then
+        assert report[2].format_lap_time() == "1:13.988"
+        assert cache.stats.misses == cache.stats.entries + 1
+
+    def test_options_are_cached_separately(self, prepare_correct_data: Path) -> None:
+        # Given
+        cache = ReportCache()
+        expected_entries = 3
+        # When
+        cache.get_report(prepare_correct_data)
+        cache.get_report(prepare_correct_data, ignore_errors=True)
+        cache.get_report(prepare_correct_data, backend=LapTimeBackend.COLUMNAR)
+        cache.get_report(prepare_correct_data, ignore_errors=False)
+        # Then
+        assert cache.stats.entries == expected_entries
+        assert cache.stats.hits == 1
+
+    def test_concurrent_requests_build_once(self, prepare_correct_data: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Given
+        cache = ReportCache()
+        release_build = threading.Event()
+        builds = []
+
+        def slow_build_q1_report(*args: object, **kwargs: object) -> list[RaceResult]:
+            builds.append(args)
+            release_build.wait(timeout=5)
+            return build_q1_report(*args, **kwargs)  # type: ignore[arg-type]
+
+        monkeypatch.setattr(report_cache, "build_q1_report", slow_build_q1_report)
+        reports: list[list[RaceResult]] = []
+        threads = [
+            threading.Thread(target=lambda: reports.append(cache.get_report(prepare_correct_data)))
+            for _ in range(CONCURRENT_REQUESTS)
+        ]
+        # When
+        for thread in threads:
+            thread.start()
+        while cache.stats.misses + cache.stats.coalesced < CONCURRENT_REQUESTS:
+            threading.Event().wait(0.01)
+        release_build.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        # Then
+        assert len(builds) == 1
+        assert len(reports) == CONCURRENT_REQUESTS
+        assert all(report == reports[0] for report in reports)
+        assert len({id(report[0]) for report in reports}) == CONCURRENT_REQUESTS
+        assert cache.stats.coalesced == CONCURRENT_REQUESTS - 1
+
+    def test_failed_build_is_raised_and_not_cached(self, prepare_correct_data: Path) -> None:
+        # Given
+        cache = ReportCache()
+        (prepare_correct_data / FilePaths.START_LOG).unlink()
+        expected_misses = 2
+        # When / Then
+        for _ in range(expected_misses):
+            with pytest.raises(MissedFileError):
+                cache.get_report(prepare_correct_data)
+        assert cache.stats.misses == expected_misses
+        assert cache.stats.entries == 0
+
+    def test_least_recently_used_report_is_evicted(self, prepare_correct_data: Path, tmp_path: Path) -> None:
+        # Given
+        sessions = [prepare_correct_data]
+        sessions.extend(Path(shutil.copytree(prepare_correct_data, tmp_path / name)) for name in ("second", "third"))
+        report_size = estimate_report_size(build_q1_report(prepare_correct_data))
+        cache = ReportCache(max_bytes=2 * report_size)
+        cache.get_report(sessions[0])
+        cache.get_report(sessions[1])
+        cache.get_report(sessions[0])
+        # When
+        cache.get_report(sessions[2])
+        cache.get_report(sessions[0])
+        # Then
+        assert cache.stats == ReportCacheStats(hits=2, misses=3, evictions=1, entries=2, size_bytes=2 * report_size)
+
+    def test_report_larger_than_budget_is_not_cached(self, prepare_correct_data: Path) -> None:
+        # Given
+        cache = ReportCache(max_bytes=0)
+        cache.get_report(prepare_correct_data)
+        # When
+        cache.get_report(prepare_correct_data)
+        # Then
+        assert cache.stats.as_dict() == {
+            "hits": 0,
+            "misses": 2,
+            "coalesced": 0,
+            "evictions": 0,
+            "entries": 0,
+            "size_bytes": 0,
+        }
+
+    def test_clear(self, prepare_correct_data: Path) -> None:
+        # Given
+        cache = ReportCache()
+        cache.get_report(prepare_correct_data)
+        # When
+        cache.clear()
+        cache.get_report(prepare_correct_data)
+        # Then
+        assert cache.stats.misses == cache.stats.entries + 1
+
+    def test_negative_budget(self) -> None:
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape("The memory budget must not be negative, got -1.")):
+            ReportCache(max_bytes=-1)
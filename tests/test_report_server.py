@@ -0,0 +1,230 @@
+import json
+import os
+import re
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from click.testing import CliRunner
+
+from formula1_race_analysis import session_cache
+from formula1_race_analysis.batch_report import BatchOptions
+from formula1_race_analysis.binary_session import convert_session
+from formula1_race_analysis.config import FilePaths
+from formula1_race_analysis.display import serve
+from formula1_race_analysis.report_server import ReportServer, SessionStore
+from formula1_race_analysis.session_cache import hash_file
+
+CONNECT_TIMEOUT = 5.0
+
+
+@pytest.fixture
+def report_server(prepare_correct_data: Path) -> Iterator[ReportServer]:
+    store = SessionStore([prepare_correct_data], BatchOptions())
+    with ReportServer(("127.0.0.1", 0), store) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        thread.join()
+
+
+def get_json(server_port: int, path: str) -> tuple[int, dict[str, Any]]:
+    try:
+        with urlopen(f"http://127.0.0.1:{server_port}{path}", timeout=CONNECT_TIMEOUT) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return int(probe.getsockname()[1])
+
+
+class TestReportServer:
+    def test_list_sessions(self, report_server: ReportServer, prepare_correct_data: Path) -> None:
+        # Given
+        expected_drivers = 3
+        # When
+        status, body = get_json(report_server.server_port, "/sessions")
+        # Then
+        assert status == HTTPStatus.OK
+        assert [session["name"] for session in body["sessions"]] == [prepare_correct_data.name]
+        assert body["sessions"][0]["drivers"] == expected_drivers
+
+    def test_report_query_uses_qualifying_positions(self, report_server: ReportServer) -> None:
+        # When
+        status, body = get_json(report_server.server_port, "/sessions/data/report?order=desc&top=2")
+        # Then
+        assert status == HTTPStatus.OK
+        assert [(record["position"], record["identifier"]) for record in body["results"]] == [(2, "PGS"), (1, "FAM")]
+
+    def test_drivers_query(self, report_server: ReportServer) -> None:
+        # When
+        status, body = get_json(report_server.server_port, "/sessions/data/drivers?driver=gasly&driver=KMH")
+        # Then
+        assert status == HTTPStatus.OK
+        assert [record["name"] for record in body["results"]] == ["Pierre Gasly", "Kevin Magnussen"]
+
+    @pytest.mark.parametrize(
+        ("path", "expected_status", "expected_error"),
+        [
+            ("/sessions/unknown/report", HTTPStatus.NOT_FOUND, "Error! Unknown session: 'unknown'."),
+            ("/sessions/data/laps", HTTPStatus.NOT_FOUND, "Error! Unknown path: '/sessions/data/laps'."),
+            (
+                "/sessions/data/drivers?driver=Vettel",
+                HTTPStatus.NOT_FOUND,
+                "Error! No data found for driver: 'Vettel'.",
+            ),
+            ("/sessions/data/drivers", HTTPStatus.BAD_REQUEST, "Error! Parameter 'driver' is required."),
+            (
+                "/sessions/data/report?order=up",
+                HTTPStatus.BAD_REQUEST,
+                "Error! Invalid order: 'up'. Expected 'asc' or 'desc'.",
+            ),
+            (
+                "/sessions/data/report?top=0",
+                HTTPStatus.BAD_REQUEST,
+                "Error! Parameter 'top' must be a positive integer, got '0'.",
+            ),
+            (
+                "/sessions/data/report?top=1&top=2",
+                HTTPStatus.BAD_REQUEST,
+                "Error! Parameter 'top' can only be given once.",
+            ),
+            (
+                "/sessions/data/report?top=1&bottom=1",
+                HTTPStatus.BAD_REQUEST,
+                "Error! Parameters 'top' and 'bottom' cannot be used together.",
+            ),
+        ],
+    )
+    def test_invalid_queries(
+        self, report_server: ReportServer, path: str, expected_status: int, expected_error: str
+    ) -> None:
+        # When
+        status, body = get_json(report_server.server_port, path)
+        # Then
+        assert status == expected_status
+        assert body == {"error": expected_error}
+
+    def test_session_is_reloaded_when_files_change(
+        self, report_server: ReportServer, prepare_correct_data: Path
+    ) -> None:
+        # Given
+        get_json(report_server.server_port, "/sessions/data/report")
+        with Path.open(prepare_correct_data / FilePaths.ABBREVIATIONS, "a") as abbreviations_file:
+            abbreviations_file.write("SVF_Sebastian Vettel_FERRARI\n")
+        with Path.open(prepare_correct_data / FilePaths.START_LOG, "a") as start_log:
+            start_log.write("SVF2018-05-24_12:02:58.917\n")
+        with Path.open(prepare_correct_data / FilePaths.END_LOG, "a") as end_log:
+            end_log.write("SVF2018-05-24_12:04:03.332\n")
+        # When
+        status, body = get_json(report_server.server_port, "/sessions/data/report?top=1")
+        # Then
+        assert status == HTTPStatus.OK
+        assert body["results"][0]["identifier"] == "SVF"
+        assert report_server.store.reloads == 1
+
+    def test_session_is_reloaded_when_binary_session_is_outdated(self, prepare_correct_data: Path) -> None:
+        # Given
+        convert_session(prepare_correct_data)
+        store = SessionStore([prepare_correct_data], BatchOptions())
+        store.get("data")
+        end_log = prepare_correct_data / FilePaths.END_LOG
+        end_log.write_text(end_log.read_text().replace("KMH2018-05-24_12:04:04.396", "KMH2018-05-24_12:04:01.5"))
+        # When
+        session = store.get("data")
+        # Then
+        assert session.report[1].format_lap_time() == "1:10.497"
+        assert store.reloads == 1
+
+    def test_touched_file_is_hashed_once(self, prepare_correct_data: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        # Given
+        store = SessionStore([prepare_correct_data], BatchOptions())
+        session = store.get("data")
+        start_log = prepare_correct_data / FilePaths.START_LOG
+        file_stat = start_log.stat()
+        os.utime(start_log, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000_000))
+        hashed_files = []
+
+        def counting_hash_file(filepath: Path) -> str:
+            hashed_files.append(filepath)
+            return hash_file(filepath)
+
+        monkeypatch.setattr(session_cache, "hash_file", counting_hash_file)
+        # When
+        sessions = [store.get("data") for _ in range(3)]
+        # Then
+        assert all(loaded_session is session for loaded_session in sessions)
+        assert hashed_files == [start_log]
+        assert store.reloads == 0
+
+    def test_session_that_fails_to_reload(self, report_server: ReportServer, prepare_correct_data: Path) -> None:
+        # Given
+        get_json(report_server.server_port, "/sessions")
+        (prepare_correct_data / FilePaths.ABBREVIATIONS).write_text("Valtteri Bottas_MERCEDES\n")
+        # When
+        status, body = get_json(report_server.server_port, "/sessions/data/report")
+        # Then
+        assert status == HTTPStatus.INTERNAL_SERVER_ERROR
+        assert body["error"].startswith("Error! Incorrect data format: 'Valtteri Bottas_MERCEDES'")
+
+    def test_session_store_with_duplicate_names(self, prepare_correct_data: Path) -> None:
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape("Session directories must have different names.")):
+            SessionStore([prepare_correct_data, prepare_correct_data], BatchOptions())
+
+    def test_serve_answers_queries(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # Given
+        port = free_port()
+        command = threading.Thread(
+            target=runner.invoke,
+            args=(serve, ["--data_dir", str(prepare_correct_data), "--port", str(port), "--max_requests", "1"]),
+        )
+        command.start()
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while True:
+            try:
+                status, body = get_json(port, "/sessions/data/drivers?driver=FAM")
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        command.join(CONNECT_TIMEOUT)
+        # Then
+        assert status == HTTPStatus.OK
+        assert body["results"][0]["name"] == "Fernando Alonso"
+        assert not command.is_alive()
+
+    def test_serve_with_invalid_session(self, runner: CliRunner, prepare_invalid_data: Path) -> None:
+        # When
+        result = runner.invoke(serve, ["--data_dir", str(prepare_invalid_data), "--port", "0"])
+        # Then
+        assert result.exit_code == 1
+
+    def test_serve_with_multi_lap_and_columnar_backend(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # When
+        result = runner.invoke(serve, ["--data_dir", str(prepare_correct_data), "--multi_lap", "--backend", "columnar"])
+        # Then
+        assert result.exit_code != 0
+        assert "Option '--multi_lap' cannot be used with '--backend columnar'." in result.output
+
+    def test_serve_with_duplicate_session_names(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # When
+        result = runner.invoke(
+            serve, ["--data_dir", str(prepare_correct_data), "--data_dir", str(prepare_correct_data)]
+        )
+        # Then
+        assert result.exit_code != 0
+        assert "Session directories passed with '--data_dir' must have different names." in result.output
@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from formula1_race_analysis import DisplayReportError, build_q1_report
+from formula1_race_analysis.display import SortStrategy, generate_report, report_writers, sort_report
+from formula1_race_analysis.display.report_writers import OutputFormat, write_report
+from formula1_race_analysis.models import RaceResult
+
+
+class CountingStream(io.StringIO):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.fixture
+def sorted_report(prepare_correct_data: Path) -> list[RaceResult]:
+    return sort_report(build_q1_report(prepare_correct_data), SortStrategy.ASCENDING_ORDER)
+
+
+class TestReportWriters:
+    def test_write_table_with_knockout_line(self, sorted_report: list[RaceResult]) -> None:
+        # Given
+        stream = io.StringIO()
+        # When
+        write_report(sorted_report, OutputFormat.TABLE, stream, knockout_position=1)
+        # Then
+        assert stream.getvalue().splitlines() == [
+            " 1. Fernando Alonso | MCLAREN RENAULT           | 1:12.657",
+            "_" * 60,
+            " 2. Pierre Gasly    | SCUDERIA TORO ROSSO HONDA | 1:12.941",
+            " 3. Kevin Magnussen | HAAS FERRARI              | 1:13.393",
+        ]
+
+    def test_write_csv(self, sorted_report: list[RaceResult]) -> None:
+        # Given
+        stream = io.StringIO()
+        # When
+        write_report(sorted_report, OutputFormat.CSV, stream, knockout_position=1)
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        # Then
+        assert [row["identifier"] for row in rows] == ["FAM", "PGS", "KMH"]
+        assert rows[1] == {
+            "position": "2",
+            "identifier": "PGS",
+            "name": "Pierre Gasly",
+            "car_model": "SCUDERIA TORO ROSSO HONDA",
+            "lap_time": "1:12.941",
+            "lap_count": "1",
+        }
+
+    @pytest.mark.parametrize("output_format", [OutputFormat.JSON, OutputFormat.JSONL])
+    def test_write_json_formats(self, sorted_report: list[RaceResult], output_format: OutputFormat) -> None:
+        # Given
+        stream = io.StringIO()
+        # When
+        write_report(sorted_report, output_format, stream)
+        output = stream.getvalue()
+        records = (
+            json.loads(output) if output_format == OutputFormat.JSON else list(map(json.loads, output.splitlines()))
+        )
+        # Then
+        assert records == [data.as_record(position) for position, data in enumerate(sorted_report, start=1)]
+
+    def test_write_empty_report(self) -> None:
+        # Given
+        stream = io.StringIO()
+        # When
+        write_report([], OutputFormat.JSON, stream)
+        # Then
+        assert json.loads(stream.getvalue()) == []
+        with pytest.raises(DisplayReportError, match="Failed during displaying rase results"):
+            write_report([], OutputFormat.TABLE, stream)
+
+    def test_rows_are_written_in_chunks(self, sorted_report: list[RaceResult], monkeypatch: pytest.MonkeyPatch) -> None:
+        # Given
+        monkeypatch.setattr(report_writers, "ROWS_PER_CHUNK", 2)
+        stream = CountingStream()
+        expected_writes = 2
+        # When
+        write_report(sorted_report, OutputFormat.JSONL, stream)
+        # Then
+        assert stream.writes == expected_writes
+
+    def test_generate_report_with_format_and_output(
+        self, runner: CliRunner, prepare_correct_data: Path, tmp_path: Path
+    ) -> None:
+        # Given
+        output_file = tmp_path / "report.csv"
+        arguments = ["--data_dir", str(prepare_correct_data), "--format", "csv", "--output", str(output_file)]
+        # When
+        result = runner.invoke(generate_report, arguments)
+        # Then
+        assert result.exit_code == 0
+        assert output_file.read_text().splitlines()[:2] == [
+            "position,identifier,name,car_model,lap_time,lap_count",
+            "1,FAM,Fernando Alonso,MCLAREN RENAULT,1:12.657,1",
+        ]
+
+    def test_writer_without_render_cannot_be_created(self) -> None:
+        # Given
+        class IncompleteWriter(report_writers.ReportWriter):
+            pass
+
+        # When / Then
+        with pytest.raises(TypeError, match="abstract method 'render'"):
+            IncompleteWriter(io.StringIO())  # type: ignore[abstract]
@@ -0,0 +1,162 @@
+import json
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from formula1_race_analysis import InvalidFormatDataError, build_q1_report
+from formula1_race_analysis.batch_report import BatchOptions
+from formula1_race_analysis.config import FilePaths
+from formula1_race_analysis.display import ingest, query
+from formula1_race_analysis.results_store import ResultsStore, ingest_sessions
+
+
+@pytest.fixture
+def prepare_season(prepare_correct_data: Path, tmp_path: Path) -> Path:
+    season_dir = tmp_path / "season"
+    shutil.copytree(prepare_correct_data, season_dir / "round_01")
+    shutil.copytree(prepare_correct_data, season_dir / "round_02")
+    # Kevin Magnussen is faster in the second round: 12:02:51.003 -> 12:03:55.000.
+    end_log = season_dir / "round_02" / FilePaths.END_LOG
+    end_log.write_text(end_log.read_text().replace("KMH2018-05-24_12:04:04.396", "KMH2018-05-24_12:03:55.000"))
+    broken_session = season_dir / "round_03"
+    broken_session.mkdir()
+    (broken_session / FilePaths.ABBREVIATIONS).write_text("Valtteri Bottas_MERCEDES\n")
+    return season_dir
+
+
+class TestResultsStore:
+    def test_ingest_sessions_and_leaderboard(self, prepare_season: Path, tmp_path: Path) -> None:
+        # Given
+        session_dirs = sorted(prepare_season.iterdir())
+        # When
+        with ResultsStore(tmp_path / "results.sqlite3") as store:
+            summary = ingest_sessions(store, session_dirs, BatchOptions())
+            leaderboard = store.leaderboard()
+        # Then
+        assert summary.succeeded == len(session_dirs) - 1
+        assert list(summary.failed) == [str(prepare_season / "round_03")]
+        assert [
+            (stored_result.position, stored_result.result.driver.identifier, stored_result.result.formatted_lap_time)
+            for stored_result in leaderboard
+        ] == [(1, "KMH", "1:03.997"), (2, "FAM", "1:12.657"), (3, "PGS", "1:12.941")]
+        assert leaderboard[0].session == str((prepare_season / "round_02").resolve())
+
+    def test_leaderboard_of_one_session_with_limit(self, prepare_season: Path, tmp_path: Path) -> None:
+        # Given
+        session_dir = prepare_season / "round_01"
+        expected_limit = 2
+        # When
+        with ResultsStore(tmp_path / "results.sqlite3") as store:
+            store.ingest_report(session_dir, build_q1_report(session_dir))
+            store.ingest_report(prepare_season / "round_02", build_q1_report(prepare_season / "round_02"))
+            leaderboard = store.leaderboard(expected_limit, session_dir)
+        # Then
+        assert [stored_result.result.driver.identifier for stored_result in leaderboard] == ["FAM", "PGS"]
+
+    def test_reingest_replaces_session(self, prepare_correct_data: Path, tmp_path: Path) -> None:
+        # Given
+        report = build_q1_report(prepare_correct_data)
+        # When
+        with ResultsStore(tmp_path / "results.sqlite3") as store:
+            store.ingest_report(prepare_correct_data, report)
+            store.ingest_report(prepare_correct_data, report)
+            history = store.driver_history("fam")
+        # Then
+        assert [(stored_result.position, stored_result.result.lap_time_us) for stored_result in history] == [
+            (1, 72_657_000)
+        ]
+
+    def test_driver_history(self, prepare_season: Path, tmp_path: Path) -> None:
+        # When
+        with ResultsStore(tmp_path / "results.sqlite3") as store:
+            ingest_sessions(store, sorted(prepare_season.iterdir()), BatchOptions())
+            history = store.driver_history("KMH")
+        # Then
+        assert [(Path(stored_result.session).name, stored_result.position) for stored_result in history] == [
+            ("round_01", 3),
+            ("round_02", 1),
+        ]
+
+    def test_results_store_with_invalid_file(self, tmp_path: Path) -> None:
+        # Given
+        database = tmp_path / "results.sqlite3"
+        database.write_text("not a database\n" * 100)
+        # When / Then
+        with pytest.raises(
+            InvalidFormatDataError, match=re.escape(f"Error! The file is not a results store: '{database}'.")
+        ):
+            ResultsStore(database)
+
+    def test_ingest_and_query_commands(self, runner: CliRunner, prepare_season: Path, tmp_path: Path) -> None:
+        # Given
+        database = tmp_path / "results.sqlite3"
+        # When
+        ingest_result = runner.invoke(ingest, ["--sessions", str(prepare_season), "--database", str(database)])
+        leaderboard_result = runner.invoke(query, ["--database", str(database), "--top", "1"])
+        history_result = runner.invoke(query, ["--database", str(database), "--driver", "PGS", "--format", "jsonl"])
+        # Then
+        assert ingest_result.exit_code == 1
+        assert leaderboard_result.exit_code == 0
+        assert leaderboard_result.output.startswith(" 1. Kevin Magnussen | HAAS FERRARI | 1:03.997 | ")
+        assert [json.loads(line)["position"] for line in history_result.output.splitlines()] == [2, 3]
+
+    def test_query_without_results(self, runner: CliRunner, tmp_path: Path) -> None:
+        # Given
+        database = tmp_path / "results.sqlite3"
+        ResultsStore(database).close()
+        # When
+        result = runner.invoke(query, ["--database", str(database), "--driver", "VBM"])
+        # Then
+        assert result.exit_code == 1
+
+    def test_query_with_driver_and_top(self, runner: CliRunner, tmp_path: Path) -> None:
+        # Given
+        database = tmp_path / "results.sqlite3"
+        ResultsStore(database).close()
+        # When
+        result = runner.invoke(query, ["--database", str(database), "--driver", "VBM", "--top", "1"])
+        # Then
+        assert result.exit_code != 0
+        assert "Option '--driver' cannot be used with '--session' or '--top'." in result.output
+
+    def test_commands_with_invalid_database(self, runner: CliRunner, prepare_correct_data: Path) -> None:
+        # Given
+        database = prepare_correct_data / FilePaths.START_LOG
+        # When
+        ingest_result = runner.invoke(ingest, ["--sessions", str(prepare_correct_data), "--database", str(database)])
+        query_result = runner.invoke(query, ["--database", str(database)])
+        # Then
+        assert ingest_result.exit_code == 1
+        assert query_result.exit_code == 1
+
+    def test_ingest_without_sessions(self, runner: CliRunner, tmp_path: Path) -> None:
+        # When
+        result = runner.invoke(ingest, ["--sessions", str(tmp_path), "--database", str(tmp_path / "results.sqlite3")])
+        # Then
+        assert result.exit_code == 1
+
+    def test_ingest_with_multi_lap_and_columnar_backend(
+        self, runner: CliRunner, prepare_correct_data: Path, tmp_path: Path
+    ) -> None:
+        # Given
+        database = tmp_path / "results.sqlite3"
+        # When
+        result = runner.invoke(
+            ingest,
+            [
+                "--sessions",
+                str(prepare_correct_data),
+                "--database",
+                str(database),
+                "--multi_lap",
+                "--backend",
+                "columnar",
+            ],
+        )
+        # Then
+        assert result.exit_code != 0
+        assert "Option '--multi_lap' cannot be used with '--backend columnar'." in result.output
+        assert not database.exists()
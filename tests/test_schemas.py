@@ -3,6 +3,7 @@ from datetime import datetime
 import pytest
 
 from formula1_race_analysis import AbbreviationEntry, InvalidFormatDataError, InvalidNameFormatError, LogEntry
+from formula1_race_analysis.rejections import RejectionReason
 
 
 class TestAbbreviationEntry:
@@ -35,6 +36,24 @@ class TestAbbreviationEntry:
         ):
             AbbreviationEntry.format_driver_name(invalid_name)
 
+    @pytest.mark.parametrize(
+        ("line", "expected_reason"),
+        [
+            ("PGS_pierre gasly_SCUDERIA TORO ROSSO HONDA\n", None),
+            ("DRRDaniel RicciardoRED BULL RACING TAG HEUER\n", RejectionReason.WRONG_FIELD_COUNT),
+            ("Valtteri Bottas_MERCEDES\n", RejectionReason.WRONG_FIELD_COUNT),
+            ("PG_Pierre Gasly_HONDA\n", RejectionReason.INVALID_IDENTIFIER),
+            ("PG1_Pierre Gasly_HONDA\n", RejectionReason.INVALID_IDENTIFIER),
+            ("PGS_Pierre  Gasly_HONDA\n", RejectionReason.INVALID_NAME),
+            ("PGS_Pierre_HONDA\n", RejectionReason.INVALID_NAME),
+        ],
+    )
+    def test_check_line(self, line: str, expected_reason: RejectionReason | None) -> None:
+        # When
+        actual_reason = AbbreviationEntry.check_line(line)
+        # Then
+        assert actual_reason == expected_reason
+
     def format_data_from_log_file_with_correct_timestamp(self) -> None:
         # Given
         given_timestamp = "SVF_2018-05-24_12:14:12.054"
@@ -0,0 +1,122 @@
+import logging
+import os
+from pathlib import Path
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+from click.testing import CliRunner
+
+from formula1_race_analysis import build_q1_report, q1_session_analyzer
+from formula1_race_analysis.config import FilePaths
+from formula1_race_analysis.display import generate_report
+from formula1_race_analysis.models import RaceResult
+from formula1_race_analysis.session_cache import CACHE_DIR_NAME, build_cached_q1_report, cache_file_path
+
+
+@pytest.fixture
+def build_calls(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    calls = []
+
+    def counting_build_q1_report(base_dir: Path, *args: bool | None, **kwargs: bool) -> list[RaceResult]:
+        calls.append(base_dir)
+        return build_q1_report(base_dir, *args, **kwargs)  # type: ignore[arg-type]
+
+    monkeypatch.setattr(q1_session_analyzer, "build_q1_report", counting_build_q1_report)
+    return calls
+
+
+class TestSessionCache:
+    def test_build_cached_q1_report_reuses_parsed_session(
+        self, prepare_correct_data: Path, build_calls: list[Path], caplog: LogCaptureFixture
+    ) -> None:
+        caplog.set_level(logging.INFO)
+        # When
+        first_report = build_cached_q1_report(prepare_correct_data)
+        second_report = build_cached_q1_report(prepare_correct_data)
+        # Then
+        assert first_report == second_report == build_q1_report(prepare_correct_data)
+        assert build_calls == [prepare_correct_data]
+        assert "Session cache miss:" in caplog.text
+        assert "Session cache hit:" in caplog.text
+        assert (prepare_correct_data / CACHE_DIR_NAME).is_dir()
+
+    def test_build_cached_q1_report_is_invalidated_by_changed_file(
+        self, prepare_correct_data: Path, build_calls: list[Path]
+    ) -> None:
+        # Given
+        expected_build_calls = 2
+        build_cached_q1_report(prepare_correct_data)
+        tmp_end_log = prepare_correct_data / FilePaths.END_LOG
+        tmp_end_log.write_text(tmp_end_log.read_text().replace("12:14:17.169", "12:14:18.169"))
+        # When
+        report = build_cached_q1_report(prepare_correct_data)
+        # Then
+        assert len(build_calls) == expected_build_calls
+        assert report[2].format_lap_time() == "1:13.657"
+
+    def test_build_cached_q1_report_hashes_touched_file(
+        self, prepare_correct_data: Path, build_calls: list[Path]
+    ) -> None:
+        # Given
+        build_cached_q1_report(prepare_correct_data)
+        tmp_start_log = prepare_correct_data / FilePaths.START_LOG
+        file_stat = tmp_start_log.stat()
+        os.utime(tmp_start_log, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 1_000_000_000))
+        # When
+        build_cached_q1_report(prepare_correct_data)
+        # Then
+        assert build_calls == [prepare_correct_data]
+
+    def test_build_cached_q1_report_with_cache_dir_and_options(
+        self, prepare_correct_data: Path, tmp_path: Path, build_calls: list[Path]
+    ) -> None:
+        # Given
+        cache_dir = tmp_path / "cache"
+        expected_cache_entries = 2
+        # When
+        build_cached_q1_report(prepare_correct_data, cache_dir=cache_dir)
+        build_cached_q1_report(prepare_correct_data, cache_dir=cache_dir, multi_lap=True)
+        build_cached_q1_report(prepare_correct_data, cache_dir=cache_dir, multi_lap=True)
+        # Then
+        assert len(build_calls) == expected_cache_entries
+        assert len(list(cache_dir.iterdir())) == expected_cache_entries
+        assert not (prepare_correct_data / CACHE_DIR_NAME).exists()
+
+    def test_build_cached_q1_report_with_corrupted_cache(
+        self, prepare_correct_data: Path, build_calls: list[Path]
+    ) -> None:
+        # Given
+        cache_file = cache_file_path(prepare_correct_data, None, ignore_errors=False, multi_lap=False)
+        cache_file.parent.mkdir()
+        cache_file.write_bytes(b"not a cache")
+        # When
+        report = build_cached_q1_report(prepare_correct_data)
+        # Then
+        assert report == build_q1_report(prepare_correct_data)
+        assert build_calls == [prepare_correct_data]
+
+    def test_generate_report_with_no_cache(
+        self, runner: CliRunner, prepare_correct_data: Path, caplog: LogCaptureFixture
+    ) -> None:
+        caplog.set_level(logging.INFO)
+        # When
+        result = runner.invoke(generate_report, ["--data_dir", str(prepare_correct_data), "--no-cache"])
+        # Then
+        assert result.exit_code == 0
+        assert "Session cache" not in caplog.text
+        assert not (prepare_correct_data / CACHE_DIR_NAME).exists()
+
+    def test_generate_report_with_cache_dir(
+        self, runner: CliRunner, prepare_correct_data: Path, tmp_path: Path, caplog: LogCaptureFixture
+    ) -> None:
+        caplog.set_level(logging.INFO)
+        # Given
+        cache_dir = tmp_path / "cache"
+        arguments = ["--data_dir", str(prepare_correct_data), "--cache-dir", str(cache_dir)]
+        # When
+        runner.invoke(generate_report, arguments)
+        result = runner.invoke(generate_report, arguments)
+        # Then
+        assert result.exit_code == 0
+        assert "Session cache hit:" in caplog.text
+        assert any(cache_dir.iterdir())
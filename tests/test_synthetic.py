@@ -0,0 +1,49 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from formula1_race_analysis import build_q1_report
+from formula1_race_analysis.config import TEXT_SESSION_FILES, FilePaths
+from formula1_race_analysis.synthetic import MAX_DRIVERS, SessionSpec, generate_session
+
+
+class TestSynthetic:
+    def test_generate_session_is_deterministic(self, tmp_path: Path) -> None:
+        # Given
+        spec = SessionSpec(drivers=50, laps=3, malformed_rate=0.1, seed=7)
+        # When
+        first_session = generate_session(tmp_path / "first", spec)
+        second_session = generate_session(tmp_path / "second", spec)
+        other_session = generate_session(tmp_path / "other", SessionSpec(drivers=50, laps=3, seed=8))
+        # Then
+        for file_name in TEXT_SESSION_FILES:
+            assert (first_session / file_name).read_bytes() == (second_session / file_name).read_bytes()
+        assert (first_session / FilePaths.START_LOG).read_bytes() != (other_session / FilePaths.START_LOG).read_bytes()
+
+    def test_generated_session_builds_a_report(self, tmp_path: Path) -> None:
+        # Given
+        spec = SessionSpec(drivers=40, laps=5, malformed_rate=0.2)
+        generate_session(tmp_path, spec)
+        # When
+        report = build_q1_report(tmp_path, ignore_errors=True)
+        multi_lap_report = build_q1_report(tmp_path, ignore_errors=True, multi_lap=True)
+        # Then
+        assert len(report) == spec.drivers
+        assert len((tmp_path / FilePaths.ABBREVIATIONS).read_text().splitlines()) == spec.drivers
+        assert len((tmp_path / FilePaths.START_LOG).read_text().splitlines()) > spec.records
+        assert {data.lap_count for data in multi_lap_report} == {spec.laps}
+
+    @pytest.mark.parametrize(
+        ("arguments", "message"),
+        [
+            ({"drivers": 0}, f"The number of drivers must be between 1 and {MAX_DRIVERS}, got 0."),
+            ({"drivers": MAX_DRIVERS + 1}, f"The number of drivers must be between 1 and {MAX_DRIVERS}"),
+            ({"laps": 0}, "The number of laps must be positive, got 0."),
+            ({"malformed_rate": 1.0}, "The malformed line rate must be in [0, 1), got 1.0."),
+        ],
+    )
+    def test_session_spec_with_invalid_scale(self, arguments: dict[str, float], message: str) -> None:
+        # When / Then
+        with pytest.raises(ValueError, match=re.escape(message)):
+            SessionSpec(**arguments)  # type: ignore[arg-type]
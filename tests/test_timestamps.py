@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from formula1_race_analysis import LogEntry, build_q1_report
+from formula1_race_analysis.config import FilePaths, LapTimeBackend
+from formula1_race_analysis.timestamps import (
+    TIMESTAMP_FORMAT,
+    datetime_to_epoch_ns,
+    decode_date_prefix,
+    decode_fixed_width_epoch_ns,
+    decode_fixed_width_timestamp,
+)
+
+
+class TestTimestamps:
+    @pytest.mark.parametrize(
+        "log_info",
+        [
+            "SVF2018-05-24_12:02:58.917",
+            "KRF2018-12-31_23:59:59.999",
+            "ABC1969-07-20_20:17:40.000",
+            "VBM2020-02-29_00:00:00.001",
+        ],
+    )
+    def test_decode_fixed_width_timestamp_matches_strptime(self, log_info: str) -> None:
+        # Given
+        expected_result = datetime.strptime(log_info[3:], TIMESTAMP_FORMAT)
+        # When
+        actual_result = decode_fixed_width_timestamp(log_info)
+        # Then
+        assert actual_result == expected_result
+        assert decode_fixed_width_epoch_ns(log_info) == datetime_to_epoch_ns(expected_result)
+
+    def test_decode_fixed_width_timestamp_rejects_other_layouts(self) -> None:
+        # Given
+        given_log_info = "VBM2018/05/24_12:02:58.917"
+        # When / Then
+        assert decode_fixed_width_timestamp(given_log_info) is None
+
+    @pytest.mark.parametrize(
+        "log_info",
+        [
+            "VBM2018-02-30_12:02:58.917",
+            "VBM2018-05-24_24:00:00.000",
+            "VBM2018-05-24_12:60:00.000",
+            "VBM2018-05-24_23:59:60.000",
+            "VBM2018",
+        ],
+    )
+    def test_decode_fixed_width_timestamp_with_invalid_timestamp(self, log_info: str) -> None:
+        # When / Then
+        assert decode_fixed_width_timestamp(log_info) is None
+        assert decode_fixed_width_epoch_ns(log_info) is None
+
+    def test_decode_date_prefix_is_cached_per_date(self) -> None:
+        # Given
+        log_lines = [f"SVF2018-05-24_12:02:{second:02d}.917" for second in range(60)]
+        log_lines.append("SVF2018-05-25_00:00:01.000")
+        decode_date_prefix.cache_clear()
+        # When
+        for log_info in log_lines:
+            decode_fixed_width_timestamp(log_info)
+        # Then
+        cache_info = decode_date_prefix.cache_info()
+        assert cache_info.misses == len({log_info[3:13] for log_info in log_lines})
+        assert cache_info.hits == len(log_lines) - cache_info.misses
+
+    def test_log_entry_keeps_validation_errors(self) -> None:
+        # When / Then
+        with pytest.raises(ValidationError, match="day is out of range for month"):
+            LogEntry.model_validate("VBM2018-02-30_12:02:58.917")
+
+    @pytest.mark.parametrize("backend", list(LapTimeBackend))
+    def test_lap_across_midnight_and_days(self, prepare_correct_data: Path, backend: LapTimeBackend) -> None:
+        # Given
+        (prepare_correct_data / FilePaths.START_LOG).write_text(
+            "FAM2018-05-24_23:59:30.000\nKMH2018-05-24_12:02:51.003\nPGS2018-05-31_23:59:59.999\n"
+        )
+        (prepare_correct_data / FilePaths.END_LOG).write_text(
+            "FAM2018-05-25_00:00:45.000\nKMH2018-05-24_12:04:04.396\nPGS2018-06-01_00:01:10.001\n"
+        )
+        expected_lap_times = {
+            "FAM": timedelta(seconds=75),
+            "KMH": timedelta(minutes=1, seconds=13, milliseconds=393),
+            "PGS": timedelta(minutes=1, seconds=10, milliseconds=2),
+        }
+        # When
+        report = build_q1_report(prepare_correct_data, backend=backend)
+        # Then
+        assert {data.driver.identifier: data.lap_time for data in report} == expected_lap_times